@@ -1,17 +1,59 @@
-from difflib import get_close_matches
+import asyncio
+from collections import deque
+from functools import partial
 
 from loguru import logger
+from rich.markup import escape
 from textual.app import App, ComposeResult
 from textual.containers import Vertical
-from textual.widgets import Footer, Header, Input, ProgressBar, RichLog
+from textual.markup import escape as escape_markup
+from textual.widgets import Footer, Header, Input
 
 from cli import cli
-from tui_typer.commands.base import Command, dispatch_typer_command
+from tui_typer.commands.base import Command, DispatchResult, dispatch_typer_command
+from tui_typer.commands.cancellation import CancellationToken
+from tui_typer.commands.complete import Completer
 from tui_typer.commands.config import AppConfig
-from tui_typer.commands.history import HistoryManager
+from tui_typer.commands.dispatcher import get_dispatcher
+from tui_typer.commands.help import HelpCache
+from tui_typer.commands.history import HistoryManager, HistorySearch
+from tui_typer.commands.jobs import (
+    Job,
+    JobScheduler,
+    JobState,
+    parse_limits,
+    split_job_options,
+)
 from tui_typer.commands.loader import load_commands
+from tui_typer.commands.pipeline import dispatch_pipeline, is_pipeline, split_pipeline
+from tui_typer.commands.progress import ProgressBoard, bind_progress
+from tui_typer.commands.result_cache import ResultCache
+from tui_typer.commands.search import CommandIndex
+from tui_typer.commands.streaming import OutputStream
+from tui_typer.commands.suggest import SuggestionIndex
+from tui_typer.commands.tree import CommandTree
+from tui_typer.commands.workers import WorkerPool
 from tui_typer.ui.command_provider import CommandProvider
-from tui_typer.ui.logging import TextualLogHandler, TextualProgressSink
+from tui_typer.ui.logging import TextualLogHandler
+from tui_typer.ui.progress import ProgressPanel
+from tui_typer.ui.scrollback import ScrollbackLog
+
+# Commands handled by the app itself rather than the Typer CLI
+BUILTIN_COMMANDS = (
+    "exit",
+    "quit",
+    "history",
+    "help",
+    "jobs",
+    "fg",
+    "wait",
+    "cancel",
+    "find",
+    "cache",
+)
+
+# Completion candidates listed at most when Tab cannot complete further
+MAX_LISTED_COMPLETIONS = 100
 
 
 class CLIApp(App):
@@ -29,8 +71,7 @@ class CLIApp(App):
         height: 1fr;
         border: solid yellow;
     }
-    #progress-bar {
-        height: 1;
+    #progress-panel {
         border: solid blue;
     }
     #input-box {
@@ -50,90 +91,255 @@ class CLIApp(App):
         # self._context = ContextManager(config=self.app_config, console=CliConsole())
 
         self.history_manager = HistoryManager(
-            self.app_config.history_file, self.app_config.max_history
+            self.app_config.history_file,
+            self.app_config.max_history,
+            fsync=self.app_config.history_fsync,
         )
 
         self.history_index: int = -1
+        # Copy of the history taken when Up is first pressed, indexed by history_index
+        self._history_snapshot: list[str] = []
+        self._history_search: HistorySearch | None = None
+        self._history_search_saved: str = ""
         self.current_input: str = ""
         self._non_interactive: bool = False
-        self.commands: dict[str, Command] = {}
+        self.commands = CommandTree()
+        self.command_index = CommandIndex({})
+        self.suggestions = SuggestionIndex(self.commands)
+        self.completer = Completer(self.commands)
+        self.worker_pool: WorkerPool | None = None
+        self.scheduler = JobScheduler(
+            max_concurrent=self.app_config.max_concurrent_jobs,
+            command_limits=parse_limits(self.app_config.job_command_limits),
+            policy=self.app_config.job_queue,
+            on_finish=self._report_job,
+        )
+        self.command_timeouts = parse_limits(self.app_config.command_timeouts, float)
+        self.result_cache: ResultCache | None = None
+        if self.app_config.cache_enabled:
+            self.result_cache = ResultCache(
+                max_bytes=self.app_config.cache_max_bytes,
+                ttl=self.app_config.cache_ttl,
+                commands=self.app_config.cache_commands,
+            )
         # self._context will be initialized when needed
 
     def compose(self) -> ComposeResult:
         yield Header()
         with Vertical(id="main-container"):
-            yield RichLog(id="output-log", highlight=True, markup=True)
-            yield RichLog(id="logger-log", highlight=True, markup=True)
-            yield ProgressBar(id="progress-bar", total=100, show_eta=False)
+            scrollback = {
+                "max_lines": self.app_config.scrollback_lines,
+                "spill_dir": self.app_config.scrollback_dir,
+            }
+            yield ScrollbackLog(id="output-log", highlight=True, markup=True, **scrollback)
+            yield ScrollbackLog(id="logger-log", highlight=True, markup=True, **scrollback)
+            yield ProgressPanel(
+                id="progress-panel",
+                refresh_rate=self.app_config.progress_refresh_rate,
+                window=self.app_config.progress_window,
+            )
         yield Input(id="input-box", placeholder="Enter command...")
         yield Footer()
 
     def on_mount(self) -> None:
         """Configure loguru to use the Textual widget after mount."""
-        self.log_widget = self.query_one("#logger-log", RichLog)
-        self.output_widget = self.query_one("#output-log", RichLog)
-        self.progress_widget = self.query_one("#progress-bar", ProgressBar)
-        self.progress_sink = TextualProgressSink(self.progress_widget)
+        self.log_widget = self.query_one("#logger-log", ScrollbackLog)
+        self.output_widget = self.query_one("#output-log", ScrollbackLog)
+        self.progress_panel = self.query_one("#progress-panel", ProgressPanel)
 
         input_widget = self.query_one("#input-box", Input)
         input_widget.focus()
         logger.remove()
         log_level = self.app_config.get("general", "log_level", fallback="INFO")
 
+        self.log_handler = TextualLogHandler(
+            self.log_widget,
+            refresh_rate=self.app_config.log_refresh_rate,
+            max_pending=self.app_config.log_buffer_lines,
+        )
+        self.log_handler.start()
         logger.add(
-            TextualLogHandler(self.log_widget).write,
+            self.log_handler.write,
             format="{message}",
             level=log_level,
             colorize=False,
         )
         logger.info("Logger initialized")
 
+        # Index the history for Ctrl+R search without delaying startup
+        self.run_worker(self.history_manager.build_index, thread=True, group="history-index")
+
         # Load commands from the typer CLI
         self.typer_cli = cli
+        self.help_cache = HelpCache(get_dispatcher(self.typer_cli))
+        self.reload_commands()
+
+        # Warm up the worker processes for CPU-bound commands
+        if self.app_config.max_workers > 0:
+            self.worker_pool = WorkerPool(
+                app_path=self.app_config.worker_app,
+                preload=self.app_config.worker_preload,
+                max_workers=self.app_config.max_workers,
+                commands=self.app_config.process_commands,
+                start_method=self.app_config.worker_start_method,
+            )
+            self.worker_pool.start()
+
+    def reload_commands(self) -> None:
+        """(Re)load the command tree and pre-render help for it in the background."""
+        dispatcher = get_dispatcher(self.typer_cli)
+        if self.commands:
+            dispatcher.invalidate()
         self.commands = load_commands(self.typer_cli)
+        self.command_index = CommandIndex(self.commands)
+        self.suggestions = SuggestionIndex(self.commands)
+        self.completer = Completer(
+            self.commands,
+            dispatcher,
+            builtins=BUILTIN_COMMANDS,
+            ttl=self.app_config.completion_ttl,
+        )
+        self.help_cache.clear()
+        if self.result_cache is not None:
+            self.result_cache.clear()
         logger.info(f"Loaded {len(self.commands)} commands")
+        # Plugins known only from the manifest stay unimported until they are used
+        paths = [name.split() for name, cmd in sorted(self.commands.items()) if cmd.loaded]
+        self.run_worker(partial(self.help_cache.warm, paths), thread=True, group="help-cache")
 
     def on_key(self, event) -> None:
-        if event.key == "up":
+        if self._history_search is not None:
+            self._history_search_key(event)
+        elif event.key == "ctrl+r":
+            self._start_history_search()
+            event.prevent_default()
+        elif event.key == "tab":
+            self._start_completion()
+            event.prevent_default()
+            event.stop()
+        elif event.key == "up":
             self._history_prev()
             event.prevent_default()
         elif event.key == "down":
             self._history_next()
             event.prevent_default()
 
+    def _start_history_search(self) -> None:
+        """Enter reverse-incremental search: the input holds the query, its title the match."""
+        input_widget = self.query_one("#input-box", Input)
+        self._history_search = HistorySearch(self.history_manager.index)
+        self._history_search_saved = str(input_widget.value)
+        input_widget.value = ""
+        self._show_history_search()
+
+    def _history_search_key(self, event) -> None:
+        search = self._history_search
+        if event.key in {"ctrl+r", "up"}:
+            search.older()
+        elif event.key == "down":
+            search.newer()
+        elif event.key == "escape":
+            self._end_history_search(self._history_search_saved)
+        else:
+            return
+        event.prevent_default()
+        event.stop()
+        self._show_history_search()
+
+    def _show_history_search(self) -> None:
+        search = self._history_search
+        if search is None:
+            return
+        input_widget = self.query_one("#input-box", Input)
+        if search.match is None:
+            input_widget.border_title = f"failing reverse-i-search: {escape_markup(search.query)}"
+        else:
+            input_widget.border_title = f"reverse-i-search: {escape_markup(search.match)}"
+
+    def _end_history_search(self, value: str) -> None:
+        self._history_search = None
+        input_widget = self.query_one("#input-box", Input)
+        input_widget.border_title = None
+        input_widget.value = value
+        input_widget.cursor_position = len(value)
+
+    def on_input_changed(self, event: Input.Changed) -> None:
+        if self._history_search is not None:
+            self._history_search.update(event.value)
+            self._show_history_search()
+
+    def _start_completion(self) -> None:
+        input_widget = self.query_one("#input-box", Input)
+        line, cursor = str(input_widget.value), input_widget.cursor_position
+        self.run_worker(self._complete_input(line, cursor), group="completion", exclusive=True)
+
+    async def _complete_input(self, line: str, cursor: int) -> None:
+        """
+        Complete the word before the cursor in a worker thread.
+
+        The completion is applied only if the input did not change meanwhile.
+        When it cannot be extended, the candidates are listed in the output.
+        """
+        completion = await asyncio.to_thread(self.completer.complete, line, cursor)
+        input_widget = self.query_one("#input-box", Input)
+        if str(input_widget.value) != line or input_widget.cursor_position != cursor:
+            return
+        candidates = completion.candidates
+        if not candidates:
+            return
+        value, position = completion.apply(line, cursor)
+        if value != line:
+            input_widget.value = value
+            input_widget.cursor_position = position
+            return
+        listed = "  ".join(candidates[:MAX_LISTED_COMPLETIONS])
+        more = len(candidates) - MAX_LISTED_COMPLETIONS
+        if more > 0:
+            listed += f"  ... {more} more"
+        self.add_output(f"[dim]{escape(listed)}[/dim]")
+
     def _history_prev(self) -> None:
         input_widget = self.query_one("#input-box", Input)
-        if self.command_history:
-            if self.history_index == -1:
-                self.current_input = str(input_widget.value)
-                self.history_index = len(self.command_history) - 1
-            elif self.history_index > 0:
-                self.history_index -= 1
-            input_widget.value = self.command_history[self.history_index]
-            input_widget.cursor_position = len(str(input_widget.value))
+        if self.history_index == -1:
+            # Indexing the deque away from its ends is O(n); navigate a list copy
+            self._history_snapshot = list(self.command_history)
+            if not self._history_snapshot:
+                return
+            self.current_input = str(input_widget.value)
+            self.history_index = len(self._history_snapshot) - 1
+        elif self.history_index > 0:
+            self.history_index -= 1
+        input_widget.value = self._history_snapshot[self.history_index]
+        input_widget.cursor_position = len(str(input_widget.value))
 
     def _history_next(self) -> None:
         input_widget = self.query_one("#input-box", Input)
         if self.history_index != -1:
-            if self.history_index < len(self.command_history) - 1:
+            if self.history_index < len(self._history_snapshot) - 1:
                 self.history_index += 1
-                input_widget.value = self.command_history[self.history_index]
+                input_widget.value = self._history_snapshot[self.history_index]
             else:
                 self.history_index = -1
+                self._history_snapshot = []
                 input_widget.value = self.current_input
             input_widget.cursor_position = len(str(input_widget.value))
 
     @property
-    def command_history(self) -> list[str]:
+    def command_history(self) -> deque[str]:
         return self.history_manager.history
 
     def on_input_submitted(self, event: Input.Submitted) -> None:
         """Handle command submission when Enter is pressed."""
         command = event.value.strip()
+        if self._history_search is not None:
+            # Enter in history search runs the match shown
+            command = self._history_search.match or ""
+            self._end_history_search("")
         if command:
             self.add_output(f"[bold cyan]>[/bold cyan] {command}")
             self.history_manager.add(command)
             self.history_index = -1
+            self._history_snapshot = []
             self.current_input = ""
             self.run_worker(self._execute_command(command))
         event.input.value = ""
@@ -169,111 +375,360 @@ class CLIApp(App):
         if cmd_name == "help":
             if len(parts) > 1:
                 help_target = " ".join(parts[1:])
+                await get_dispatcher(self.typer_cli).preload(parts[1:])
                 self._show_command_help(help_target)
             else:
                 self._show_all_commands_help()
             return
 
-        # Check if command exists before dispatching
-        cmd_parts = " ".join(parts[:2]) if len(parts) > 1 else parts[0]
-        if parts[0] not in self.commands and cmd_parts not in self.commands:
-            self.add_output(f"[bold red]Unknown command:[/bold red] {parts[0]}")
+        # Handle built-in job control commands
+        if cmd_name == "jobs":
+            self.display_jobs()
+            return
+        if cmd_name in {"fg", "wait"}:
+            await self._wait_for_jobs(parts[1:])
+            return
+        if cmd_name == "cancel":
+            self._cancel_jobs(parts[1:])
+            return
 
-            # Suggest similar commands
-            from difflib import get_close_matches
+        # Show or clear the cached results of cacheable commands
+        if cmd_name == "cache":
+            self._cache_command(parts[1:])
+            return
 
-            all_command_names = list(self.commands.keys())
-            suggestions = get_close_matches(parts[0], all_command_names, n=3, cutoff=0.6)
-            if suggestions:
-                self.add_output(f"[yellow]Did you mean:[/yellow] {', '.join(suggestions)}?")
+        # Search the scrollback of the output log, or of the log pane with --log
+        if cmd_name == "find":
+            await self._find_in_scrollback(command_line.strip()[len(parts[0]) :].strip())
             return
 
-        # Dispatch through typer CLI
-        result = await dispatch_typer_command(self.typer_cli, parts)
+        # Scheduler options such as "--priority 1" or "--timeout 30" may precede the command
+        try:
+            options, parts = split_job_options(parts)
+            priority = int(options.get("--priority", 0))
+            timeout = float(options["--timeout"]) if "--timeout" in options else None
+        except ValueError as e:
+            self.add_output(f"[bold red]Invalid job option:[/bold red] {e}")
+            return
+        if not parts:
+            return
+
+        # Validation and help resolve the command here, on the event loop
+        dispatcher = get_dispatcher(self.typer_cli)
+
+        # "cmd1 | cmd2" passes the value cmd1 returns on to cmd2
+        if is_pipeline(parts):
+            try:
+                stages = split_pipeline(parts)
+            except ValueError as e:
+                self.add_output(f"[bold red]Invalid pipeline:[/bold red] {e}")
+                return
+            for stage in stages:
+                await dispatcher.preload(stage)
+            if all([self._validate_command(stage) for stage in stages]):
+                self.submit_command(parts, priority=priority, timeout=timeout)
+            return
+
+        # Check if command, subcommand and options exist before dispatching
+        await dispatcher.preload(parts)
+        if not self._validate_command(parts):
+            return
 
         # If --help was requested, show the help text
         if "--help" in parts:
+            path, _ = dispatcher.resolve(parts)
+            if parts == [*path, "--help"]:
+                self._show_typer_help(path)
+                return
+            result = await dispatch_typer_command(self.typer_cli, parts)
             if result.help_text:
                 self.add_output(result.help_text)
             elif result.stdout:
                 self.add_output(result.stdout)
         else:
-            # Normal command execution
-            if result.stdout:
-                self.add_output(result.stdout)
-            if result.stderr:
-                self.add_output(f"[red]Error:[/red] {result.stderr}")
-            if (
-                result.exit_code != 0
-                and not result.stdout
-                and not result.stderr
-                and result.help_text
-            ):
-                self.add_output(result.help_text)
+            self.submit_command(parts, priority=priority, timeout=timeout)
+
+    def _suggest(self, kind: str, word: str, suggestions: list[str]) -> None:
+        self.add_output(f"[bold red]Unknown {kind}:[/bold red] {word}")
+        if suggestions:
+            self.add_output(f"[yellow]Did you mean:[/yellow] {', '.join(suggestions)}?")
+
+    def _validate_command(self, parts: list[str]) -> bool:
+        """Report unknown commands, subcommands and options with suggestions."""
+        command, depth = self.commands.find(parts)
+        if command is None:
+            self._suggest("command", parts[0], self.suggestions.subcommands(None, parts[0]))
+            return False
+        rest = parts[depth:]
+        if command.is_group:
+            if rest and not rest[0].startswith("-"):
+                suggestions = self.suggestions.subcommands(command, rest[0])
+                self._suggest("command", f"{command.name} {rest[0]}", suggestions)
+                return False
+            return True
+        unknown = self.suggestions.unknown_options(command, rest)
+        for option, suggestions in unknown.items():
+            self._suggest("option", option, suggestions)
+        return not unknown
+
+    def submit_command(
+        self, parts: list[str], priority: int = 0, timeout: float | None = None
+    ) -> Job:
+        """
+        Queue a command on the job scheduler.
+
+        Without an explicit ``timeout`` the command's timeout from the [jobs]
+        config section applies; a timeout of 0 disables it.
+        """
+        command, _ = self.commands.find(parts)
+        key = command.name if command is not None else parts[0]
+        if timeout is None:
+            timeout = self.command_timeouts.get(key, self.app_config.default_timeout)
+        token = CancellationToken()
+        board = ProgressBoard()
+        job = self.scheduler.submit(
+            " ".join(parts),
+            lambda: self._run_command_job(parts, token, timeout or None, board),
+            key=key,
+            priority=priority,
+            token=token,
+        )
+        board.label = f"[{job.id}] {job.command_line}"
+        if job.state is JobState.QUEUED:
+            self.add_output(
+                f"[dim]Job {job.id} queued ({self.scheduler.running_count} running)[/dim]"
+            )
+        return job
+
+    async def _run_command_job(
+        self,
+        parts: list[str],
+        token: CancellationToken,
+        timeout: float | None,
+        board: ProgressBoard | None = None,
+    ) -> DispatchResult:
+        """
+        Run a command as a job, stdout is streamed while the command runs.
+
+        Progress the command reports goes to ``board``, shown in the progress
+        panel while the job runs.
+        """
+        if board is None:
+            board = ProgressBoard()
+        self.progress_panel.track(board)
+        try:
+            with bind_progress(board):
+                result = await self.dispatch_command(parts, token=token, timeout=timeout)
+        finally:
+            self.progress_panel.untrack(board)
+        if result.stdout:
+            self.add_output(result.stdout)
+        if result.stderr:
+            self.add_output(f"[red]Error:[/red] {result.stderr}")
+        if result.exit_code != 0 and not result.stdout and not result.stderr and result.help_text:
+            self.add_output(result.help_text)
+        return result
+
+    def _report_job(self, job: Job) -> None:
+        """Report the queue wait and run time of a finished job."""
+        timing = f"ran {job.run_time:.2f}s, queued {job.wait_time:.2f}s"
+        if job.state is JobState.DONE:
+            exit_code = getattr(job.result, "exit_code", 0)
+            self.add_output(f"[dim]Job {job.id} finished (exit {exit_code}, {timing})[/dim]")
+        elif job.state in (JobState.CANCELLED, JobState.TIMED_OUT):
+            self.add_output(f"[yellow]Job {job.id} {job.state.value} ({timing})[/yellow]")
+        else:
+            self.add_output(f"[red]Job {job.id} failed: {job.error} ({timing})[/red]")
+
+    def display_jobs(self) -> None:
+        """Display active and recently finished jobs."""
+        self.add_output("[bold cyan]Jobs:[/bold cyan]")
+        jobs = self.scheduler.jobs()
+        if not jobs:
+            self.add_output("  [dim]No jobs yet.[/dim]")
+            return
+        for job in jobs:
+            self.add_output(
+                f"  [green]{job.id:>3}[/green] {job.state.value:<9} "
+                f"queued {job.wait_time:6.2f}s  ran {job.run_time:6.2f}s  {job.command_line}"
+            )
+
+    def _parse_job_ids(self, args: list[str]) -> list[int] | None:
+        try:
+            return [int(arg) for arg in args]
+        except ValueError:
+            self.add_output(f"[bold red]Invalid job id:[/bold red] {' '.join(args)}")
+            return None
+
+    async def _wait_for_jobs(self, args: list[str]) -> None:
+        """Wait for the given jobs, or all active jobs, to finish."""
+        job_ids = self._parse_job_ids(args)
+        if job_ids is None:
+            return
+        jobs = [self.scheduler.get(job_id) for job_id in job_ids] or self.scheduler.active()
+        for job_id, job in zip(job_ids, jobs, strict=False):
+            if job is None:
+                self.add_output(f"[bold red]Unknown job:[/bold red] {job_id}")
+        for job in jobs:
+            if job is not None:
+                await job.wait()
+
+    def _cancel_jobs(self, args: list[str]) -> None:
+        """Cancel queued or running jobs."""
+        job_ids = self._parse_job_ids(args)
+        if not job_ids:
+            if job_ids is not None:
+                self.add_output("[yellow]Usage:[/yellow] cancel <job id> [<job id> ...]")
+            return
+        for job_id in job_ids:
+            if not self.scheduler.cancel(job_id):
+                self.add_output(f"[bold red]No active job:[/bold red] {job_id}")
+
+    def _cache_command(self, args: list[str]) -> None:
+        """``cache stats`` or ``cache clear``."""
+        cache = self.result_cache
+        if cache is None:
+            self.add_output("[yellow]The result cache is disabled[/yellow]")
+            return
+        action = args[0] if args else "stats"
+        if action == "clear":
+            self.add_output(f"[dim]Cleared {cache.clear()} cached results[/dim]")
+        elif action == "stats":
+            stats = cache.stats
+            lookups = stats.hits + stats.shared + stats.misses
+            ratio = f"{(stats.hits + stats.shared) / lookups:.0%}" if lookups else "-"
+            self.add_output("[bold cyan]Result cache:[/bold cyan]")
+            self.add_output(
+                f"  entries: {stats.entries}, memory: {stats.size / 1024:,.1f} KiB"
+                f" of {cache.max_bytes / 1024 / 1024:,.0f} MiB"
+            )
+            self.add_output(
+                f"  hits: {stats.hits}, shared: {stats.shared}, misses: {stats.misses}"
+                f" (hit ratio {ratio}), evictions: {stats.evictions}"
+            )
+        else:
+            self.add_output("[bold red]Usage:[/bold red] cache stats | cache clear")
+
+    async def _find_in_scrollback(self, query: str, limit: int = 200) -> None:
+        """Show the lines of the output log (the log pane with ``--log``) containing ``query``."""
+        widget = self.output_widget
+        if query == "--log" or query.startswith("--log "):
+            widget, query = self.log_widget, query[len("--log") :].strip()
+        if not query:
+            self.add_output("[yellow]Usage:[/yellow] find [--log] <text>")
+            return
+        # Spilled history is read from disk, so search off the UI thread
+        matches = await asyncio.to_thread(widget.find, query, limit=limit)
+        if not matches:
+            self.add_output(f"[dim]No matches for[/dim] {escape(query)}")
+            return
+        more = f" (first {limit})" if len(matches) == limit else ""
+        self.add_output(f"[bold cyan]Matches for[/bold cyan] {escape(query)}{more}:")
+        for index, line in matches:
+            self.add_output(f"  [dim]{index + 1:>6}[/dim]  {escape(line)}")
+
+    async def dispatch_command(
+        self,
+        args: list[str],
+        token: CancellationToken | None = None,
+        timeout: float | None = None,
+    ) -> DispatchResult:
+        """
+        Dispatch a command, streaming its stdout to the output log as it runs.
+
+        A pipeline (``cmd1 | cmd2``) runs its commands in this process, see
+        :func:`tui_typer.commands.pipeline.dispatch_pipeline`.
+        """
+        if is_pipeline(args):
+            return await self._dispatch_pipeline(split_pipeline(args), token, timeout)
+        options = {
+            "pool": self.worker_pool,
+            "token": token,
+            "timeout": timeout,
+            "kill_after": self.app_config.kill_after,
+            "cache": self.result_cache,
+        }
+        if self._non_interactive or not self.app_config.stream_output:
+            return await dispatch_typer_command(self.typer_cli, args, **options)
 
-    async def _dispatch_with_help(self, args: list[str]) -> None:
-        """Show help for a specific command."""
-        result = await dispatch_typer_command(self.typer_cli, args + ["--help"])
-        self.add_output(result.stdout)
+        stream = OutputStream(max_lines=self.app_config.output_buffer_lines)
+        pump = asyncio.create_task(
+            stream.pump(self.add_output, interval=1 / self.app_config.output_refresh_rate)
+        )
+        try:
+            return await dispatch_typer_command(self.typer_cli, args, stream=stream, **options)
+        finally:
+            await pump
+
+    async def _dispatch_pipeline(
+        self,
+        stages: list[list[str]],
+        token: CancellationToken | None = None,
+        timeout: float | None = None,
+    ) -> DispatchResult:
+        options = {"token": token, "timeout": timeout, "kill_after": self.app_config.kill_after}
+        if self._non_interactive or not self.app_config.stream_output:
+            return await dispatch_pipeline(self.typer_cli, stages, **options)
+        stream = OutputStream(max_lines=self.app_config.output_buffer_lines)
+        pump = asyncio.create_task(
+            stream.pump(self.add_output, interval=1 / self.app_config.output_refresh_rate)
+        )
+        try:
+            return await dispatch_pipeline(self.typer_cli, stages, stream=stream, **options)
+        finally:
+            await pump
+
+    def _show_typer_help(self, path: list[str]) -> None:
+        """Show Typer's help for a command, served from the help cache."""
+        self.add_output(self.help_cache.get(path))
 
     def _show_all_commands_help(self) -> None:
         """Display help for top-level commands only (Typer-style)."""
-        self.add_output("[bold cyan]Available Commands:[/bold cyan]\n")
+        self.add_output(self.help_cache.memoize("overview", self._render_all_commands_help))
 
-        # Filter to show only top-level commands (no parent)
-        top_level_commands = {
-            name: cmd
-            for name, cmd in sorted(self.commands.items())
-            if not hasattr(cmd, "parent") or cmd.parent is None
-        }
+    def _render_all_commands_help(self) -> str:
+        lines = ["[bold cyan]Available Commands:[/bold cyan]\n"]
 
-        for name, cmd in top_level_commands.items():
+        for cmd in sorted(self.commands.top_level(), key=lambda cmd: cmd.name):
             # Add indicator if this is a command group
-            suffix = " [dim](group)[/dim]" if getattr(cmd, "is_group", False) else ""
-            self.add_output(f"  [green]{name}[/green]{suffix}: {cmd.description}")
+            suffix = " [dim](group)[/dim]" if cmd.is_group else ""
+            lines.append(f"  [green]{cmd.name}[/green]{suffix}: {cmd.description}")
 
-        self.add_output(
-            "\n[dim]Type 'help <command>' for detailed help on a specific command[/dim]"
-        )
+        lines.append("\n[dim]Type 'help <command>' for detailed help on a specific command[/dim]")
+        return "\n".join(lines)
 
     def _show_command_help(self, cmd_name: str) -> None:
         """Display detailed help for a specific command, including subcommands if it's a group."""
-        parts = cmd_name.split()
-
-        # Check if this is a full path (e.g., "serialize excel") or just a top-level command
-        if len(parts) == 1 and parts[0] in self.commands:
-            command = self.commands[parts[0]]
-
+        # A command or group at any depth, e.g. "serialize" or "serialize excel"
+        command = self.commands.get(" ".join(cmd_name.split()))
+        if command is None:
+            self.add_output(f"[bold red]Unknown command:[/bold red] {cmd_name}")
+        elif command.is_group:
             # If this is a group, show custom help with subcommands
-            if getattr(command, "is_group", False):
-                self.add_output(f"[bold cyan]Command Group:[/bold cyan] [green]{cmd_name}[/green]")
-                self.add_output(f"[bold cyan]Description:[/bold cyan] {command.description}\n")
-                self.add_output("[bold cyan]Subcommands:[/bold cyan]")
-
-                # Find all subcommands belonging to this group
-                subcommands = {
-                    name: cmd
-                    for name, cmd in sorted(self.commands.items())
-                    if hasattr(cmd, "parent") and cmd.parent == cmd_name
-                }
-
-                for sub_name, sub_cmd in subcommands.items():
-                    # Display only the subcommand part (not the full path)
-                    display_name = sub_name.split()[-1]
-                    self.add_output(f"  [green]{display_name}[/green]: {sub_cmd.description}")
-
-                self.add_output(
-                    f"\n[dim]Type 'help {cmd_name} <subcommand>' for detailed help[/dim]"
+            self.add_output(
+                self.help_cache.memoize(
+                    ("group", command.name), lambda: self._render_group_help(command)
                 )
-            else:
-                # For leaf commands, show Typer's help
-                self.run_worker(self._dispatch_with_help([cmd_name]))
-
-        elif " ".join(parts) in self.commands:
-            # Full subcommand path provided (e.g., "serialize excel")
-            self.run_worker(self._dispatch_with_help(parts))
+            )
         else:
-            self.add_output(f"[bold red]Unknown command:[/bold red] {cmd_name}")
+            # For leaf commands, show Typer's help
+            self._show_typer_help(command.name.split())
+
+    def _render_group_help(self, command: Command) -> str:
+        cmd_name = command.name
+        lines = [
+            f"[bold cyan]Command Group:[/bold cyan] [green]{cmd_name}[/green]",
+            f"[bold cyan]Description:[/bold cyan] {command.description}\n",
+            "[bold cyan]Subcommands:[/bold cyan]",
+        ]
+
+        for sub_name, sub_cmd in sorted(command.children.items()):
+            # Display only the subcommand part (not the full path)
+            suffix = " [dim](group)[/dim]" if sub_cmd.is_group else ""
+            lines.append(f"  [green]{sub_name}[/green]{suffix}: {sub_cmd.description}")
+
+        lines.append(f"\n[dim]Type 'help {cmd_name} <subcommand>' for detailed help[/dim]")
+        return "\n".join(lines)
 
     def process_command(self, command: str) -> None:
         """Synchronous command processing (deprecated, use _execute_command)."""
@@ -284,17 +739,27 @@ class CLIApp(App):
         if cmd_name in self.commands:
             self.commands[cmd_name].execute(self, args)
         else:
-            self.add_output(f"[bold red]Unknown command:[/bold red] {cmd_name}")
-            suggestions = get_close_matches(cmd_name, self.commands.keys(), n=3, cutoff=0.6)
-            if suggestions:
-                self.add_output(f"[yellow]Did you mean:[/yellow] {', '.join(suggestions)}?")
-
-    def execute_command_non_interactive(self, command: str, args: list[str]) -> None:
-        if command in self.commands:
-            self._non_interactive = True
-            self.commands[command].execute(self, args)
-        else:
+            self._suggest("command", cmd_name, self.suggestions.subcommands(None, cmd_name))
+
+    async def execute_command_non_interactive(self, command: str, args: list[str]) -> int:
+        """
+        Run a command without the UI, printing its output rather than logging it.
+
+        For batches of commands use ``cli.py run-script``, see
+        :mod:`tui_typer.commands.script`.
+
+        Returns:
+            The command's exit code, 1 if the command is unknown
+        """
+        if not self.commands:
+            self.typer_cli = cli
+            self.commands = load_commands(self.typer_cli)
+        if command not in self.commands:
             print(f"Unknown command: {command}")
+            return 1
+        self._non_interactive = True
+        result = await self.commands[command].execute(self, args)
+        return result.exit_code if result is not None else 1
 
     def action_quit(self) -> None:
         """Save history and config on exit."""
@@ -304,8 +769,10 @@ class CLIApp(App):
 
     def exit(self, result=None) -> None:
         """Save history and config before exiting."""
-        self.history_manager.save()
+        self.history_manager.close()
         self.app_config.save()
+        if self.worker_pool is not None:
+            self.worker_pool.shutdown()
         super().exit(result)
 
     def display_history(self) -> None:
@@ -0,0 +1,202 @@
+"""
+Benchmark the hot paths that grow with the number of commands.
+
+Builds synthetic CLIs of 10, 1k and 10k commands, nested two groups deep
+(``g3 s7 cmd123 --count 2``), and measures for each:
+
+- the overhead of ``dispatch_typer_command`` for a command that does nothing
+- ``load_commands``: run time and the memory the command tree holds
+- ``CommandProvider.search`` for each query of QUERIES
+- rendering help for the root, a group and a command
+
+Times are reported as percentiles in microseconds.
+
+Run from the project root:
+
+    python -m benchmarks.bench_commands [--sizes 10 1000 10000] [--samples N] [--json PATH]
+"""
+
+import argparse
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+import tracemalloc
+from types import SimpleNamespace
+
+from loguru import logger
+import typer
+
+from tui_typer.commands.base import dispatch_typer_command
+from tui_typer.commands.dispatcher import get_dispatcher
+from tui_typer.commands.loader import load_commands
+from tui_typer.commands.search import CommandIndex
+from tui_typer.ui.command_provider import CommandProvider
+
+QUERIES = ["c", "cmd1", "g1 s1", "g1 s1 cmd", "zzz"]
+PERCENTILES = (50, 90, 99)
+
+
+def make_cli(count: int) -> typer.Typer:
+    """A CLI with ``count`` commands spread over groups of subgroups, about n^(1/3) each."""
+    width = max(1, round(count ** (1 / 3)))
+    app = typer.Typer()
+    subgroups = {}
+    for g in range(width):
+        group = typer.Typer(help=f"Group {g}.")
+        app.add_typer(group, name=f"g{g}")
+        for s in range(width):
+            subgroup = typer.Typer(help=f"Subgroup {s} of group {g}.")
+            group.add_typer(subgroup, name=f"s{s}")
+            subgroups[g, s] = subgroup
+
+    def leaf(name: str = "x", count: int = 1, verbose: bool = False):
+        """Do nothing, with a few options to parse."""
+
+    for i in range(count):
+        subgroup = subgroups[i % width, (i // width) % width]
+        subgroup.command(name=f"cmd{i}", help=f"Command {i}.")(leaf)
+    return app
+
+
+def leaf_paths(app: typer.Typer) -> list[list[str]]:
+    return [path.split() for path, command in load_commands(app).items() if not command.children]
+
+
+def percentiles(samples: list[float]) -> dict[str, float]:
+    """The PERCENTILES and the maximum of ``samples`` in seconds, as microseconds."""
+    cuts = statistics.quantiles(samples, n=100, method="inclusive") if len(samples) > 1 else []
+    result = {f"p{p}": (cuts[p - 1] if cuts else samples[0]) * 1e6 for p in PERCENTILES}
+    result["max"] = max(samples) * 1e6
+    return result
+
+
+def sample(func, count: int) -> list[float]:
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+async def sample_async(func, count: int) -> list[float]:
+    times = []
+    for _ in range(count):
+        start = time.perf_counter()
+        await func()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def bench_dispatch(app: typer.Typer, paths: list[list[str]], samples: int) -> dict:
+    rng = random.Random(0)
+
+    async def _dispatch():
+        result = await dispatch_typer_command(app, [*rng.choice(paths), "--count", "2"])
+        assert result.exit_code == 0, result.stderr
+
+    async def _run():
+        await _dispatch()
+        return await sample_async(_dispatch, samples)
+
+    return percentiles(asyncio.run(_run()))
+
+
+def bench_load(app: typer.Typer, samples: int) -> dict:
+    times = sample(lambda: load_commands(app), samples)
+    tracemalloc.start()
+    try:
+        before = tracemalloc.get_traced_memory()[0]
+        tree = load_commands(app)
+        held, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return {
+        **percentiles(times),
+        "commands": len(tree),
+        "held_kib": (held - before) / 1024,
+        "peak_kib": (peak - before) / 1024,
+    }
+
+
+def bench_search(app: typer.Typer, samples: int) -> dict[str, dict]:
+    index = CommandIndex(load_commands(app))
+    provider = CommandProvider(SimpleNamespace(app=SimpleNamespace(command_index=index)))
+
+    async def _run():
+        results = {}
+        for query in QUERIES:
+
+            async def _search(query=query):
+                return [hit async for hit in provider.search(query)]
+
+            hits = len(await _search())
+            results[query] = {"hits": hits, **percentiles(await sample_async(_search, samples))}
+        return results
+
+    return asyncio.run(_run())
+
+
+def bench_help(app: typer.Typer, paths: list[list[str]], samples: int) -> dict[str, dict]:
+    dispatcher = get_dispatcher(app)
+    targets = {"root": [], "group": paths[0][:1], "command": paths[0]}
+    return {
+        label: percentiles(sample(lambda path=path: dispatcher.help_text(path), samples))
+        for label, path in targets.items()
+    }
+
+
+def print_row(label: str, result: dict, extra: str = "") -> None:
+    cells = " ".join(f"{result[key]:>10.1f}" for key in (*(f"p{p}" for p in PERCENTILES), "max"))
+    print(f"  {label:<22} {cells}  {extra}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 1_000, 10_000])
+    parser.add_argument("--samples", type=int, default=200, help="samples per measurement")
+    parser.add_argument("--json", help="also write the results to this file")
+    options = parser.parse_args()
+    logger.remove()
+
+    results = {}
+    header = " ".join(f"{key:>10}" for key in (*(f"p{p}" for p in PERCENTILES), "max"))
+    for size in options.sizes:
+        app = make_cli(size)
+        start = time.perf_counter()
+        # Typer builds the Click command tree on first use; the dispatcher keeps it
+        _ = get_dispatcher(app).command
+        click_seconds = time.perf_counter() - start
+        paths = leaf_paths(app)
+        # Loading and searching 10k commands take long enough that fewer samples do
+        scaled = max(5, options.samples * 100 // max(size, 100))
+        results[size] = result = {
+            "click_build_ms": click_seconds * 1e3,
+            "dispatch": bench_dispatch(app, paths, options.samples),
+            "load_commands": bench_load(app, scaled),
+            "search": bench_search(app, scaled),
+            "help": bench_help(app, paths, options.samples),
+        }
+
+        print(f"{size} commands (Click tree built in {click_seconds * 1e3:.1f}ms), microseconds")
+        print(f"  {'':<22} {header}")
+        print_row("dispatch", result["dispatch"])
+        load = result["load_commands"]
+        memory = f"{load['commands']} nodes, {load['held_kib']:.0f} KiB held"
+        print_row("load_commands", load, f"{memory}, {load['peak_kib']:.0f} KiB peak")
+        for query, found in result["search"].items():
+            print_row(f"search {query!r}", found, f"{found['hits']} hits")
+        for target, rendered in result["help"].items():
+            print_row(f"help {target}", rendered)
+
+    if options.json:
+        with open(options.json, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+
+
+if __name__ == "__main__":
+    sys.exit(main())
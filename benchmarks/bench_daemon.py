@@ -0,0 +1,65 @@
+"""
+Benchmark command latency through the daemon against starting the CLI per command.
+
+Starts ``cli.py serve`` on a temporary socket and runs ``version`` three ways:
+a new ``cli.py`` process per command, a new thin client process per command,
+and one DaemonClient connection kept open by the caller.
+
+Run from the project root:
+
+    python -m benchmarks.bench_daemon [processes] [requests]
+"""
+
+import io
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from tui_typer.client import SOCKET_ENV, DaemonClient
+
+
+def per_call(run, count: int) -> float:
+    run()
+    start = time.perf_counter()
+    for _ in range(count):
+        run()
+    return (time.perf_counter() - start) / count
+
+
+def main(processes: int = 10, requests: int = 2000) -> None:
+    path = os.path.join(tempfile.mkdtemp(), "bench.sock")
+    env = {**os.environ, SOCKET_ENV: path}
+    daemon = subprocess.Popen(
+        [sys.executable, "cli.py", "serve"], env=env, stderr=subprocess.DEVNULL
+    )
+    try:
+        while not os.path.exists(path):
+            if daemon.poll() is not None:
+                sys.exit("The daemon did not start")
+            time.sleep(0.05)
+
+        def _process(*args: str):
+            return lambda: subprocess.run(
+                [sys.executable, *args, "version"], env=env, stdout=subprocess.DEVNULL, check=True
+            )
+
+        out = io.StringIO()
+        with DaemonClient(path) as client:
+            timings = {
+                "cli.py process": per_call(_process("cli.py"), processes),
+                "client process": per_call(_process("-m", "tui_typer.client"), processes),
+                "open connection": per_call(lambda: client.run(["version"], stdout=out), requests),
+            }
+    finally:
+        daemon.terminate()
+        daemon.wait()
+
+    print("Latency of 'version'")
+    for label, seconds in timings.items():
+        print(f"  {label:<16} {seconds * 1e3:10.2f} ms/call")
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,99 @@
+"""
+Benchmark the in-process dispatcher against the CliRunner dispatch path.
+
+Run from the project root:
+
+    python -m benchmarks.bench_dispatch [iterations] [concurrency]
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+from loguru import logger
+import typer
+from typer.testing import CliRunner
+
+from tui_typer.commands.dispatcher import Dispatcher
+
+
+def make_app() -> typer.Typer:
+    app = typer.Typer()
+
+    @app.command()
+    def echo(word: str, lines: int = 1, pause: float = 0.0):
+        for _ in range(lines):
+            typer.echo(word)
+            if pause:
+                time.sleep(pause)
+
+    @app.command()
+    def other():
+        """Keep the app a group, like the real CLI."""
+
+    return app
+
+
+def cli_runner_invoke(app: typer.Typer, args: list[str]) -> str:
+    """The previous dispatch path: a fresh CliRunner per command."""
+    try:
+        return CliRunner().invoke(app, args, catch_exceptions=True).stdout
+    except ValueError:
+        # Another runner closed the stream this one was writing to
+        return ""
+
+
+async def run_concurrent(invoke, app, concurrency: int, lines: int) -> tuple[float, int]:
+    """Run ``concurrency`` commands at once; return elapsed time and corrupted outputs."""
+    words = [f"job{i}" for i in range(concurrency)]
+    start = time.perf_counter()
+    outputs = await asyncio.gather(
+        *(
+            asyncio.to_thread(invoke, app, ["echo", w, "--lines", str(lines), "--pause", "0.0005"])
+            for w in words
+        )
+    )
+    elapsed = time.perf_counter() - start
+    corrupted = sum(out != f"{w}\n" * lines for w, out in zip(words, outputs, strict=True))
+    return elapsed, corrupted
+
+
+def main(iterations: int = 500, concurrency: int = 16) -> None:
+    logger.remove()
+    app = make_app()
+    dispatcher = Dispatcher(app)
+
+    def dispatcher_invoke(_app: typer.Typer, args: list[str]) -> str:
+        return dispatcher.invoke(args).stdout
+
+    paths = {"CliRunner": cli_runner_invoke, "Dispatcher": dispatcher_invoke}
+
+    print(f"Sequential: {iterations} invocations of 'echo'")
+    for label, invoke in paths.items():
+        invoke(app, ["echo", "warmup"])
+        start = time.perf_counter()
+        for _ in range(iterations):
+            invoke(app, ["echo", "hello"])
+        per_call = (time.perf_counter() - start) / iterations
+        print(f"  {label:<12} {per_call * 1e6:10.1f} us/call")
+
+    print(f"Concurrent: {concurrency} commands in flight, 50 lines each")
+    for label, invoke in paths.items():
+        # Concurrent CliRunners swap sys.stdout under each other and can leave a closed
+        # buffer installed, so the real streams are restored after each run.
+        saved = sys.stdin, sys.stdout, sys.stderr
+        with open(os.devnull, "w") as devnull:
+            sys.stdout = sys.stderr = devnull
+            try:
+                elapsed, corrupted = asyncio.run(run_concurrent(invoke, app, concurrency, 50))
+            finally:
+                sys.stdin, sys.stdout, sys.stderr = saved
+        print(
+            f"  {label:<12} {elapsed * 1e3:10.1f} ms total, "
+            f"{corrupted}/{concurrency} outputs corrupted"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:3]))
@@ -0,0 +1,83 @@
+"""
+Benchmark reverse history search latency against the size of the history.
+
+Compares scanning every entry for the query, newest first, with the
+HistoryIndex used by Ctrl+R. Queries are typed one character at a time, as
+the search runs on every keystroke.
+
+Run from the project root:
+
+    python -m benchmarks.bench_history [repeats]
+"""
+
+import itertools
+import sys
+import time
+
+from tui_typer.commands.history import HistoryIndex
+
+WORDS = ["serialize", "export", "report", "import", "sync", "deploy", "build", "check"]
+FORMATS = ["excel", "csv", "json", "parquet", "xml", "yaml", "html", "pdf"]
+QUERIES = ["serialize excel --file", "deploy 99", "--name", "zzz"]
+LIMIT = 20
+
+
+def make_history(count: int) -> list[str]:
+    """``count`` commands like ``serialize excel --file-name report-12.xlsx``."""
+    names = itertools.cycle(itertools.product(WORDS, FORMATS))
+    history = []
+    for i in range(count):
+        group, sub = next(names)
+        history.append(f"{group} {sub} --file-name report-{i}.{sub} --name run{i % 97}")
+    return history
+
+
+def scan(history: list[str], query: str) -> list[str]:
+    query = query.lower()
+    seen, matches = set(), []
+    for command in reversed(history):
+        if command not in seen and query in command.lower():
+            seen.add(command)
+            matches.append(command)
+            if len(matches) >= LIMIT:
+                break
+    return matches
+
+
+def indexed(index: HistoryIndex, query: str) -> list[str]:
+    return index.search(query, LIMIT)
+
+
+def time_per_keystroke(func, target, repeats: int) -> tuple[float, float]:
+    """Mean and worst time of a search over every prefix of the queries."""
+    times = []
+    for _ in range(repeats):
+        for query in QUERIES:
+            for end in range(1, len(query) + 1):
+                start = time.perf_counter()
+                func(target, query[:end])
+                times.append(time.perf_counter() - start)
+    return sum(times) / len(times), max(times)
+
+
+def main(repeats: int = 5) -> None:
+    print(f"Per keystroke while typing {QUERIES}")
+    print(f"  {'entries':>8} {'build':>10} {'scan mean/max':>20} {'index mean/max':>20}")
+    for count in (1_000, 10_000, 50_000):
+        history = make_history(count)
+        start = time.perf_counter()
+        index = HistoryIndex(history)
+        build = time.perf_counter() - start
+        for query in QUERIES:
+            assert scan(history, query) == indexed(index, query), query
+        scan_mean, scan_max = time_per_keystroke(scan, history, repeats)
+        index_mean, index_max = time_per_keystroke(indexed, index, repeats)
+        print(
+            f"  {count:>8} {build * 1e3:8.1f}ms "
+            f"{scan_mean * 1e3:9.3f}/{scan_max * 1e3:.3f}ms "
+            f"{index_mean * 1e3:9.3f}/{index_max * 1e3:.3f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
@@ -0,0 +1,74 @@
+"""
+Benchmark command palette search latency against the number of commands.
+
+Compares scoring every command with the fuzzy matcher, as the palette used to,
+with scoring only the candidates from the prebuilt CommandIndex.
+
+Run from the project root:
+
+    python -m benchmarks.bench_palette [repeats]
+"""
+
+import itertools
+import sys
+import time
+
+from textual.fuzzy import Matcher
+
+from tui_typer.commands.base import Command
+from tui_typer.commands.search import CommandIndex
+
+WORDS = ["serialize", "export", "report", "import", "sync", "deploy", "build", "check"]
+FORMATS = ["excel", "csv", "json", "parquet", "xml", "yaml", "html", "pdf"]
+QUERIES = ["s", "ser", "serialize ex", "xprt", "zzz"]
+
+
+def make_commands(count: int) -> dict[str, Command]:
+    """``count`` commands named like ``serialize excel 12``, grouped by their first word."""
+    commands = {}
+    names = itertools.cycle(itertools.product(WORDS, FORMATS))
+    for i in range(count):
+        group, sub = next(names)
+        name = f"{group} {sub} {i}"
+        commands[name] = Command(name=name, description=f"{group.title()} to {sub}", parent=group)
+    return commands
+
+
+def scan(commands: dict[str, Command], query: str) -> int:
+    matcher = Matcher(query)
+    return sum(matcher.match(name) > 0 for name in commands)
+
+
+def indexed(index: CommandIndex, query: str) -> int:
+    matcher = Matcher(query)
+    return sum(matcher.match(entry.name) > 0 for entry in index.search(query))
+
+
+def time_per_query(func, target, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        for query in QUERIES:
+            func(target, query)
+    return (time.perf_counter() - start) / (repeats * len(QUERIES))
+
+
+def main(repeats: int = 5) -> None:
+    print(f"Average over queries {QUERIES}")
+    print(f"  {'commands':>8} {'build':>10} {'scan':>12} {'index':>12}")
+    for count in (10, 100, 1_000, 10_000):
+        commands = make_commands(count)
+        start = time.perf_counter()
+        index = CommandIndex(commands)
+        build = time.perf_counter() - start
+        for query in QUERIES:
+            assert scan(commands, query) == indexed(index, query), query
+        scan_time = time_per_query(scan, commands, repeats)
+        index_time = time_per_query(indexed, index, repeats)
+        print(
+            f"  {count:>8} {build * 1e3:8.1f}ms "
+            f"{scan_time * 1e3:10.2f}ms {index_time * 1e3:10.2f}ms"
+        )
+
+
+if __name__ == "__main__":
+    main(*(int(arg) for arg in sys.argv[1:2]))
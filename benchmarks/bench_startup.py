@@ -0,0 +1,213 @@
+"""
+Benchmark CLI and TUI startup and check it against budgets.
+
+Every sample is a fresh interpreter. Cold starts run without bytecode caches,
+so every module is compiled; warm starts use them. One ``-X importtime`` run
+per scenario breaks its imports down by top-level package, and the TUI mount
+time is measured inside the child process with ``App.run_test``, without the
+worker process pool.
+
+Run from the project root:
+
+    python -m benchmarks.bench_startup [--runs N] [--cold-runs N] [--save]
+
+The results are compared with the baseline, ``benchmarks/startup_baseline.json``,
+which ``--save`` replaces, and checked against ``benchmarks/startup_budgets.json``.
+The exit code is 1 when a budget is exceeded, so an eager import of a heavy
+module cannot slip into ``cli.py`` unnoticed.
+"""
+
+import argparse
+import asyncio
+from collections import defaultdict
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(HERE)
+BASELINE = os.path.join(HERE, "startup_baseline.json")
+BUDGETS = os.path.join(HERE, "startup_budgets.json")
+
+# Command lines after the interpreter; tui-mount prints its own timings as JSON
+SCENARIOS = {
+    "version": ["cli.py", "version"],
+    "list-commands": ["cli.py", "list-commands"],
+    "tui-mount": ["-m", "benchmarks.bench_startup", "--mount"],
+}
+TOP_IMPORTS = 8
+
+
+def measure_mount() -> dict[str, float]:
+    """Import the TUI and mount it headless; milliseconds for each step."""
+    start = time.perf_counter()
+    from app import CLIApp
+
+    imported = time.perf_counter()
+
+    async def _mount() -> float:
+        app = CLIApp()
+        # Spawned workers would inherit -X importtime and mix their imports into
+        # the breakdown of the UI process
+        app.app_config.set("workers", "max_workers", "0")
+        async with app.run_test():
+            # run_test returns once on_mount, which loads the commands, has run
+            return time.perf_counter()
+
+    mounted = asyncio.run(_mount())
+    return {"import_ms": (imported - start) * 1e3, "mount_ms": (mounted - imported) * 1e3}
+
+
+def run(args: list[str], env: dict[str, str] | None = None) -> tuple[float, str, str]:
+    """Run the interpreter with ``args``; wall milliseconds, stdout and stderr."""
+    start = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, *args],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return (time.perf_counter() - start) * 1e3, result.stdout, result.stderr
+
+
+def import_breakdown(stderr: str) -> dict[str, float]:
+    """Cumulative milliseconds of the top-level packages in ``-X importtime`` output."""
+    packages: dict[str, float] = defaultdict(float)
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not name.startswith("  "):
+            # Nested imports are included in the cumulative time of the outermost one
+            packages[name.strip().split(".")[0]] += int(cumulative) / 1e3
+    return dict(sorted(packages.items(), key=lambda item: -item[1]))
+
+
+def summarize(samples: list[float]) -> dict[str, float]:
+    # Imported here to keep it out of the import breakdown of the --mount child
+    import statistics
+
+    return {
+        "median": round(statistics.median(samples), 1),
+        "min": round(min(samples), 1),
+        "max": round(max(samples), 1),
+    }
+
+
+def measure(args: list[str], runs: int, cold_runs: int) -> dict:
+    """Cold and warm wall times, the import breakdown and, for the TUI, its own timings."""
+    result: dict = {}
+    cold = []
+    for _ in range(cold_runs):
+        with tempfile.TemporaryDirectory() as cache:
+            cold.append(run(args, {"PYTHONPYCACHEPREFIX": cache})[0])
+    # Also writes the bytecode caches the warm runs use
+    _, _, stderr = run(["-X", "importtime", *args])
+    warm, child = [], defaultdict(list)
+    for _ in range(runs):
+        elapsed, stdout, _ = run(args)
+        warm.append(elapsed)
+        if args == SCENARIOS["tui-mount"]:
+            # The timings are the last line; the app may print before them
+            for key, value in json.loads(stdout.splitlines()[-1]).items():
+                child[key].append(value)
+    if cold:
+        result["cold_ms"] = summarize(cold)
+    result["warm_ms"] = summarize(warm)
+    for key, values in child.items():
+        result[key] = summarize(values)
+    imports = import_breakdown(stderr)
+    result["imports_ms"] = {name: round(ms, 1) for name, ms in list(imports.items())[:TOP_IMPORTS]}
+    result["modules"] = sorted(imports)
+    return result
+
+
+def check(results: dict, budgets: dict) -> list[str]:
+    """
+    Budget violations of ``results``.
+
+    A budget is the largest median allowed for a measurement, e.g.
+    ``{"version": {"warm_ms": 600, "forbidden_imports": ["pandas"]}}``.
+    """
+    violations = []
+    for name, budget in budgets.items():
+        scenario = results.get(name)
+        if scenario is None:
+            continue
+        for key, limit in budget.items():
+            if key == "forbidden_imports":
+                for module in sorted(set(limit) & set(scenario["modules"])):
+                    violations.append(f"{name}: imports {module}")
+            elif key in scenario and scenario[key]["median"] > limit:
+                median = scenario[key]["median"]
+                violations.append(f"{name}: {key} median {median} > budget {limit}")
+    return violations
+
+
+def report(results: dict, baseline: dict) -> None:
+    for name, scenario in results["scenarios"].items():
+        before = baseline.get("scenarios", {}).get(name, {})
+        print(name)
+        for key, value in scenario.items():
+            if key.endswith("_ms") and "median" in value:
+                line = f"  {key:<10} median {value['median']:8.1f}  min {value['min']:8.1f}"
+                if key in before:
+                    change = value["median"] / before[key]["median"] - 1
+                    line += f"  ({change:+.0%} vs baseline)"
+                print(line)
+        imports = ", ".join(f"{module} {ms:.1f}" for module, ms in scenario["imports_ms"].items())
+        print(f"  imports    {imports}")
+        new = sorted(set(scenario["modules"]) - set(before.get("modules", scenario["modules"])))
+        if new:
+            print(f"  new imports since the baseline: {', '.join(new)}")
+
+
+def load(path: str) -> dict:
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5, help="warm starts per scenario")
+    parser.add_argument("--cold-runs", type=int, default=2, help="cold starts per scenario")
+    parser.add_argument("--save", action="store_true", help="record the results as the baseline")
+    parser.add_argument("--baseline", default=BASELINE)
+    parser.add_argument("--budgets", default=BUDGETS)
+    parser.add_argument("--mount", action="store_true", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.mount:
+        print(json.dumps(measure_mount()))
+        return 0
+
+    results = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "scenarios": {
+            name: measure(args, options.runs, options.cold_runs) for name, args in SCENARIOS.items()
+        },
+    }
+    report(results, load(options.baseline))
+    if options.save:
+        with open(options.baseline, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+            f.write("\n")
+        print(f"Saved the baseline to {options.baseline}")
+
+    violations = check(results["scenarios"], load(options.budgets))
+    for violation in violations:
+        print(f"Over budget: {violation}", file=sys.stderr)
+    return 1 if violations else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
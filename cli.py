@@ -1,9 +1,20 @@
+import sys
+
+import click
 from click import pass_context
 import typer
 
-from tui_typer.commands import typer_subcommand
+from tui_typer.commands.lazy import describing, lazy_group
+from tui_typer.commands.plugins import plugin_subcommands
+from tui_typer.commands.result_cache import cacheable
 
-cli = typer.Typer(help="An Interactive OCX Reader CLI Application")
+# Plugin command groups are discovered through entry points and imported on first
+# use; their names and help come from the plugin manifest, so e.g. `version` does
+# not pay for pandas
+cli = typer.Typer(
+    help="An Interactive OCX Reader CLI Application",
+    cls=lazy_group(**plugin_subcommands()),
+)
 
 
 @pass_context
@@ -28,12 +39,14 @@ def interactive():
 
 
 @cli.command()
+@cacheable
 def version():
     """Display the application version."""
     typer.echo("OCX Reader CLI v1.0.0")
 
 
 @cli.command(name="list-commands")
+@cacheable
 def list_commands():
     """List all available commands."""
     from click import Group
@@ -42,10 +55,57 @@ def list_commands():
 
     typer.echo("Available commands:")
     if isinstance(click_group, Group):
-        for cmd_name in sorted(click_group.commands.keys()):
-            cmd = click_group.commands[cmd_name]
-            help_text = cmd.help or cmd.short_help or "No description"
-            typer.echo(f"  {cmd_name:<20} {help_text}")
+        ctx = click.get_current_context()
+        with describing():
+            for cmd_name in sorted(click_group.list_commands(ctx)):
+                cmd = click_group.get_command(ctx, cmd_name)
+                help_text = cmd.help or cmd.short_help or "No description"
+                typer.echo(f"  {cmd_name:<20} {help_text}")
+
+
+@cli.command(name="run-script")
+def run_script(
+    script: str = typer.Argument(..., help="File with one command per line, - for stdin"),
+    jobs: int = typer.Option(1, "--jobs", "-j", help="Commands run at the same time"),
+    stop_on_error: bool = typer.Option(
+        False, "--stop-on-error", "-x", help="Skip the rest of the script after a failure"
+    ),
+    timeout: float = typer.Option(0, help="Seconds each command may run, 0 for no limit"),
+    summary: bool = typer.Option(True, help="Print the run time of each command to stderr"),
+):
+    """Run the commands of a script without the TUI, loading the commands once."""
+    from tui_typer.commands.script import run_script as run
+
+    try:
+        if script == "-":
+            lines = sys.stdin.readlines()
+        else:
+            with open(script, encoding="utf-8") as f:
+                lines = f.readlines()
+        code = run(cli, lines, jobs, stop_on_error, timeout or None, summary)
+    except (OSError, ValueError) as e:
+        raise typer.BadParameter(str(e), param_hint="SCRIPT") from None
+    raise typer.Exit(code)
+
+
+@cli.command()
+def serve(
+    socket: str = typer.Option(
+        "", help="Unix socket to listen on; default $TUI_TYPER_SOCKET or a per-user socket"
+    ),
+    warm: bool = typer.Option(True, help="Import all commands, including plugins, at startup"),
+):
+    """Keep the commands loaded and run them for `python -m tui_typer.client`."""
+    from tui_typer.commands.daemon import serve as run
+    from tui_typer.commands.result_cache import ResultCache
+
+    def _ready(server):
+        typer.echo(f"Serving commands on {server.path}; stop with Ctrl+C", err=True)
+
+    try:
+        run(cli, socket or None, cache=ResultCache(), warm=warm, ready=_ready)
+    except FileExistsError as e:
+        raise typer.BadParameter(str(e), param_hint="--socket") from None
 
 
 @cli.command()
@@ -55,8 +115,5 @@ def history():
     pass
 
 
-# Register subcommands AFTER all direct commands
-cli.add_typer(typer_subcommand.serialize, name="serialize")
-
 if __name__ == "__main__":
     cli()
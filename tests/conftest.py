@@ -1,10 +1,14 @@
 import asyncio
 import os
 import sys
+import tempfile
 
 import pytest
 from typer.testing import CliRunner
 
+# Keep the plugin manifest written when a plugin is first imported out of the home directory
+os.environ.setdefault("TUI_TYPER_PLUGIN_MANIFEST", os.path.join(tempfile.mkdtemp(), "plugins.json"))
+
 from cli import cli  # Typer app instance defined at project root
 from tui_typer.commands.base import dispatch_typer_command
 
@@ -0,0 +1,126 @@
+"""Tests for command timeouts and cancellation."""
+
+import asyncio
+import time
+
+import pytest
+import typer
+
+from tui_typer.commands.cancellation import (
+    CancellationToken,
+    CommandCancelled,
+    DispatchStatus,
+    check_cancelled,
+)
+from tui_typer.commands.dispatcher import Dispatcher
+from tui_typer.commands.workers import WorkerPool
+
+slow_app = typer.Typer()
+
+
+@slow_app.command()
+def polite(steps: int = 1000):
+    for i in range(steps):
+        typer.echo(f"step {i}")
+        check_cancelled()
+        time.sleep(0.01)
+
+
+@slow_app.command()
+def busy():
+    count = 0
+    while True:
+        count += 1
+
+
+@slow_app.command()
+def sleepy(seconds: float = 30.0):
+    time.sleep(seconds)
+    typer.echo("woke up")
+
+
+def test_check_cancelled_raises_for_current_token():
+    token = CancellationToken()
+    token.cancel(DispatchStatus.TIMED_OUT)
+    with pytest.raises(CommandCancelled) as info:
+        token.raise_if_cancelled()
+    assert info.value.exit_code == 124
+    check_cancelled()  # no token bound: nothing to do
+
+
+def test_timeout_stops_cooperative_command():
+    async def _run():
+        return await Dispatcher(slow_app).dispatch(["polite"], timeout=0.1)
+
+    result = asyncio.run(_run())
+    assert result.status is DispatchStatus.TIMED_OUT
+    assert result.exit_code == 124
+    assert "step 0" in result.stdout
+
+
+def test_busy_loop_is_interrupted_after_grace_period():
+    async def _run():
+        return await Dispatcher(slow_app).dispatch(["busy"], timeout=0.05, kill_after=0.1)
+
+    start = time.monotonic()
+    result = asyncio.run(_run())
+    assert result.status is DispatchStatus.TIMED_OUT
+    assert time.monotonic() - start < 2
+
+
+def test_token_cancel_from_caller():
+    async def _run():
+        token = CancellationToken()
+        asyncio.get_running_loop().call_later(0.05, token.cancel)
+        return await Dispatcher(slow_app).dispatch(["polite"], token=token)
+
+    result = asyncio.run(_run())
+    assert result.status is DispatchStatus.CANCELLED
+    assert result.exit_code == 130
+
+
+def test_task_cancellation_propagates_and_cancels_token():
+    token = CancellationToken()
+
+    async def _run():
+        task = asyncio.create_task(Dispatcher(slow_app).dispatch(["polite"], token=token))
+        await asyncio.sleep(0.05)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(_run())
+    assert token.status is DispatchStatus.CANCELLED
+
+
+def test_completed_command_reports_completed_status():
+    async def _run():
+        return await Dispatcher(slow_app).dispatch(["polite", "--steps", "2"], timeout=5)
+
+    result = asyncio.run(_run())
+    assert result.status is DispatchStatus.COMPLETED
+    assert result.exit_code == 0
+
+
+def test_pool_timeout_kills_only_the_worker_of_that_command():
+    pool = WorkerPool(app_path=f"{__name__}:slow_app", max_workers=2, commands=["sleepy"])
+
+    async def _run():
+        warm = await pool.dispatch(["sleepy", "--seconds", "0"])
+        slow, other = await asyncio.gather(
+            pool.dispatch(["sleepy"], timeout=0.5),
+            pool.dispatch(["sleepy", "--seconds", "1"]),
+        )
+        after = await pool.dispatch(["sleepy", "--seconds", "0"])
+        return warm, slow, other, after
+
+    try:
+        warm, slow, other, after = asyncio.run(_run())
+        assert pool.started
+    finally:
+        pool.shutdown(wait=True)
+    assert warm.stdout == "woke up\n"
+    assert slow.status is DispatchStatus.TIMED_OUT
+    assert other.status is DispatchStatus.COMPLETED
+    assert other.stdout == "woke up\n"
+    assert after.stdout == "woke up\n"
@@ -0,0 +1,146 @@
+"""Tests for tab completion of command lines."""
+
+from enum import Enum
+import os
+from pathlib import Path
+from typing import Annotated
+
+import typer
+
+from tui_typer.commands.complete import Completer, Completion, TTLCache
+from tui_typer.commands.dispatcher import Dispatcher
+from tui_typer.commands.loader import load_commands
+
+
+class Level(str, Enum):
+    full = "full"
+    fast = "fast"
+    schema = "schema"
+
+
+def _make_app(calls: list) -> typer.Typer:
+    app = typer.Typer()
+    db = typer.Typer()
+    app.add_typer(db, name="database")
+
+    def _tables(incomplete: str):
+        calls.append(incomplete)
+        return [name for name in ["users", "orders", "order_lines"] if name.startswith(incomplete)]
+
+    @app.command()
+    def version():
+        pass
+
+    @db.command()
+    def backup(
+        table: str = typer.Argument(..., autocompletion=_tables),
+        target: Annotated[Path | None, typer.Option("--target", "-t")] = None,
+        file_name: str = typer.Option("out.txt", "--file-name"),
+        verbose: bool = False,
+    ):
+        pass
+
+    @db.command()
+    def restore(level: Annotated[Level, typer.Option("--level")] = Level.full):
+        pass
+
+    return app
+
+
+def _completer(**kwargs) -> tuple[Completer, list]:
+    calls = []
+    app = _make_app(calls)
+    return Completer(load_commands(app), Dispatcher(app), **kwargs), calls
+
+
+def test_completes_commands_and_subcommands():
+    completer, _ = _completer(builtins=["help", "history"])
+    assert completer.complete("").candidates == ["database", "help", "history", "version"]
+    assert completer.complete("h").candidates == ["help", "history"]
+    assert completer.complete("database ").candidates == ["backup", "restore"]
+    assert completer.complete("database b").candidates == ["backup"]
+    assert completer.complete("help database r").candidates == ["restore"]
+    assert completer.complete("help v").candidates == ["version"]
+    assert completer.complete("help database backup ").candidates == []
+    assert completer.complete("--priority 3 ver").candidates == ["version"]
+    assert completer.complete("--pr").candidates == ["--priority"]
+    assert completer.complete("nothing ").candidates == []
+    assert completer.complete("version | database r").candidates == ["restore"]
+    assert completer.complete("version | v").candidates == ["version"]
+
+
+def test_completes_options():
+    completer, _ = _completer()
+    assert completer.complete("database backup --").candidates == [
+        "--file-name",
+        "--help",
+        "--no-verbose",
+        "--target",
+        "--verbose",
+    ]
+    assert completer.complete("database backup --v").candidates == ["--verbose"]
+    assert completer.complete("database restore --level f").candidates == ["fast", "full"]
+    assert completer.complete("database restore --level=s").candidates == ["--level=schema"]
+    assert completer.complete("database restore --help ").candidates == []
+
+
+def test_completes_values_with_shell_complete_and_caches_them():
+    completer, calls = _completer()
+    assert completer.complete("database backup ord").candidates == ["order_lines", "orders"]
+    assert completer.complete("database backup ord").candidates == ["order_lines", "orders"]
+    assert calls == ["ord"]
+    # After a flag the next word is still the argument
+    assert completer.complete("database backup --verbose u").candidates == ["users"]
+    completer.cache.clear()
+    completer.complete("database backup ord")
+    assert calls == ["ord", "u", "ord"]
+
+
+def test_completes_paths(tmp_path):
+    (tmp_path / "reports").mkdir()
+    (tmp_path / "report.xlsx").touch()
+    (tmp_path / ".hidden").touch()
+    completer, _ = _completer()
+    prefix = f"{tmp_path}{os.sep}"
+
+    line = f"database backup users --target {prefix}rep"
+    assert completer.complete(line).candidates == [f"{prefix}report.xlsx", f"{prefix}reports/"]
+    # A str option named like a path is completed as one
+    line = f"database backup users --file-name={prefix}"
+    assert completer.complete(line).candidates == [
+        f"--file-name={prefix}report.xlsx",
+        f"--file-name={prefix}reports/",
+    ]
+    assert completer.complete(f"database backup users -t {prefix}.").candidates == [
+        f"{prefix}.hidden"
+    ]
+
+
+def test_completion_is_applied_at_the_cursor():
+    assert Completion(10, "ex", ["excel"]).apply("serialize ex --flag", 12) == (
+        "serialize excel  --flag",
+        16,
+    )
+    assert Completion(0, "re", ["reports/"]).apply("re") == ("reports/", 8)
+    assert Completion(0, "o", ["order_lines", "orders"]).apply("o") == ("order", 5)
+    assert Completion(0, "order", ["order_lines", "orders"]).apply("order") == ("order", 5)
+
+
+def test_ttl_cache_expires_and_is_bounded():
+    now = [0.0]
+    cache = TTLCache(ttl=5, max_entries=2, clock=lambda: now[0])
+    builds = []
+
+    def _build(value):
+        builds.append(value)
+        return value
+
+    assert cache.memoize("a", lambda: _build(1)) == 1
+    assert cache.memoize("a", lambda: _build(2)) == 1
+    now[0] = 5.0
+    assert cache.memoize("a", lambda: _build(3)) == 3
+    cache.memoize("b", lambda: _build(4))
+    cache.memoize("c", lambda: _build(5))
+    assert len(cache) == 2
+    assert cache.memoize("a", lambda: _build(6)) == 6
+    assert builds == [1, 3, 4, 5, 6]
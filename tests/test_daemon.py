@@ -0,0 +1,215 @@
+"""Tests for the command daemon and its thin client."""
+
+import asyncio
+import io
+import os
+import socket
+import sys
+import threading
+import time
+
+import pytest
+import typer
+
+from tui_typer.client import UNAVAILABLE, DaemonClient, main
+from tui_typer.commands.cancellation import check_cancelled
+from tui_typer.commands.daemon import DaemonServer, claim_socket, warm_commands
+from tui_typer.commands.pipeline import piped_input
+
+
+def _make_app(events: list) -> typer.Typer:
+    app = typer.Typer()
+
+    @app.command()
+    def echo(text: str, fail: bool = False):
+        print(text)
+        if fail:
+            raise typer.Exit(3)
+
+    @app.command()
+    def lines(count: int):
+        for i in range(count):
+            print(f"line {i}")
+
+    @app.command()
+    def write(name: str):
+        with open(name, "w") as f:
+            f.write("written")
+
+    @app.command()
+    def wait():
+        events.append("started")
+        try:
+            for _ in range(500):
+                check_cancelled()
+                time.sleep(0.01)
+        finally:
+            events.append("stopped")
+
+    @app.command()
+    def numbers():
+        return [1, 2, 3]
+
+    @app.command()
+    def total():
+        print(sum(piped_input()))
+
+    return app
+
+
+def _serve(app: typer.Typer, path: str, client) -> object:
+    """Run ``client(path)`` in a thread while a daemon serves ``app`` on ``path``."""
+
+    async def _run():
+        server = DaemonServer(app, path)
+        await server.start()
+        try:
+            return await asyncio.to_thread(client, path)
+        finally:
+            await server.close()
+
+    return asyncio.run(_run())
+
+
+@pytest.fixture()
+def socket_path(tmp_path):
+    return str(tmp_path / "daemon.sock")
+
+
+def test_commands_run_in_the_daemon(socket_path):
+    def _client(path):
+        out, err = io.StringIO(), io.StringIO()
+        with DaemonClient(path) as client:
+            codes = [
+                client.run(["echo", "hello"], stdout=out, stderr=err),
+                client.run(["echo", "bye", "--fail"], stdout=out, stderr=err),
+                client.run(["nope"], stdout=out, stderr=err),
+            ]
+        return codes, out.getvalue(), err.getvalue()
+
+    codes, out, err = _serve(_make_app([]), socket_path, _client)
+    assert codes == [0, 3, 2]
+    assert out == "hello\nbye\n"
+    assert "No such command 'nope'" in err
+
+
+def test_output_is_streamed_in_order(socket_path):
+    def _client(path):
+        out = io.StringIO()
+        with DaemonClient(path) as client:
+            return client.run(["lines", "5000"], stdout=out), out.getvalue()
+
+    code, out = _serve(_make_app([]), socket_path, _client)
+    assert code == 0
+    assert out.splitlines() == [f"line {i}" for i in range(5000)]
+
+
+def test_stderr_is_streamed_while_the_command_runs(socket_path):
+    events = []
+    received = threading.Event()
+    app = _make_app(events)
+
+    @app.command()
+    def warn():
+        print("careful", file=sys.stderr)
+        # Only returns early if the client got the line before the command finished
+        events.append(received.wait(5))
+        print("done")
+
+    class _Stderr(io.StringIO):
+        def write(self, s):
+            received.set()
+            return super().write(s)
+
+    def _client(path):
+        out, err = io.StringIO(), _Stderr()
+        with DaemonClient(path) as client:
+            return client.run(["warn"], stdout=out, stderr=err), out.getvalue(), err.getvalue()
+
+    assert _serve(app, socket_path, _client) == (0, "done\n", "careful\n")
+    assert events == [True]
+
+
+def test_pipelines_run_in_the_daemon(socket_path):
+    def _client(path):
+        out = io.StringIO()
+        with DaemonClient(path) as client:
+            return client.run(["numbers", "|", "total"], stdout=out), out.getvalue()
+
+    assert _serve(_make_app([]), socket_path, _client) == (0, "6\n")
+
+
+def test_commands_run_in_the_working_directory_of_the_client(socket_path, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+
+    def _client(path):
+        with DaemonClient(path) as client:
+            return client.run(["write", "out.txt"])
+
+    assert _serve(_make_app([]), socket_path, _client) == 0
+    assert (tmp_path / "out.txt").read_text() == "written"
+
+
+def test_disconnecting_cancels_the_command(socket_path):
+    events = []
+
+    def _client(path):
+        client = DaemonClient(path)
+
+        def _run():
+            with pytest.raises(OSError):
+                client.run(["wait"])
+
+        thread = threading.Thread(target=_run, daemon=True)
+        thread.start()
+        while not events:
+            time.sleep(0.01)
+        # As when the client is interrupted with Ctrl+C
+        client._socket.shutdown(socket.SHUT_RDWR)
+        client.close()
+        for _ in range(200):
+            if "stopped" in events:
+                break
+            time.sleep(0.01)
+        return list(events)
+
+    assert _serve(_make_app(events), socket_path, _client) == ["started", "stopped"]
+
+
+def test_bad_requests_are_answered(socket_path):
+    def _client(path):
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+            sock.connect(path)
+            sock.sendall(b"not json\n")
+            answer = sock.makefile("rb")
+            return answer.readline() + answer.readline()
+
+    answer = _serve(_make_app([]), socket_path, _client)
+    assert b"Bad request" in answer
+    assert b'"exit": 2' in answer
+
+
+def test_stale_sockets_are_replaced(socket_path):
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.bind(socket_path)
+    assert os.path.exists(socket_path)
+    claim_socket(socket_path)
+    assert not os.path.exists(socket_path)
+
+    def _client(path):
+        with pytest.raises(FileExistsError):
+            claim_socket(path)
+        return os.stat(path).st_mode & 0o777
+
+    assert _serve(_make_app([]), socket_path, _client) == 0o600
+    assert not os.path.exists(socket_path)
+
+
+def test_client_without_daemon(socket_path, monkeypatch, capsys):
+    monkeypatch.setenv("TUI_TYPER_SOCKET", socket_path)
+    assert main(["version"]) == UNAVAILABLE
+    assert "python cli.py serve" in capsys.readouterr().err
+
+
+def test_warm_commands_imports_plugins(typer_cli):
+    assert warm_commands(typer_cli) > 5
@@ -0,0 +1,108 @@
+"""Tests for the in-process Typer dispatcher."""
+
+import asyncio
+import time
+
+import typer
+
+from cli import cli
+from tui_typer.commands.base import dispatch_typer_command
+from tui_typer.commands.dispatcher import Dispatcher, get_dispatcher
+
+
+def _make_app() -> typer.Typer:
+    app = typer.Typer()
+
+    @app.command()
+    def echo(word: str, times: int = 20):
+        for _ in range(times):
+            typer.echo(word)
+            time.sleep(0.001)
+
+    @app.command()
+    def fail():
+        typer.echo("boom", err=True)
+        raise typer.Exit(3)
+
+    @app.command()
+    def ask():
+        name = typer.prompt("Name")
+        typer.echo(f"Hello {name}")
+
+    return app
+
+
+def test_get_dispatcher_is_shared_and_resolves_once():
+    dispatcher = get_dispatcher(cli)
+    assert get_dispatcher(cli) is dispatcher
+    assert dispatcher.command is dispatcher.command
+
+
+def test_invoke_captures_stdout_and_exit_code():
+    result = Dispatcher(cli).invoke(["version"])
+    assert result.exit_code == 0
+    assert "OCX Reader CLI" in result.stdout
+    assert result.stderr == ""
+
+
+def test_invoke_reports_usage_errors_on_stderr():
+    result = Dispatcher(cli).invoke(["serialize", "excel", "--bogus"])
+    assert result.exit_code == 2
+    assert "No such option" in result.stderr
+
+
+def test_exit_code_and_stderr_from_command():
+    result = Dispatcher(_make_app()).invoke(["fail"])
+    assert result.exit_code == 3
+    assert result.stderr == "boom\n"
+
+
+def test_input_is_fed_to_stdin():
+    result = Dispatcher(_make_app()).invoke(["ask"], input="Ada\n")
+    assert result.exit_code == 0
+    assert "Hello Ada" in result.stdout
+
+
+def test_concurrent_dispatches_do_not_mix_output():
+    dispatcher = Dispatcher(_make_app())
+    words = [f"word{i}" for i in range(8)]
+
+    async def _run():
+        return await asyncio.gather(*(dispatcher.dispatch(["echo", w]) for w in words))
+
+    results = asyncio.run(_run())
+    for word, result in zip(words, results, strict=True):
+        assert result.exit_code == 0
+        assert result.stdout == f"{word}\n" * 20
+
+
+def test_streams_restored_outside_capture(capsys):
+    Dispatcher(cli).invoke(["version"])
+    print("outside")
+    assert "outside" in capsys.readouterr().out
+
+
+def test_help_text_matches_help_option_output():
+    dispatcher = Dispatcher(cli)
+    for path in ([], ["serialize"], ["serialize", "excel"]):
+        assert dispatcher.help_text(path) == dispatcher.invoke([*path, "--help"]).stdout
+
+
+def test_silent_failure_runs_the_command_once():
+    app = typer.Typer()
+    calls = []
+
+    @app.command()
+    def quiet(count: int = 1):
+        """Fail without saying why."""
+        calls.append(count)
+        raise typer.Exit(1)
+
+    @app.command()
+    def other():
+        pass
+
+    result = asyncio.run(dispatch_typer_command(app, ["quiet", "--count", "2"]))
+    assert result.exit_code == 1
+    assert calls == [2]
+    assert "Fail without saying why." in result.help_text
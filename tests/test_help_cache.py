@@ -0,0 +1,74 @@
+"""Tests for the memoized help text cache."""
+
+import typer
+
+from tui_typer.commands.dispatcher import Dispatcher
+from tui_typer.commands.help import HelpCache
+
+
+def _make_cache() -> tuple[HelpCache, list[list[str]]]:
+    app = typer.Typer()
+    group = typer.Typer(help="Greetings")
+    app.add_typer(group, name="greet")
+
+    @group.command()
+    def hello(name: str):
+        """Say hello."""
+        typer.echo(f"Hello {name}")
+
+    @app.command()
+    def version():
+        """Show the version."""
+
+    dispatcher = Dispatcher(app)
+    calls: list[list[str]] = []
+    help_text = dispatcher.help_text
+
+    def counting_help_text(args, *rest, **kwargs):
+        calls.append(list(args))
+        return help_text(args, *rest, **kwargs)
+
+    dispatcher.help_text = counting_help_text
+    return HelpCache(dispatcher), calls
+
+
+def test_help_is_rendered_once_per_path_and_width():
+    cache, calls = _make_cache()
+    text = cache.get(["greet", "hello"], width=80)
+    assert "Say hello." in text
+    assert cache.get(["greet", "hello"], width=80) is text
+    assert calls == [["greet", "hello"]]
+
+    cache.get(["greet", "hello"], width=120)
+    assert len(calls) == 2
+
+
+def test_help_is_rendered_at_the_width_of_its_key():
+    cache, _ = _make_cache()
+    narrow = cache.get(["greet", "hello"], width=40)
+    wide = cache.get(["greet", "hello"], width=120)
+    assert max(len(line) for line in narrow.splitlines()) == 40
+    assert max(len(line) for line in wide.splitlines()) == 120
+
+    # Warming at another width than the terminal's stores text of that width
+    cache.warm([["version"]], width=60)
+    assert max(len(line) for line in cache.get(["version"], width=60).splitlines()) == 60
+
+
+def test_warm_renders_ahead_of_time():
+    cache, calls = _make_cache()
+    cache.warm([["greet"], ["greet", "hello"], ["version"]], width=80)
+    assert len(cache) == 3
+    cache.get(["version"], width=80)
+    assert len(calls) == 3
+
+
+def test_invalidating_the_dispatcher_clears_the_cache():
+    cache, calls = _make_cache()
+    cache.get(["version"], width=80)
+    assert cache.memoize("overview", lambda: "commands") == "commands"
+
+    cache.dispatcher.invalidate()
+    assert cache.memoize("overview", lambda: "reloaded") == "reloaded"
+    cache.get(["version"], width=80)
+    assert len(calls) == 2
@@ -1,23 +1,26 @@
 """Test script to verify history command and command execution work correctly."""
 
 import asyncio
+import threading
 
+import pytest
 from typer.testing import CliRunner
 
 from cli import cli
 from tui_typer.commands.base import dispatch_typer_command
-from tui_typer.commands.config import AppConfig
-from tui_typer.commands.history import HistoryManager
+from tui_typer.commands.history import HistoryIndex, HistoryManager, HistorySearch
 
 
-def test_history_manager_basic():
-    config = AppConfig(config_path=None)
-    history = HistoryManager(config.history_file, max_history=10)
-    history.add("version")
-    history.add("help")
-    history.add("list-commands")
-    assert len(history.history) >= 3
-    assert history.history[-1] == "list-commands"
+def test_history_manager_basic(tmp_path):
+    # add() appends to the file at once, so keep it out of the user's history
+    history = HistoryManager(tmp_path / "history", max_history=10)
+    try:
+        history.add("version")
+        history.add("help")
+        history.add("list-commands")
+        assert list(history.history) == ["version", "help", "list-commands"]
+    finally:
+        history.close()
 
 
 def test_cli_commands_invoke(runner: CliRunner):
@@ -42,3 +45,159 @@ def test_async_dispatch_version_and_history():
         assert res.exit_code == 0
 
     asyncio.run(_run())
+
+
+def _lines(path):
+    return path.read_text().splitlines()
+
+
+def test_history_is_appended_to_journal(tmp_path):
+    path = tmp_path / "history"
+    path.write_text("old\n")
+    history = HistoryManager(path, max_history=10, fsync="always")
+    history.add("version")
+    history.add("version")
+    history.add("help")
+    history.save()
+    assert _lines(path) == ["old", "version", "help"]
+    assert list(history.history) == ["old", "version", "help"]
+    history.close()
+
+
+def test_sessions_share_the_journal(tmp_path):
+    path = tmp_path / "history"
+    first = HistoryManager(path, max_history=100)
+    second = HistoryManager(path, max_history=100)
+    for i in range(20):
+        first.add(f"first {i}")
+        second.add(f"second {i}")
+    first.close()
+    second.close()
+    lines = _lines(path)
+    assert sorted(lines) == sorted(
+        [f"first {i}" for i in range(20)] + [f"second {i}" for i in range(20)]
+    )
+    assert [line for line in lines if line.startswith("first")] == [f"first {i}" for i in range(20)]
+    assert len(HistoryManager(path, max_history=100).history) == 40
+
+
+def test_journal_is_compacted(tmp_path):
+    path = tmp_path / "history"
+    history = HistoryManager(path, max_history=5, fsync="never")
+    for i in range(23):
+        history.add(f"command {i}")
+    history.close()
+    assert len(_lines(path)) <= 10
+    assert _lines(path)[-5:] == [f"command {i}" for i in range(18, 23)]
+    assert list(history.history) == [f"command {i}" for i in range(18, 23)]
+    assert list(HistoryManager(path, max_history=5).history) == list(history.history)
+
+
+def test_unterminated_line_is_completed(tmp_path):
+    path = tmp_path / "history"
+    path.write_text("version\nhel")
+    history = HistoryManager(path)
+    history.add("jobs")
+    history.close()
+    assert _lines(path) == ["version", "hel", "jobs"]
+
+
+def test_unknown_fsync_policy(tmp_path):
+    with pytest.raises(ValueError, match="sometimes"):
+        HistoryManager(tmp_path / "history", fsync="sometimes")
+
+
+def test_index_returns_distinct_matches_most_recent_first():
+    index = HistoryIndex(["version", "serialize excel", "help", "Serialize csv", "serialize excel"])
+    assert index.search("ser") == ["serialize excel", "Serialize csv"]
+    assert index.search("SERIALIZE EX") == ["serialize excel"]
+    assert index.search("e", limit=2) == ["serialize excel", "Serialize csv"]
+    assert index.search("") == ["serialize excel", "Serialize csv", "help", "version"]
+    assert index.search("xyz") == []
+    assert index.search("serialize json") == []
+
+
+def test_index_follows_history_eviction(tmp_path):
+    history = HistoryManager(tmp_path / "history", max_history=3)
+    for command in ["alpha", "beta", "alpha again", "gamma", "delta"]:
+        history.add(command)
+    assert list(history.history) == ["alpha again", "gamma", "delta"]
+    assert history.search("a") == ["delta", "gamma", "alpha again"]
+    history.add("beta again")
+    assert history.search("again") == ["beta again"]
+    history.add("epsilon")
+    history.add("zeta")
+    assert history.search("a") == ["zeta", "beta again"]
+    assert history.search("ps") == ["epsilon"]
+    history.close()
+    assert HistoryManager(tmp_path / "history", max_history=3).search("again") == ["beta again"]
+
+
+def test_commands_added_while_the_index_builds_are_indexed(tmp_path):
+    path = tmp_path / "history"
+    path.write_text("".join(f"command {i}\n" for i in range(5000)))
+    history = HistoryManager(path, max_history=3000, fsync="never")
+    builder = threading.Thread(target=history.build_index)
+    builder.start()
+    for i in range(5000, 6000):
+        history.add(f"command {i}")
+    builder.join()
+    history.close()
+    expected = HistoryIndex(history.history).search("command", limit=3000)
+    assert history.search("command", limit=3000) == expected
+    assert len(expected) == 3000
+
+
+def test_index_drops_stale_postings():
+    index = HistoryIndex()
+    for i in range(3000):
+        index.add(f"command {i % 10}")
+    assert len(index) == 10
+    assert index.search("command", limit=3) == ["command 9", "command 8", "command 7"]
+    assert len(index._postings["com"]) < 1100
+
+
+def test_history_search_cycles_through_matches():
+    search = HistorySearch(HistoryIndex(["serialize a", "version", "serialize b"]))
+    assert search.match == "serialize b"
+    search.update("seri")
+    search.older()
+    assert search.match == "serialize a"
+    search.older()
+    assert search.match == "serialize a"
+    search.newer()
+    assert search.match == "serialize b"
+    search.update("nothing")
+    assert search.match is None
+
+
+def test_up_and_down_walk_the_history_in_the_tui(tmp_path):
+    from textual.widgets import Input
+
+    from app import CLIApp
+
+    async def _run():
+        app = CLIApp()
+        app.app_config.set("workers", "max_workers", "0")
+        app.history_manager = HistoryManager(tmp_path / "history", max_history=10)
+        for command in ("first", "second", "third"):
+            app.history_manager.add(command)
+        seen = []
+        async with app.run_test() as pilot:
+            input_widget = app.query_one("#input-box", Input)
+            input_widget.value = "draft"
+            for key in ("up", "up", "up", "up", "down", "down", "down"):
+                await pilot.press(key)
+                seen.append(input_widget.value)
+        app.history_manager.close()
+        return seen
+
+    assert asyncio.run(_run()) == [
+        "third",
+        "second",
+        "first",
+        "first",
+        "second",
+        "third",
+        "draft",
+    ]
@@ -0,0 +1,121 @@
+"""Tests for the job scheduler."""
+
+import asyncio
+
+import pytest
+
+from tui_typer.commands.cancellation import CancellationToken
+from tui_typer.commands.dispatcher import DispatchResult
+from tui_typer.commands.jobs import JobScheduler, JobState, parse_limits, split_job_options
+
+
+def _blocking_job(started: list, name: str, gate: asyncio.Event):
+    async def _run():
+        started.append(name)
+        await gate.wait()
+        return name
+
+    return _run
+
+
+def test_global_limit_and_fifo_order():
+    async def _run():
+        scheduler = JobScheduler(max_concurrent=2)
+        started, gate = [], asyncio.Event()
+        jobs = [scheduler.submit(n, _blocking_job(started, n, gate)) for n in "abcd"]
+        await asyncio.sleep(0)
+        assert started == ["a", "b"]
+        assert [job.state for job in jobs] == [JobState.RUNNING] * 2 + [JobState.QUEUED] * 2
+        gate.set()
+        await asyncio.gather(*(job.wait() for job in jobs))
+        assert started == ["a", "b", "c", "d"]
+        assert all(job.state is JobState.DONE for job in jobs)
+        assert jobs[3].result == "d"
+        assert jobs[3].wait_time >= 0 and jobs[3].run_time >= 0
+
+    asyncio.run(_run())
+
+
+def test_per_command_limit_lets_other_commands_pass():
+    async def _run():
+        scheduler = JobScheduler(max_concurrent=4, command_limits={"heavy": 1})
+        started, gate = [], asyncio.Event()
+        scheduler.submit("heavy 1", _blocking_job(started, "heavy1", gate), key="heavy")
+        scheduler.submit("heavy 2", _blocking_job(started, "heavy2", gate), key="heavy")
+        scheduler.submit("light", _blocking_job(started, "light", gate), key="light")
+        await asyncio.sleep(0)
+        assert started == ["heavy1", "light"]
+        gate.set()
+        while scheduler.active():
+            await asyncio.sleep(0)
+        assert started == ["heavy1", "light", "heavy2"]
+
+    asyncio.run(_run())
+
+
+def test_priority_policy_runs_lowest_value_first():
+    async def _run():
+        scheduler = JobScheduler(max_concurrent=1, policy="priority")
+        started, gate = [], asyncio.Event()
+        scheduler.submit("first", _blocking_job(started, "first", gate))
+        scheduler.submit("low", _blocking_job(started, "low", gate), priority=5)
+        scheduler.submit("high", _blocking_job(started, "high", gate), priority=-1)
+        gate.set()
+        while scheduler.active():
+            await asyncio.sleep(0)
+        assert started == ["first", "high", "low"]
+
+    asyncio.run(_run())
+
+
+def test_cancel_queued_and_running_jobs():
+    async def _run():
+        finished = []
+        scheduler = JobScheduler(max_concurrent=1, on_finish=finished.append)
+        started, gate = [], asyncio.Event()
+        running = scheduler.submit("a", _blocking_job(started, "a", gate))
+        queued = scheduler.submit("b", _blocking_job(started, "b", gate))
+        await asyncio.sleep(0)
+        assert scheduler.cancel(queued.id)
+        assert scheduler.cancel(running.id)
+        await running.wait()
+        assert running.state is JobState.CANCELLED
+        assert queued.state is JobState.CANCELLED
+        assert started == ["a"]
+        assert not scheduler.cancel(running.id)
+        assert {job.id for job in finished} == {running.id, queued.id}
+
+    asyncio.run(_run())
+
+
+def test_parse_limits_and_job_options():
+    assert parse_limits(["serialize excel:1", "bad", "x:y"]) == {"serialize excel": 1}
+    assert split_job_options(["--priority", "3", "version"]) == ({"--priority": "3"}, ["version"])
+    assert split_job_options(["--priority=3", "version"]) == ({"--priority": "3"}, ["version"])
+    assert split_job_options(["version", "--priority", "3"]) == ({}, ["version", "--priority", "3"])
+    with pytest.raises(ValueError):
+        split_job_options(["--priority"])
+    with pytest.raises(ValueError):
+        JobScheduler(policy="lifo")
+
+
+def test_cancel_with_token_lets_the_job_stop_itself():
+    async def _run():
+        scheduler = JobScheduler()
+        token = CancellationToken()
+
+        async def _job():
+            cancelled = asyncio.Event()
+            token.add_callback(cancelled.set)
+            await cancelled.wait()
+            return DispatchResult(130, "", "", "", status=token.status)
+
+        job = scheduler.submit("slow", _job, token=token)
+        await asyncio.sleep(0)
+        assert scheduler.cancel(job.id)
+        await job.wait()
+        return job
+
+    job = asyncio.run(_run())
+    assert job.state is JobState.CANCELLED
+    assert job.result.exit_code == 130
@@ -0,0 +1,116 @@
+"""Tests for lazily imported subcommand groups."""
+
+import asyncio
+import os
+import subprocess
+import sys
+import threading
+
+import typer
+
+from tui_typer.commands.dispatcher import Dispatcher
+from tui_typer.commands.lazy import LazySubcommand, describing, lazy_group
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
+
+# Modules that only the serialize commands need
+HEAVY_MODULES = ("pandas", "numpy", "openpyxl")
+
+tools = typer.Typer(help="Tools loaded on demand.")
+
+
+@tools.command()
+def hammer(times: int = 1):
+    """Hit things."""
+    typer.echo("bang " * times)
+
+
+def _make_app() -> typer.Typer:
+    app = typer.Typer(
+        cls=lazy_group(tools=LazySubcommand(f"{__name__}:tools", help="Tools loaded on demand."))
+    )
+
+    @app.callback()
+    def main():
+        pass
+
+    @app.command()
+    def version():
+        typer.echo("1.0")
+
+    return app
+
+
+def test_help_lists_lazy_groups_without_loading_them():
+    dispatcher = Dispatcher(_make_app())
+    text = dispatcher.help_text([])
+    assert "tools" in text and "Tools loaded on demand." in text
+    assert "tools" not in dispatcher.command.commands
+
+    with describing():
+        placeholder = dispatcher.command.get_command(None, "tools")
+    assert placeholder.help == "Tools loaded on demand."
+    assert "tools" not in dispatcher.command.commands
+
+
+def test_lazy_group_loads_when_invoked():
+    dispatcher = Dispatcher(_make_app())
+    result = dispatcher.invoke(["tools", "hammer", "--times", "2"])
+    assert result.exit_code == 0
+    assert result.stdout == "bang bang \n"
+    assert dispatcher.resolve(["tools", "hammer"])[0] == ["tools", "hammer"]
+    assert "Hit things." in dispatcher.help_text(["tools", "hammer"])
+
+
+def test_preload_imports_lazy_groups_off_the_event_loop(monkeypatch):
+    dispatcher = Dispatcher(_make_app())
+    assert not dispatcher.needs_import(["version"])
+    assert dispatcher.needs_import(["tools", "hammer"])
+
+    threads = []
+    resolve = dispatcher.resolve
+
+    def _resolve(args):
+        threads.append(threading.current_thread())
+        return resolve(args)
+
+    monkeypatch.setattr(dispatcher, "resolve", _resolve)
+    asyncio.run(dispatcher.preload(["tools", "hammer"]))
+    assert threads and threads[0] is not threading.main_thread()
+    assert "tools" in dispatcher.command.commands
+    assert not dispatcher.needs_import(["tools", "hammer"])
+
+
+def _import_time_us(code: str, manifest: str) -> tuple[int, set[str]]:
+    """Total import time of ``code`` in a fresh interpreter and the modules it imported."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        env={**os.environ, "TUI_TYPER_PLUGIN_MANIFEST": manifest},
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    total, modules = 0, set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, name = line.split("|")
+        modules.add(name.strip())
+        if not name.startswith("  "):
+            # Top-level imports; their cumulative times include everything nested
+            total += int(cumulative)
+    return total, modules
+
+
+def test_cli_startup_does_not_import_heavy_modules(tmp_path):
+    manifest = str(tmp_path / "plugins.json")
+    code = "import cli; cli.cli(['version'], standalone_mode=False)"
+    lazy_us, modules = _import_time_us(code, manifest)
+    assert not modules.intersection(HEAVY_MODULES)
+    # The manifest is only written once a plugin is imported
+    assert not os.path.exists(manifest)
+
+    # Budget: starting up for `version` costs well under half of the eager import
+    eager_us, _ = _import_time_us("import cli, tui_typer.commands.typer_subcommand", manifest)
+    assert lazy_us < eager_us / 2, f"lazy {lazy_us}us vs eager {eager_us}us"
@@ -0,0 +1,90 @@
+"""Tests for the batched loguru sink of the log pane."""
+
+import threading
+
+from loguru import logger
+
+from tui_typer.ui.logging import TextualLogHandler
+
+
+class _Widget:
+    def __init__(self):
+        self.writes = []
+        self.border_subtitle = ""
+
+    def write(self, text):
+        self.writes.append(text)
+
+
+def _log(handler, records):
+    sink_id = logger.add(handler.write, format="{message}", level="DEBUG", colorize=False)
+    try:
+        records()
+    finally:
+        logger.remove(sink_id)
+
+
+def test_records_are_written_in_one_batch():
+    widget = _Widget()
+    handler = TextualLogHandler(widget)
+    _log(handler, lambda: [logger.info(f"record {i}") for i in range(5)])
+    assert widget.writes == []
+    handler.flush()
+    assert len(widget.writes) == 1
+    lines = widget.writes[0].split("\n")
+    assert len(lines) == 5
+    assert lines[0].endswith("- record 0")
+    handler.flush()
+    assert len(widget.writes) == 1
+
+
+def test_messages_are_escaped():
+    widget = _Widget()
+    handler = TextualLogHandler(widget)
+    _log(handler, lambda: logger.info("value [/bold] in brackets"))
+    handler.flush()
+    assert widget.writes[0].endswith("value \\[/bold] in brackets")
+
+
+def test_flood_is_sampled_and_counted():
+    widget = _Widget()
+    handler = TextualLogHandler(widget, max_pending=10, sample_every=10)
+
+    def _records():
+        for i in range(110):
+            logger.debug(f"debug {i}")
+        logger.error("kept")
+
+    _log(handler, _records)
+    # 10 queued, 100 over the limit of which every 10th is kept, and the error
+    assert handler.suppressed == 90
+    # A flush writes at most max_pending lines, plus the suppressed count
+    handler.flush()
+    assert widget.writes[0].split("\n")[-1] == "[dim]... 90 log lines suppressed[/dim]"
+    handler.flush()
+    handler.flush()
+    assert len(widget.writes) == 3
+    lines = "\n".join(widget.writes).split("\n")
+    assert sum("debug" in line for line in lines) == 20
+    assert lines[-1].endswith("- kept")
+    assert widget.border_subtitle == "90 suppressed"
+
+
+def test_write_from_threads():
+    widget = _Widget()
+    handler = TextualLogHandler(widget, max_pending=100_000)
+
+    def _records():
+        threads = [
+            threading.Thread(target=lambda: [logger.info("x") for _ in range(500)])
+            for _ in range(4)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+    _log(handler, _records)
+    handler.flush()
+    assert len(widget.writes[0].split("\n")) == 2000
+    assert handler.suppressed == 0
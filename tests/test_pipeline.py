@@ -0,0 +1,121 @@
+"""Tests for pipelines passing objects between commands."""
+
+import asyncio
+
+import pytest
+import typer
+
+from tui_typer.commands.dispatcher import Dispatcher
+from tui_typer.commands.pipeline import (
+    dispatch_pipeline,
+    has_piped_input,
+    piped_input,
+    split_pipeline,
+)
+from tui_typer.commands.script import ScriptRunner, read_script
+from tui_typer.commands.streaming import OutputStream
+
+
+def _make_app(seen: list, made: list | None = None) -> typer.Typer:
+    app = typer.Typer()
+
+    @app.command()
+    def rows(count: int = 3):
+        print(f"producing {count} rows")
+        data = [{"id": i} for i in range(count)]
+        if made is not None:
+            made.append(data)
+        return data
+
+    @app.command()
+    def evens():
+        data = piped_input()
+        seen.append(data)
+        return [row for row in data if row["id"] % 2 == 0]
+
+    @app.command()
+    def count():
+        print(len(piped_input(default=[])))
+
+    @app.command()
+    def check():
+        seen.append(has_piped_input())
+
+    return app
+
+
+def test_split_pipeline():
+    assert split_pipeline(["rows", "--count", "5", "|", "evens", "|", "count"]) == [
+        ["rows", "--count", "5"],
+        ["evens"],
+        ["count"],
+    ]
+    assert split_pipeline(["rows"]) == [["rows"]]
+    with pytest.raises(ValueError):
+        split_pipeline(["rows", "|"])
+    with pytest.raises(ValueError):
+        split_pipeline(["rows", "|", "|", "count"])
+
+
+def test_return_value_is_in_the_result():
+    app = _make_app([])
+    result = asyncio.run(Dispatcher(app).dispatch(["rows", "--count", "2"]))
+    assert result.value == [{"id": 0}, {"id": 1}]
+
+
+def test_objects_are_passed_without_copies():
+    seen, made = [], []
+    app = _make_app(seen, made)
+    stages = [["rows", "--count", "100000"], ["evens"], ["count"]]
+    result = asyncio.run(dispatch_pipeline(app, stages))
+    assert result.exit_code == 0
+    assert result.stdout == "producing 100000 rows\n50000\n"
+    # The list evens received is the one rows returned, not a re-parsed copy
+    assert seen[0] is made[0]
+    assert result.value is None
+
+
+def test_value_of_the_last_command_is_returned():
+    seen = []
+    app = _make_app(seen)
+    result = asyncio.run(dispatch_pipeline(app, [["rows"], ["evens"]]))
+    assert result.value == [{"id": 0}, {"id": 2}]
+    assert seen[0][1] == {"id": 1}
+
+
+def test_pipeline_stops_at_the_first_failure():
+    seen = []
+    app = _make_app(seen)
+    result = asyncio.run(dispatch_pipeline(app, [["evens"], ["count"]]))
+    assert result.exit_code == 2
+    assert "expects input piped" in result.stderr
+    assert seen == []
+
+
+def test_first_command_gets_no_input():
+    seen = []
+    app = _make_app(seen)
+    asyncio.run(dispatch_pipeline(app, [["check"], ["check"]]))
+    assert seen == [False, True]
+
+
+def test_output_of_all_commands_goes_to_the_stream():
+    app = _make_app([])
+
+    async def _run():
+        stream = OutputStream()
+        result = await dispatch_pipeline(app, [["rows"], ["count"]], stream=stream)
+        return result, stream
+
+    result, stream = asyncio.run(_run())
+    assert result.stdout == ""
+    assert stream.closed
+    assert stream.drain() == ["producing 3 rows", "3"]
+
+
+def test_script_lines_may_be_pipelines(capsys):
+    app = _make_app([])
+    steps = read_script(["rows --count 4 | evens | count", "rows | | count"])
+    asyncio.run(ScriptRunner(app).run(steps))
+    assert capsys.readouterr().out == "producing 4 rows\n2\n"
+    assert [step.status for step in steps] == ["ok", "exit 2"]
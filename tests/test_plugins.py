@@ -0,0 +1,138 @@
+"""Tests for plugin discovery and the cached plugin manifest."""
+
+import importlib.metadata
+import os
+import sys
+
+import pytest
+import typer
+
+from tui_typer.commands import plugins
+from tui_typer.commands.lazy import lazy_group
+from tui_typer.commands.loader import load_commands
+from tui_typer.commands.plugins import (
+    Plugin,
+    PluginManifest,
+    describe_command,
+    discover_plugins,
+    plugin_subcommands,
+)
+
+PLUGIN_SOURCE = '''
+import typer
+
+tools = typer.Typer(help="Tools from a plugin.")
+
+
+@tools.command()
+def hammer(times: int = typer.Option(1, help="How often")):
+    """Hit things."""
+    typer.echo("bang " * times)
+
+
+def cli_plugin():
+    return "tools", typer.main.get_group(tools)
+'''
+
+
+@pytest.fixture()
+def plugin(tmp_path, monkeypatch):
+    (tmp_path / "tools_plugin.py").write_text(PLUGIN_SOURCE)
+    monkeypatch.syspath_prepend(str(tmp_path))
+    origin = str(tmp_path / "tools_plugin.py")
+    yield Plugin("tools", "tools_plugin:cli_plugin", version="1.0", origin=origin)
+    sys.modules.pop("tools_plugin", None)
+
+
+def test_describe_command_records_subcommands_and_params(plugin):
+    description = describe_command(plugin.load())
+    assert description["help"] == "Tools from a plugin."
+    assert description["is_group"]
+    hammer = description["commands"]["hammer"]
+    assert hammer["help"] == "Hit things."
+    (times,) = hammer["params"]
+    assert times["opts"] == ["--times"]
+    assert times["default"] == 1
+    assert times["help"] == "How often"
+
+
+def test_manifest_is_reused_until_the_plugin_changes(plugin, tmp_path):
+    path = tmp_path / "plugins.json"
+    PluginManifest(path).refresh([plugin])
+    sys.modules.pop("tools_plugin")
+
+    manifest = PluginManifest(path)
+    assert manifest.get(plugin)["commands"]["hammer"]["help"] == "Hit things."
+    assert "tools_plugin" not in sys.modules
+
+    assert manifest.get(Plugin(plugin.name, plugin.value, version="2.0")) is None
+    module_path = tmp_path / "tools_plugin.py"
+    mtime = os.stat(module_path).st_mtime
+    os.utime(module_path, (mtime + 10, mtime + 10))
+    assert manifest.get(plugin) is None
+
+
+def test_manifest_drops_removed_plugins(plugin, tmp_path):
+    path = tmp_path / "plugins.json"
+    PluginManifest(path).refresh([plugin])
+    assert PluginManifest(path).refresh([]) == {}
+    assert PluginManifest(path).get(plugin) is None
+
+
+def test_commands_load_from_manifest_without_importing_plugins(plugin, tmp_path):
+    manifest = PluginManifest(tmp_path / "plugins.json")
+    manifest.refresh([plugin])
+    sys.modules.pop("tools_plugin")
+
+    app = typer.Typer(cls=lazy_group(**plugin_subcommands(manifest, plugins=[plugin])))
+
+    @app.callback()
+    def main():
+        pass
+
+    commands = load_commands(app)
+    assert commands["tools"].description == "Tools from a plugin."
+    assert commands["tools"].is_group
+    assert commands["tools hammer"].parent == "tools"
+    assert not commands["tools hammer"].loaded
+    assert "tools_plugin" not in sys.modules
+
+    assert commands["tools hammer"].typer_command.name == "hammer"
+    assert "tools_plugin" in sys.modules
+
+
+def test_plugins_are_recorded_when_first_imported_not_when_registered(plugin, tmp_path):
+    path = tmp_path / "plugins.json"
+    subcommands = plugin_subcommands(PluginManifest(path), plugins=[plugin])
+    assert "tools_plugin" not in sys.modules
+    assert not path.exists()
+
+    app = typer.Typer(cls=lazy_group(**subcommands))
+
+    @app.callback()
+    def main():
+        pass
+
+    group = typer.main.get_group(app)
+    assert group.get_command(None, "tools").name == "tools"
+    assert PluginManifest(path).get(plugin)["commands"]["hammer"]["help"] == "Hit things."
+
+
+def test_builtin_plugins_are_fingerprinted_without_importing_them():
+    (serialize,) = [plugin for plugin in discover_plugins() if plugin.name == "serialize"]
+    assert serialize.origin.endswith(os.path.join("tui_typer", "commands", "typer_subcommand.py"))
+    assert serialize.fingerprint()["mtime"] == os.stat(serialize.origin).st_mtime
+
+
+def test_discover_plugins_reads_entry_points(monkeypatch):
+    entry_point = importlib.metadata.EntryPoint(
+        name="tools", value="tools_plugin:cli_plugin", group=plugins.ENTRY_POINT_GROUP
+    )
+    monkeypatch.setattr(
+        importlib.metadata,
+        "entry_points",
+        lambda group: [entry_point] if group == plugins.ENTRY_POINT_GROUP else [],
+    )
+    found = {plugin.name: plugin.value for plugin in discover_plugins()}
+    assert found["tools"] == "tools_plugin:cli_plugin"
+    assert found["serialize"] == plugins.BUILTIN_PLUGINS["serialize"]
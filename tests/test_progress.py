@@ -0,0 +1,183 @@
+"""Tests for the progress API available to commands."""
+
+import asyncio
+import threading
+
+from textual.app import App
+import typer
+
+from tui_typer.commands.dispatcher import Dispatcher
+from tui_typer.commands.progress import (
+    ProgressBoard,
+    RateMeter,
+    RichProgressBoard,
+    bind_progress,
+    current_board,
+    progress,
+    track,
+)
+from tui_typer.ui.logging import TextualProgressSink
+from tui_typer.ui.progress import JobProgress, ProgressPanel, progress_stats
+
+
+class _Bar:
+    def __init__(self):
+        self.updates = []
+
+    def update(self, **kwargs):
+        self.updates.append(kwargs)
+
+
+def test_progress_adds_task_to_bound_board():
+    board = ProgressBoard()
+    with bind_progress(board):
+        assert current_board() is board
+        with progress(total=4, description="rows") as task:
+            assert board.tasks() == [task]
+            task.advance()
+            task.advance(2)
+            assert task.completed == 3
+            assert task.fraction == 0.75
+        assert board.tasks() == []
+        assert task.finished
+    assert isinstance(current_board(), RichProgressBoard)
+
+
+def test_track_counts_items():
+    board = ProgressBoard()
+    seen = []
+    with bind_progress(board):
+        for item in track(range(5), description="items"):
+            seen.append((item, board.tasks()[0].completed, board.tasks()[0].total))
+    assert seen == [(i, i, 5) for i in range(5)]
+    assert len(board) == 0
+
+
+def test_cli_fallback_without_terminal():
+    with progress(total=3) as task:
+        assert task in current_board().tasks()
+        task.advance(3)
+    assert len(current_board()) == 0
+
+
+def test_board_reaches_dispatched_command():
+    app = typer.Typer()
+    board = ProgressBoard()
+    seen = []
+
+    @app.command()
+    def export(rows: int = 1000):
+        with progress(total=rows, description="export") as task:
+            for _ in range(rows):
+                task.advance()
+            seen.append([(t.description, t.completed) for t in board.tasks()])
+
+    @app.command()
+    def other():
+        pass
+
+    async def _run():
+        with bind_progress(board):
+            return await Dispatcher(app).dispatch(["export"])
+
+    result = asyncio.run(_run())
+    assert result.exit_code == 0
+    assert seen == [[("export", 1000)]]
+    assert len(board) == 0
+
+
+def test_sink_coalesces_updates():
+    board = ProgressBoard()
+    bar = _Bar()
+    sink = TextualProgressSink(bar, board)
+    sink.refresh()
+    assert bar.updates == [{"total": 100.0, "progress": 0.0}]
+
+    first = board.add("a", total=1_000_000)
+    for _ in range(1_000_000):
+        first.advance()
+    second = board.add("b", total=10)
+    sink.refresh()
+    sink.refresh()
+    assert bar.updates[1:] == [{"total": 1_000_010, "progress": 1_000_000}]
+
+    board.add("c")
+    sink.refresh()
+    assert bar.updates[-1] == {"total": None, "progress": 0.0}
+
+    board.remove(first)
+    board.remove(second)
+    for task in board.tasks():
+        board.remove(task)
+    # Set on the UI thread, the widget is updated at once
+    sink.set_progress(40)
+    assert bar.updates[-1] == {"total": 100.0, "progress": 40}
+    sink.refresh()
+    assert bar.updates[-1] == {"total": 100.0, "progress": 40}
+
+    thread = threading.Thread(target=sink.update, args=(10,))
+    thread.start()
+    thread.join()
+    assert bar.updates[-1] == {"total": 100.0, "progress": 40}
+    sink.refresh()
+    assert bar.updates[-1] == {"total": 100.0, "progress": 50}
+
+
+def test_rate_meter_uses_sliding_window():
+    meter = RateMeter(window=10)
+    meter.add(0, now=0)
+    assert meter.rate is None
+    meter.add(100, now=1)
+    assert meter.rate == 100
+    # Fast start, then slower: only the last 10 seconds count
+    for second in range(2, 31):
+        meter.add(100 + 10 * (second - 1), now=second)
+    assert meter.rate == 10
+    assert meter.eta(50) == 5
+    meter.add(0, now=31)
+    assert meter.rate is None
+
+
+def test_progress_stats():
+    meter = RateMeter()
+    meter.add(0, now=0)
+    assert progress_stats(0, 100, meter) == "0/100"
+    meter.add(2000, now=2)
+    assert progress_stats(2000, 12_000, meter) == "2,000/12,000  1.0k it/s  ETA 0:00:10"
+    assert progress_stats(2000, None, meter) == "2,000  1.0k it/s"
+
+
+class _PanelApp(App):
+    def compose(self):
+        yield ProgressPanel(refresh_rate=100)
+
+
+def test_panel_shows_one_bar_per_job():
+    async def _run():
+        app = _PanelApp()
+        async with app.run_test() as pilot:
+            panel = app.query_one(ProgressPanel)
+            first, second = ProgressBoard("[1] export"), ProgressBoard("[2] import")
+            panel.track(first)
+            panel.track(second)
+            await pilot.pause(0.05)
+            assert not panel.display
+            assert len(panel.query(JobProgress)) == 0
+
+            task = first.add("rows", total=10)
+            second.add("files", total=5)
+            task.advance(5)
+            await pilot.pause(0.05)
+            assert panel.display
+            rows = list(panel.query(JobProgress))
+            assert [row.board for row in rows] == [first, second]
+
+            panel.untrack(first)
+            await pilot.pause(0.05)
+            assert [row.board for row in panel.query(JobProgress)] == [second]
+            panel.untrack(second)
+            await pilot.pause(0.05)
+            assert not panel.display
+            assert len(panel.query(JobProgress)) == 0
+
+    asyncio.run(_run())
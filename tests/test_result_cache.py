@@ -0,0 +1,230 @@
+"""Tests for the result cache of cacheable commands."""
+
+import asyncio
+import threading
+import time
+
+import pytest
+import typer
+
+from tui_typer.commands.base import dispatch_typer_command
+from tui_typer.commands.cancellation import CancellationToken, DispatchStatus
+from tui_typer.commands.dispatcher import DispatchResult
+from tui_typer.commands.result_cache import ResultCache, cacheable, result_size
+from tui_typer.commands.streaming import OutputStream
+
+
+def _make_app(calls: list) -> typer.Typer:
+    app = typer.Typer()
+    lock = threading.Lock()
+
+    @app.command()
+    @cacheable
+    def summary(name: str = "all", delay: float = 0.0, fail: bool = False):
+        with lock:
+            calls.append(name)
+        time.sleep(delay)
+        if fail:
+            raise typer.Exit(1)
+        print(f"summary of {name}: {len(calls)}")
+
+    @app.command()
+    @cacheable(ttl=30, inputs=["path"])
+    def count(path: str):
+        calls.append(path)
+        with open(path) as f:
+            print(len(f.read().split()))
+
+    @app.command()
+    def touch():
+        calls.append("touch")
+        print(f"touched {len(calls)}")
+
+    return app
+
+
+def test_cacheable_results_are_reused():
+    calls = []
+    app = _make_app(calls)
+    cache = ResultCache()
+
+    async def _run():
+        first = await dispatch_typer_command(app, ["summary", "--name", "a"], cache=cache)
+        second = await dispatch_typer_command(app, ["summary", "--name", "a"], cache=cache)
+        other = await dispatch_typer_command(app, ["summary", "--name", "b"], cache=cache)
+        plain = [await dispatch_typer_command(app, ["touch"], cache=cache) for _ in range(2)]
+        return first, second, other, plain
+
+    first, second, other, plain = asyncio.run(_run())
+    assert first.stdout == second.stdout == "summary of a: 1\n"
+    assert other.stdout == "summary of b: 2\n"
+    assert [result.stdout for result in plain] == ["touched 3\n", "touched 4\n"]
+    stats = cache.stats
+    assert (stats.hits, stats.misses, stats.entries) == (1, 2, 2)
+
+
+def test_failures_are_not_cached():
+    calls = []
+    app = _make_app(calls)
+    cache = ResultCache()
+
+    async def _run():
+        for _ in range(2):
+            await dispatch_typer_command(app, ["summary", "--fail"], cache=cache)
+
+    asyncio.run(_run())
+    assert len(calls) == 2
+    assert len(cache) == 0
+
+
+def test_concurrent_identical_dispatches_share_one_run():
+    calls = []
+    app = _make_app(calls)
+    cache = ResultCache()
+
+    async def _run():
+        args = ["summary", "--delay", "0.2"]
+        return await asyncio.gather(
+            *(dispatch_typer_command(app, args, cache=cache) for _ in range(4))
+        )
+
+    results = asyncio.run(_run())
+    assert calls == ["all"]
+    assert {result.stdout for result in results} == {"summary of all: 1\n"}
+    assert cache.stats.shared == 3
+
+
+def test_input_files_are_part_of_the_key(tmp_path):
+    calls = []
+    app = _make_app(calls)
+    cache = ResultCache()
+    path = tmp_path / "words.txt"
+    path.write_text("one two")
+
+    async def _run():
+        return (await dispatch_typer_command(app, ["count", str(path)], cache=cache)).stdout
+
+    assert asyncio.run(_run()) == "2\n"
+    assert asyncio.run(_run()) == "2\n"
+    path.write_text("one two three")
+    assert asyncio.run(_run()) == "3\n"
+    assert len(calls) == 2
+
+
+def test_cached_output_goes_to_the_stream():
+    app = _make_app([])
+    cache = ResultCache()
+
+    async def _run():
+        outputs = []
+        for _ in range(2):
+            stream = OutputStream()
+            result = await dispatch_typer_command(app, ["summary"], stream=stream, cache=cache)
+            outputs.append((result.stdout, stream.drain()))
+        return outputs
+
+    assert asyncio.run(_run()) == [("", ["summary of all: 1"])] * 2
+
+
+def _result(text: str) -> DispatchResult:
+    return DispatchResult(exit_code=0, stdout=text, stderr="", help_text="")
+
+
+def test_entries_expire_and_are_evicted_by_size():
+    now = [0.0]
+    size = result_size(_result("x" * 100))
+    cache = ResultCache(max_bytes=2 * size, ttl=10, clock=lambda: now[0])
+    cache.put("a", _result("x" * 100))
+    cache.put("b", _result("y" * 100), ttl=1)
+    assert cache.get("a").stdout == "x" * 100
+    # "b" is now the least recently used
+    cache.put("c", _result("z" * 100))
+    assert cache.get("b") is None
+    assert cache.stats.evictions == 1
+    now[0] = 10.0
+    assert cache.get("a") is None
+    assert cache.get("c") is None
+    assert cache.stats.size == 0
+    cache.put("big", _result("x" * 1000))
+    assert len(cache) == 0
+
+
+def test_waiters_run_the_command_when_the_first_dispatch_is_cancelled():
+    cache = ResultCache()
+    started = []
+
+    async def _invoke():
+        started.append(True)
+        await asyncio.sleep(0.1)
+        return _result(f"run {len(started)}")
+
+    async def _run():
+        first = asyncio.create_task(cache.run("key", _invoke))
+        await asyncio.sleep(0.01)
+        second = asyncio.create_task(cache.run("key", _invoke))
+        await asyncio.sleep(0.01)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(_run()).stdout == "run 2"
+
+
+def test_a_waiter_stops_waiting_when_its_own_token_is_cancelled():
+    cache = ResultCache()
+    release = asyncio.Event()
+
+    async def _invoke():
+        await release.wait()
+        return _result("shared")
+
+    async def _run():
+        first = asyncio.create_task(cache.run("key", _invoke))
+        await asyncio.sleep(0.01)
+        token = CancellationToken()
+        second = asyncio.create_task(cache.run("key", _invoke, token=token))
+        third = asyncio.create_task(cache.run("key", _invoke, timeout=0.05))
+        await asyncio.sleep(0.01)
+        token.cancel()
+        stopped = await asyncio.wait_for(asyncio.gather(second, third), 1)
+        assert not first.done()
+        release.set()
+        return stopped, await first
+
+    (cancelled, timed_out), first = asyncio.run(_run())
+    assert (cancelled.status, cancelled.exit_code) == (DispatchStatus.CANCELLED, 130)
+    assert (timed_out.status, timed_out.exit_code) == (DispatchStatus.TIMED_OUT, 124)
+    assert first.stdout == "shared"
+    assert cache.stats.shared == 0
+
+
+def test_waiters_run_the_command_when_the_first_dispatch_is_stopped_by_its_token():
+    cache = ResultCache()
+    started = []
+
+    async def _invoke():
+        started.append(True)
+        await asyncio.sleep(0.05)
+        if len(started) == 1:
+            return DispatchResult(
+                exit_code=130,
+                stdout="",
+                stderr="",
+                help_text="",
+                status=DispatchStatus.CANCELLED,
+            )
+        return _result(f"run {len(started)}")
+
+    async def _run():
+        first = asyncio.create_task(cache.run("key", _invoke))
+        await asyncio.sleep(0.01)
+        waiters = [asyncio.create_task(cache.run("key", _invoke)) for _ in range(2)]
+        return await first, await asyncio.gather(*waiters)
+
+    first, waiters = asyncio.run(_run())
+    assert first.status is DispatchStatus.CANCELLED
+    # One waiter ran the command again and the other shared its result
+    assert [result.stdout for result in waiters] == ["run 2", "run 2"]
+    assert len(started) == 2
+    assert cache.get("key").stdout == "run 2"
@@ -0,0 +1,98 @@
+"""Tests for the headless script runner."""
+
+import asyncio
+import time
+
+import pytest
+import typer
+
+from tui_typer.commands.cancellation import check_cancelled
+from tui_typer.commands.script import ScriptRunner, exit_code, read_script, summary_table
+
+
+def _make_app() -> typer.Typer:
+    app = typer.Typer()
+
+    @app.command()
+    def echo(text: str, delay: float = 0.0):
+        time.sleep(delay)
+        print(text)
+
+    @app.command()
+    def wait(seconds: float):
+        for _ in range(int(seconds * 100)):
+            check_cancelled()
+            time.sleep(0.01)
+
+    @app.command()
+    def fail(code: int = 3):
+        raise typer.Exit(code)
+
+    return app
+
+
+def test_read_script():
+    steps = read_script(["echo one\n", "\n", "  # a comment\n", "echo 'two words'  # note\n"])
+    assert [(step.line, step.args) for step in steps] == [
+        (1, ["echo", "one"]),
+        (4, ["echo", "two words"]),
+    ]
+    with pytest.raises(ValueError, match="line 2"):
+        read_script(["echo one", "echo 'open"])
+
+
+def test_parallel_output_is_printed_in_script_order(capsys):
+    steps = read_script(["echo first --delay 0.3", "echo second", "echo third --delay 0.1"])
+    start = time.perf_counter()
+    asyncio.run(ScriptRunner(_make_app(), jobs=3).run(steps))
+    elapsed = time.perf_counter() - start
+    assert capsys.readouterr().out == "first\nsecond\nthird\n"
+    assert elapsed < 0.4
+    assert [step.status for step in steps] == ["ok", "ok", "ok"]
+    assert steps[0].seconds >= 0.3
+    assert exit_code(steps) == 0
+
+
+def test_stop_on_error_skips_the_rest(capsys):
+    steps = read_script(["echo one", "fail", "echo two"])
+    asyncio.run(ScriptRunner(_make_app(), stop_on_error=True).run(steps))
+    assert capsys.readouterr().out == "one\n"
+    assert [step.status for step in steps] == ["ok", "exit 3", "skipped"]
+    assert exit_code(steps) == 3
+
+    steps = read_script(["echo one", "fail", "echo two"])
+    asyncio.run(ScriptRunner(_make_app()).run(steps))
+    assert capsys.readouterr().out == "one\ntwo\n"
+    assert exit_code(steps) == 3
+    assert "3 commands, 1 failed, 0 skipped" in summary_table(steps, 1.0).caption
+
+
+def test_timeout_applies_to_each_command(capsys):
+    steps = read_script(["wait 2", "echo fast"])
+    asyncio.run(ScriptRunner(_make_app(), timeout=0.1).run(steps))
+    assert [step.status for step in steps] == ["timed out", "ok"]
+    assert exit_code(steps) == 124
+
+
+def test_run_script_command(runner, typer_cli, tmp_path):
+    script = tmp_path / "script.txt"
+    script.write_text("version\n# twice\nversion\n")
+    result = runner.invoke(typer_cli, ["run-script", str(script), "--no-summary"])
+    assert result.exit_code == 0
+    assert result.stdout.count("OCX Reader CLI v1.0.0") == 2
+
+    result = runner.invoke(typer_cli, ["run-script", "-", "-x"], input="version\nnope\nversion\n")
+    assert result.exit_code == 2
+    assert result.stdout.count("OCX Reader CLI v1.0.0") == 1
+
+    result = runner.invoke(typer_cli, ["run-script", str(tmp_path / "missing.txt")])
+    assert result.exit_code == 2
+
+
+def test_non_interactive_command_is_awaited(capsys):
+    from app import CLIApp
+
+    app = CLIApp()
+    assert asyncio.run(app.execute_command_non_interactive("version", [])) == 0
+    assert "OCX Reader CLI v1.0.0" in capsys.readouterr().out
+    assert asyncio.run(app.execute_command_non_interactive("nope", [])) == 1
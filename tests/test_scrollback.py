@@ -0,0 +1,127 @@
+"""Tests for the bounded scrollback of the log widgets."""
+
+import asyncio
+import os
+
+from rich.table import Table
+from rich.text import Text
+from textual.app import App
+
+from tui_typer.ui.scrollback import ScrollbackLog, ScrollbackStore
+
+
+def test_spill_moves_oldest_entries_to_disk(tmp_path):
+    store = ScrollbackStore(tmp_path)
+    for i in range(10):
+        assert store.append(f"line {i}") == i
+    assert store.spill(4) == 4
+    assert store.spilled == 4
+    assert len(store) == 10
+    assert os.path.dirname(store.path) == str(tmp_path)
+    assert store.read(0, 10) == [f"line {i}" for i in range(10)]
+    assert store.read(2, 6) == ["line 2", "line 3", "line 4", "line 5"]
+    assert store.get(3) == "line 3"
+    assert store.get(7) == "line 7"
+    assert store.spill(4) == 0
+
+
+def test_find_searches_disk_and_memory(tmp_path):
+    store = ScrollbackStore(tmp_path)
+    store.append("[green]INFO[/green] loaded report")
+    store.append("first\nsecond report line")
+    store.append("unrelated")
+    store.append("[bold]Report[/bold] done")
+    store.spill(2)
+    assert store.find("report") == [
+        (0, "INFO loaded report"),
+        (1, "second report line"),
+        (3, "Report done"),
+    ]
+    assert store.find("report", ignore_case=False, limit=1) == [(0, "INFO loaded report")]
+    assert store.find("missing") == []
+
+
+def test_renderables_are_spilled_as_plain_text(tmp_path):
+    store = ScrollbackStore(tmp_path)
+    table = Table("Name")
+    table.add_row(Text("[value]"))
+    store.append(table)
+    store.spill(1)
+    text = store.get(0)
+    assert isinstance(text, str)
+    assert "\\[value]" in text
+    assert [index for index, _ in store.find("[value]")] == [0]
+
+
+def test_close_deletes_segment_file(tmp_path):
+    store = ScrollbackStore(tmp_path)
+    store.append("line")
+    store.spill(1)
+    path = store.path
+    assert os.path.exists(path)
+    store.close()
+    assert not os.path.exists(path)
+    assert len(store) == 0
+
+
+class _LogApp(App):
+    def __init__(self, directory):
+        super().__init__()
+        self.directory = directory
+
+    def compose(self):
+        yield ScrollbackLog(max_lines=20, page_entries=5, spill_dir=self.directory)
+
+
+def test_log_keeps_bounded_lines_and_reloads_on_scroll_back(tmp_path):
+    async def _run():
+        app = _LogApp(tmp_path)
+        async with app.run_test(size=(80, 10)) as pilot:
+            log = app.query_one(ScrollbackLog)
+            for i in range(50):
+                log.write(f"entry {i}")
+            await pilot.pause()
+            assert len(log.lines) == 20
+            assert log.hidden_entries == 30
+            assert log.store.spilled == 30
+            assert [line for _, line in log.find("entry 3")][:2] == ["entry 3", "entry 30"]
+
+            log.scroll_home(animate=False, immediate=True)
+            await pilot.pause()
+            assert log.hidden_entries == 25
+            assert len(log.lines) == 25
+            assert log.scroll_y == 5
+            assert log.lines[0].text.rstrip() == "entry 25"
+
+            log.scroll_end(animate=False, immediate=True)
+            log.write("entry 50")
+            await pilot.pause()
+            assert len(log.lines) == 20
+            assert log.lines[-1].text.rstrip() == "entry 50"
+
+    asyncio.run(_run())
+
+
+def test_log_renders_markup_renderables_and_deferred_writes(tmp_path):
+    async def _run():
+        app = _LogApp(tmp_path)
+        log = ScrollbackLog(markup=True, spill_dir=tmp_path)
+        # Written before the width is known, rendered once it is
+        log.write("[bold]early[/bold]")
+        async with app.run_test(size=(40, 20)) as pilot:
+            await app.mount(log)
+            await pilot.pause()
+            table = Table("Name")
+            table.add_row("report")
+            log.write(table)
+            log.write("x" * 100)
+            await pilot.pause()
+            texts = [line.text.rstrip() for line in log.lines]
+            assert texts[0] == "early"
+            assert any("report" in text for text in texts)
+            # Like RichLog, entries are shrunk to the log but kept min_width wide
+            assert texts[-1] == "x" * log.min_width
+            assert log.virtual_size.width == log.min_width
+            assert log.store.read(0, 1) == ["[bold]early[/bold]"]
+
+    asyncio.run(_run())
@@ -0,0 +1,50 @@
+"""Tests for the command palette search index."""
+
+from textual.fuzzy import Matcher
+
+from tui_typer.commands.base import Command
+from tui_typer.commands.search import CommandIndex, is_subsequence, trigrams
+
+NAMES = ["history", "list-commands", "serialize", "serialize excel", "Serialize CSV", "version"]
+
+
+def _index() -> CommandIndex:
+    return CommandIndex({name: Command(name=name, description=f"{name} help") for name in NAMES})
+
+
+def _names(index: CommandIndex, query: str) -> list[str]:
+    return [entry.name for entry in index.search(query)]
+
+
+def test_helpers():
+    assert trigrams("excel") == {"exc", "xce", "cel"}
+    assert trigrams("ex") == set()
+    assert is_subsequence("srx", "serialize excel")
+    assert not is_subsequence("xs", "serialize excel")
+
+
+def test_prefix_matches_come_first_and_ignore_case():
+    assert _names(_index(), "SER")[:3] == ["Serialize CSV", "serialize", "serialize excel"]
+
+
+def test_substring_and_fuzzy_matches():
+    index = _index()
+    assert _names(index, "excel") == ["serialize excel"]
+    assert _names(index, "mand") == ["list-commands"]
+    assert _names(index, "vrs") == ["version"]
+    assert _names(index, "zzz") == []
+    assert len(index.search("")) == len(NAMES)
+
+
+def test_entries_cache_help_and_parts():
+    (entry,) = _index().search("serialize ex")
+    assert entry.parts == ["serialize", "excel"]
+    assert entry.help == "serialize excel help"
+
+
+def test_index_finds_every_fuzzy_match():
+    index = _index()
+    for query in ["s", "se", "sz", "ie", "r e", "ct", "lsc"]:
+        matcher = Matcher(query)
+        expected = {name for name in NAMES if matcher.match(name) > 0}
+        assert set(_names(index, query)) >= expected, query
@@ -0,0 +1,86 @@
+"""Tests for streaming command output through a bounded OutputStream."""
+
+import asyncio
+import threading
+
+import typer
+
+from tui_typer.commands.base import dispatch_typer_command
+from tui_typer.commands.streaming import OutputStream
+
+
+def test_write_splits_lines_and_close_flushes_partial():
+    stream = OutputStream()
+    stream.write("one\ntw")
+    stream.write("o\nthree")
+    assert stream.drain() == ["one", "two"]
+    stream.close()
+    assert stream.drain() == ["three"]
+    assert stream.closed
+    assert stream.lines_written == 3
+
+
+def test_long_partial_lines_are_split():
+    stream = OutputStream(max_line_length=4)
+    stream.write("abcdefghij")
+    assert stream.drain() == ["abcd", "efgh"]
+
+
+def test_writer_blocks_when_full_until_drained():
+    stream = OutputStream(max_lines=2)
+    done = threading.Event()
+
+    def _writer():
+        for i in range(5):
+            stream.write(f"{i}\n")
+        done.set()
+
+    thread = threading.Thread(target=_writer)
+    thread.start()
+    assert not done.wait(0.1)
+    assert len(stream.drain()) == 2
+
+    received = []
+    while thread.is_alive():
+        received.extend(stream.drain())
+    received.extend(stream.drain())
+    assert received == ["2", "3", "4"]
+
+
+def test_detach_releases_blocked_writer():
+    stream = OutputStream(max_lines=1)
+    thread = threading.Thread(target=lambda: stream.write("a\nb\nc\n"))
+    thread.start()
+    stream.detach()
+    thread.join(timeout=1)
+    assert not thread.is_alive()
+    assert stream.drain() == []
+
+
+def test_dispatch_streams_stdout_in_batches():
+    app = typer.Typer()
+
+    @app.command()
+    def count(n: int):
+        for i in range(n):
+            typer.echo(f"line {i}")
+
+    @app.command()
+    def other():
+        pass
+
+    batches: list[str] = []
+
+    async def _run():
+        stream = OutputStream(max_lines=10)
+        pump = asyncio.create_task(stream.pump(batches.append, interval=0.001, batch_lines=7))
+        result = await dispatch_typer_command(app, ["count", "100"], stream=stream)
+        await pump
+        return result
+
+    result = asyncio.run(_run())
+    assert result.exit_code == 0
+    assert result.stdout == ""
+    lines = "\n".join(batches).split("\n")
+    assert lines == [f"line {i}" for i in range(100)]
+    assert all(len(batch.split("\n")) <= 7 for batch in batches)
@@ -0,0 +1,74 @@
+"""Tests for typo suggestions."""
+
+import random
+import string
+
+import typer
+
+from tui_typer.commands.base import Command
+from tui_typer.commands.loader import load_commands
+from tui_typer.commands.suggest import BKTree, SuggestionIndex, edit_distance
+
+
+def test_edit_distance():
+    assert edit_distance("excel", "excel") == 0
+    assert edit_distance("exel", "excel") == 1
+    assert edit_distance("exlce", "excel") == 2
+    assert edit_distance("verison", "version") == 1
+    assert edit_distance("verison", "version", transpositions=False) == 2
+    assert edit_distance("a", "abcdef", limit=2) == 3
+
+
+def test_bk_tree_matches_a_full_scan():
+    rng = random.Random(7)
+    words = {
+        "".join(rng.choices(string.ascii_lowercase[:6], k=rng.randint(3, 8))) for _ in range(500)
+    }
+    tree = BKTree(words)
+    assert len(tree) == len(words)
+    for query in ["abc", "fedcba", "aaaa", "bcdefa"]:
+        expected = sorted(
+            (edit_distance(query, word), word) for word in words if edit_distance(query, word) <= 2
+        )
+        assert tree.search(query, 2) == expected
+
+
+def _make_app() -> typer.Typer:
+    app = typer.Typer()
+    db = typer.Typer()
+    app.add_typer(db, name="database")
+
+    @app.command()
+    def version():
+        pass
+
+    @db.command()
+    def backup(target: str = typer.Option("db.bak", "--target-file"), verbose: bool = False):
+        pass
+
+    return app
+
+
+def test_suggests_commands_subcommands_and_options():
+    tree = load_commands(_make_app())
+    suggestions = SuggestionIndex(tree)
+    assert suggestions.subcommands(None, "verison") == ["version"]
+    assert suggestions.subcommands(None, "databse") == ["database"]
+    assert suggestions.subcommands(tree["database"], "bakup") == ["database backup"]
+    assert suggestions.subcommands(None, "zzzzzz") == []
+
+    unknown = suggestions.unknown_options(
+        tree["database backup"], ["--target-fiel=x", "--verbos", "--no-verbose", "--", "--x"]
+    )
+    assert unknown == {"--target-fiel": ["--target-file"], "--verbos": ["--verbose"]}
+
+
+def test_options_from_manifest_params():
+    params = [
+        {"kind": "option", "opts": ["--file-name", "-f"], "secondary_opts": []},
+        {"kind": "argument", "opts": ["path"], "secondary_opts": []},
+    ]
+    tree = load_commands(_make_app())
+    tree.add(Command(name="export", description="", params=params))
+    unknown = SuggestionIndex(tree).unknown_options(tree["export"], ["--file-nme", "-f", "x"])
+    assert unknown == {"--file-nme": ["--file-name"]}
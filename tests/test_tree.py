@@ -0,0 +1,76 @@
+"""Tests for the command tree built by the loader."""
+
+import pytest
+import typer
+
+from tui_typer.commands.base import Command
+from tui_typer.commands.loader import load_commands
+
+
+def _make_app() -> typer.Typer:
+    app = typer.Typer()
+    db = typer.Typer(help="Database tools.")
+    migrations = typer.Typer(help="Schema migrations.")
+    app.add_typer(db, name="db")
+    db.add_typer(migrations, name="migrations")
+
+    @app.command()
+    def version():
+        """Show the version."""
+
+    @db.command()
+    def backup(target: str = "db.bak"):
+        """Back up the database."""
+
+    @migrations.command()
+    def apply(step: int = typer.Option(1, help="Migrations to apply")):
+        """Apply migrations."""
+
+    return app
+
+
+def test_loads_nested_groups_at_any_depth():
+    tree = load_commands(_make_app())
+    assert list(tree) == ["version", "db", "db backup", "db migrations", "db migrations apply"]
+    apply = tree["db migrations apply"]
+    assert apply.parent == "db migrations"
+    assert apply.description == "Apply migrations."
+    assert tree["db migrations"].is_group
+    assert [cmd.name for cmd in tree.top_level()] == ["version", "db"]
+    assert [cmd.key for cmd in tree.children("db")] == ["backup", "migrations"]
+    assert tree["db"].children["migrations"] is tree["db migrations"]
+
+
+def test_find_follows_leading_command_names():
+    tree = load_commands(_make_app())
+    command, depth = tree.find(["db", "migrations", "apply", "--step", "2"])
+    assert command is tree["db migrations apply"]
+    assert depth == 3
+    assert tree.find(["db", "nope"]) == (tree["db"], 1)
+    assert tree.find(["nope"]) == (None, 0)
+
+
+def test_commands_are_compact_and_resolve_params_lazily():
+    tree = load_commands(_make_app())
+    command = tree["db migrations apply"]
+    with pytest.raises(AttributeError):
+        command.extra = 1
+    assert command._params is None
+    assert [param.name for param in command.params] == ["step"]
+    assert Command(name="x", description="").params == []
+
+
+def test_shell_only_commands_are_left_out():
+    app = _make_app()
+
+    @app.command()
+    def serve():
+        """Serve commands until stopped."""
+
+    @app.command(name="run-script")
+    def run_script(script: str):
+        """Run a command script."""
+
+    tree = load_commands(app)
+    assert "serve" not in tree and "run-script" not in tree
+    assert "version" in tree
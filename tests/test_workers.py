@@ -0,0 +1,46 @@
+"""Tests for running commands in the worker process pool."""
+
+import asyncio
+
+from cli import cli
+from tui_typer.commands.base import dispatch_typer_command
+from tui_typer.commands.dispatcher import get_dispatcher
+from tui_typer.commands.workers import WorkerPool
+
+
+def test_resolve_command_path():
+    dispatcher = get_dispatcher(cli)
+    path, command = dispatcher.resolve(["serialize", "excel", "--file-name", "x.xlsx"])
+    assert path == ["serialize", "excel"]
+    assert command.name == "excel"
+    assert dispatcher.resolve(["serialize"])[1] is None
+    assert dispatcher.resolve(["nope"]) == ([], None)
+
+
+def test_pool_handles_annotated_and_configured_commands():
+    dispatcher = get_dispatcher(cli)
+    pool = WorkerPool(commands=["version"])
+    assert pool.handles(dispatcher, ["serialize", "excel"])
+    assert pool.handles(dispatcher, ["version"])
+    assert not pool.handles(dispatcher, ["list-commands"])
+    assert not pool.handles(dispatcher, ["serialize", "excel", "--help"])
+    assert not pool.started
+
+
+def test_dispatch_runs_in_worker_process(tmp_path):
+    pool = WorkerPool(max_workers=1)
+    target = tmp_path / "report.xlsx"
+
+    async def _run():
+        return await dispatch_typer_command(
+            cli, ["serialize", "excel", "--file-name", str(target)], pool=pool
+        )
+
+    try:
+        result = asyncio.run(_run())
+        assert pool.started
+    finally:
+        pool.shutdown(wait=True)
+
+    assert result.exit_code == 0, result.stderr
+    assert target.exists()
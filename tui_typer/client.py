@@ -0,0 +1,120 @@
+"""
+Thin client of the command daemon started with ``python cli.py serve``.
+
+Forwards a command line to the daemon, prints the command's output as it
+arrives and exits with the command's exit code::
+
+    python -m tui_typer.client serialize excel --file-name report.xlsx
+
+Only the standard library is imported here, so a call costs little more than
+starting Python; scripts written in Python can keep a :class:`DaemonClient`
+open and send it any number of commands.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Sequence
+import json
+import os
+import socket
+import sys
+from typing import TextIO
+
+SOCKET_ENV = "TUI_TYPER_SOCKET"
+
+# EX_UNAVAILABLE from sysexits.h: no daemon is running
+UNAVAILABLE = 69
+
+
+def default_socket_path() -> str:
+    """``$TUI_TYPER_SOCKET``, else a per-user socket in ``$XDG_RUNTIME_DIR`` or the temp directory."""
+    path = os.environ.get(SOCKET_ENV)
+    if path:
+        return path
+    directory = os.environ.get("XDG_RUNTIME_DIR") or os.environ.get("TMPDIR") or "/tmp"
+    return os.path.join(directory, f"tui-typer-{os.getuid()}.sock")
+
+
+class DaemonClient:
+    """
+    A connection to the daemon, running one command at a time.
+
+    Raises:
+        OSError: If no daemon listens on ``path``
+    """
+
+    def __init__(self, path: str | None = None, timeout: float | None = None):
+        self.path = path or default_socket_path()
+        self._socket = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            self._socket.settimeout(timeout)
+            self._socket.connect(self.path)
+        except OSError:
+            self._socket.close()
+            raise
+        self._file = self._socket.makefile("rwb")
+
+    def run(
+        self,
+        argv: Sequence[str],
+        stdout: TextIO | None = None,
+        stderr: TextIO | None = None,
+    ) -> int:
+        """
+        Run a command in the daemon, in the current working directory; return its exit code.
+
+        Raises:
+            ConnectionError: If the daemon closes the connection before the command finished
+        """
+        stdout = sys.stdout if stdout is None else stdout
+        stderr = sys.stderr if stderr is None else stderr
+        request = {"argv": list(argv), "cwd": os.getcwd()}
+        self._file.write(json.dumps(request).encode() + b"\n")
+        self._file.flush()
+        for line in self._file:
+            message = json.loads(line)
+            if "stdout" in message:
+                stdout.write(message["stdout"])
+                stdout.flush()
+            elif "stderr" in message:
+                stderr.write(message["stderr"])
+                stderr.flush()
+            elif "exit" in message:
+                return message["exit"]
+        raise ConnectionError("The daemon closed the connection")
+
+    def close(self) -> None:
+        self._file.close()
+        self._socket.close()
+
+    def __enter__(self) -> DaemonClient:
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    argv = sys.argv[1:] if argv is None else argv
+    path = default_socket_path()
+    try:
+        client = DaemonClient(path)
+    except OSError as e:
+        print(
+            f"No daemon on {path} ({e.strerror or e}); start one with `python cli.py serve`",
+            file=sys.stderr,
+        )
+        return UNAVAILABLE
+    with client:
+        try:
+            return client.run(argv)
+        except OSError as e:
+            print(f"Lost the connection to the daemon: {e}", file=sys.stderr)
+            return UNAVAILABLE
+        except KeyboardInterrupt:
+            # Closing the connection cancels the command in the daemon
+            return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
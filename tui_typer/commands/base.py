@@ -1,53 +1,102 @@
 from __future__ import annotations
 
-import asyncio
-from collections.abc import Sequence
-from dataclasses import dataclass
+from collections.abc import Callable, Sequence
+import dataclasses
 
+import click
 from loguru import logger
 import typer
-from typer.testing import CliRunner
 
-
-@dataclass
-class DispatchResult:
-    exit_code: int
-    stdout: str
-    stderr: str
-    help_text: str
+from tui_typer.commands.cancellation import CancellationToken, DispatchStatus
+from tui_typer.commands.dispatcher import DispatchResult, get_dispatcher
+from tui_typer.commands.result_cache import ResultCache
+from tui_typer.commands.streaming import OutputStream
+from tui_typer.commands.workers import WorkerPool
 
 
 async def dispatch_typer_command(
     app: typer.Typer,
     args: Sequence[str],
+    stream: OutputStream | None = None,
+    pool: WorkerPool | None = None,
+    token: CancellationToken | None = None,
+    timeout: float | None = None,
+    kill_after: float = 2.0,
+    cache: ResultCache | None = None,
+    error_stream: OutputStream | None = None,
 ) -> DispatchResult:
     """
-    Dispatch a Typer command asynchronously using CliRunner.
+    Dispatch a Typer command asynchronously using the in-process dispatcher.
 
     Args:
         app: The Typer application instance
         args: Command arguments to pass (e.g., ["serialize", "excel", "--file-name", "test.xlsx"])
+        stream: Optional stream receiving stdout while the command runs. It is
+            closed when the command finishes and its output is not in the result.
+        pool: Optional worker process pool. Commands that opt in to it run there;
+            their output is returned in the result rather than streamed.
+        token: Optional cancellation token for the command
+        timeout: Seconds after which the command is stopped, None for no limit
+        kill_after: Grace period before a cancelled command is interrupted
+        cache: Optional result cache. Results of cacheable commands are served
+            from it, and identical concurrent dispatches share one run; their
+            output is written to ``stream`` at once when it is given.
+        error_stream: Like ``stream``, for the command's stderr
 
     Returns:
         DispatchResult containing exit code, stdout, stderr, and help text
     """
-    runner = CliRunner()
-
-    def _invoke(argv: list[str]):
-        logger.debug(f"Invoking with argv: {argv}")
-        # Avoid passing a problematic prog_name that can be a DefaultPlaceholder in Typer/Click
-        # which breaks help rendering with AttributeError: 'DefaultPlaceholder' has no attribute 'lstrip'
-        result = runner.invoke(app, argv, catch_exceptions=True)
-        logger.debug(f"Result: exit_code={result.exit_code}")
-        if result.exception:
-            logger.error(f"Exception during invoke: {result.exception}")
-        if not result.stdout and not result.stderr and result.exit_code != 0:
-            logger.warning(f"Command failed silently: exit_code={result.exit_code}")
-        return result
+    dispatcher = get_dispatcher(app)
+    # Shared by the command and, when it waits for an identical dispatch, the cache
+    token = token or CancellationToken()
+
+    async def _invoke(stdout: OutputStream | None, stderr: OutputStream | None) -> DispatchResult:
+        if pool is not None and pool.handles(dispatcher, args):
+            return await pool.dispatch(args, token=token, timeout=timeout)
+        return await dispatcher.dispatch(
+            args,
+            stdout=stdout,
+            token=token,
+            timeout=timeout,
+            kill_after=kill_after,
+            stderr=stderr,
+        )
+
+    if cache is not None or pool is not None:
+        # Both resolve the command on the event loop
+        await dispatcher.preload(args)
 
     try:
         # Execute the command
-        result = await asyncio.to_thread(_invoke, list(args))
+        try:
+            policy = cache.policy(dispatcher, args) if cache is not None else None
+            if policy is not None:
+                # Cached results hold the command's output, so it is not streamed
+                key = cache.key(dispatcher, args, policy)
+                result = await cache.run(
+                    key, lambda: _invoke(None, None), policy.ttl, token=token, timeout=timeout
+                )
+                if stream is not None and result.stdout:
+                    stream.write(result.stdout)
+                    result = dataclasses.replace(result, stdout="")
+                if error_stream is not None and result.stderr:
+                    error_stream.write(result.stderr)
+                    result = dataclasses.replace(result, stderr="")
+            else:
+                result = await _invoke(stream, error_stream)
+        finally:
+            for output in (stream, error_stream):
+                if output is not None:
+                    output.close()
+        streamed = any(
+            output is not None and output.lines_written > 0 for output in (stream, error_stream)
+        )
+        silent = not result.stdout and not result.stderr and not streamed
+        if result.status is not DispatchStatus.COMPLETED:
+            logger.warning(f"Command {result.status.value}: {' '.join(args)}")
+            return result
+        if silent and result.exit_code != 0:
+            logger.warning(f"Command failed silently: exit_code={result.exit_code}")
 
         logger.debug(
             f"Command result: exit_code={result.exit_code}, "
@@ -60,17 +109,17 @@ async def dispatch_typer_command(
         if "--help" in args:
             help_text = result.stdout
             logger.debug(f"Help requested, help_text length: {len(help_text)}")
-        elif result.exit_code != 0 and not result.stdout and not result.stderr:
-            # Only fetch help if command failed silently
-            help_result = await asyncio.to_thread(_invoke, list(args) + ["--help"])
-            help_text = help_result.stdout
-            logger.debug(f"Command failed, fetched help_text length: {len(help_text)}")
+        elif result.exit_code != 0 and silent:
+            # Only render help if command failed silently, without running it again
+            help_text = dispatcher.help_text(args)
+            logger.debug(f"Command failed, rendered help_text length: {len(help_text)}")
 
         return DispatchResult(
             exit_code=result.exit_code,
             stdout=result.stdout,
-            stderr=result.stderr or "",
+            stderr=result.stderr,
             help_text=help_text,
+            value=result.value,
         )
     except Exception as e:
         logger.exception(f"Error dispatching command: {e}")
@@ -84,7 +133,24 @@ async def dispatch_typer_command(
 
 
 class Command:
-    """Represents a CLI command."""
+    """
+    Represents a CLI command, as a node of the command tree.
+
+    ``children`` maps the names of a group's subcommands to their nodes.
+    ``params`` are resolved from the Click command on first access unless
+    given, e.g. from the plugin manifest.
+    """
+
+    __slots__ = (
+        "name",
+        "description",
+        "is_group",
+        "parent",
+        "children",
+        "_typer_command",
+        "_resolve",
+        "_params",
+    )
 
     def __init__(
         self,
@@ -94,32 +160,63 @@ class Command:
         is_group: bool = False,
         parent: str = None,
         params: list = None,
+        resolve: Callable[[], click.Command | None] | None = None,
     ):
         self.name = name
         self.description = description
         self._typer_command = typer_command
+        self._resolve = resolve
         self.is_group = is_group
         self.parent = parent
-        self.params = params or []
-
-    async def execute(self, app: CLIApp, args: list[str]) -> None:
-        """Execute the command via Typer dispatch."""
-        if self._typer_command:
+        self.children: dict[str, Command] = {}
+        self._params = params
+
+    def __repr__(self) -> str:
+        return f"Command({self.name!r})"
+
+    @property
+    def key(self) -> str:
+        """The last part of the name, under which the parent lists this command."""
+        return self.name.rpartition(" ")[2]
+
+    @property
+    def typer_command(self) -> click.Command | None:
+        """The Click command; commands loaded from the plugin manifest import it on first use."""
+        if self._typer_command is None and self._resolve is not None:
+            self._typer_command = self._resolve()
+        return self._typer_command
+
+    @property
+    def params(self) -> list:
+        if self._params is None:
+            command = self.typer_command
+            self._params = list(command.params) if command is not None else []
+        return self._params
+
+    @property
+    def loaded(self) -> bool:
+        """False for plugin commands known only from the manifest, whose module is not imported."""
+        return self._typer_command is not None or self._resolve is None
+
+    async def execute(self, app: CLIApp, args: list[str]) -> DispatchResult | None:
+        """Execute the command via Typer dispatch, None if it has no Click command."""
+        if self.typer_command:
             # For subcommands (e.g., "serialize excel"), split the name
             cmd_parts = self.name.split()
 
             # Combine command parts with any additional arguments
             full_args = cmd_parts + args
 
-            # Execute through the Typer CLI
-            result = await dispatch_typer_command(app.typer_cli, full_args)
+            # Execute through the Typer CLI, streaming stdout into the app
+            result = await app.dispatch_command(full_args)
 
             if result.stdout:
                 app.add_output(result.stdout)
             if result.stderr:
                 app.add_output(f"[red]Error:[/red] {result.stderr}")
-            if result.exit_code != 0 and not result.stdout and not result.stderr:
+            if result.exit_code != 0 and result.help_text:
                 # Show help if command failed silently
                 app.add_output(result.help_text)
-        else:
-            app.add_output("[yellow]Command not implemented[/yellow]")
+            return result
+        app.add_output("[yellow]Command not implemented[/yellow]")
+        return None
@@ -0,0 +1,195 @@
+"""Timeouts and cancellation for dispatched commands."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import ctypes
+from enum import Enum
+import threading
+
+
+class DispatchStatus(Enum):
+    """How a dispatched command ended."""
+
+    COMPLETED = "completed"
+    TIMED_OUT = "timed out"
+    CANCELLED = "cancelled"
+
+
+# Exit codes used when a command is stopped, following coreutils timeout and SIGINT
+EXIT_CODES = {DispatchStatus.TIMED_OUT: 124, DispatchStatus.CANCELLED: 130}
+
+
+class CommandCancelled(BaseException):
+    """
+    Raised inside a command when its cancellation token is triggered.
+
+    It derives from BaseException, like KeyboardInterrupt, so a command's own
+    ``except Exception`` handlers do not swallow it.
+    """
+
+    def __init__(self, status: DispatchStatus = DispatchStatus.CANCELLED):
+        super().__init__(status.value)
+        self.status = status
+
+    @property
+    def exit_code(self) -> int:
+        return EXIT_CODES[self.status]
+
+
+class CancellationToken:
+    """
+    A cooperative cancellation flag shared by a command and its caller.
+
+    Commands poll it with :func:`check_cancelled`. For commands that never
+    check, :meth:`interrupt` raises :class:`CommandCancelled` asynchronously in
+    the thread running the command; this takes effect at the next Python
+    bytecode, so code blocked inside a C extension is only stopped once it returns.
+    """
+
+    def __init__(self):
+        self._status: DispatchStatus | None = None
+        self._callbacks: list[Callable[[], None]] = []
+        self._thread_id: int | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._status is not None
+
+    @property
+    def status(self) -> DispatchStatus:
+        return self._status or DispatchStatus.COMPLETED
+
+    def cancel(self, status: DispatchStatus = DispatchStatus.CANCELLED) -> None:
+        """Request cancellation. Only the first request sets the status."""
+        with self._lock:
+            if self._status is not None:
+                return
+            self._status = status
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback: Callable[[], None]) -> None:
+        """Call ``callback`` once cancellation is requested (immediately if it was)."""
+        with self._lock:
+            if self._status is None:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def raise_if_cancelled(self) -> None:
+        if self._status is not None:
+            raise CommandCancelled(self._status)
+
+    @contextmanager
+    def bind_thread(self) -> Iterator[None]:
+        """Mark the current thread as the one running the command."""
+        with self._lock:
+            self._thread_id = threading.get_ident()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._thread_id = None
+
+    def interrupt(self) -> bool:
+        """Raise CommandCancelled in the bound thread. Returns False if none is bound."""
+        with self._lock:
+            if self._thread_id is None:
+                return False
+            exc = CommandCancelled if self._status is None else _EXCEPTIONS[self._status]
+            ctypes.pythonapi.PyThreadState_SetAsyncExc(
+                ctypes.c_ulong(self._thread_id), ctypes.py_object(exc)
+            )
+            return True
+
+
+class _TimedOut(CommandCancelled):
+    def __init__(self):
+        super().__init__(DispatchStatus.TIMED_OUT)
+
+
+class _Cancelled(CommandCancelled):
+    def __init__(self):
+        super().__init__(DispatchStatus.CANCELLED)
+
+
+# PyThreadState_SetAsyncExc takes a class, so each status gets its own subclass
+_EXCEPTIONS = {DispatchStatus.TIMED_OUT: _TimedOut, DispatchStatus.CANCELLED: _Cancelled}
+
+_current_token: ContextVar[CancellationToken | None] = ContextVar(
+    "tui_typer_cancellation_token", default=None
+)
+
+
+@contextmanager
+def bind_token(token: CancellationToken) -> Iterator[CancellationToken]:
+    """Make ``token`` the current token of this context and thread."""
+    context_token = _current_token.set(token)
+    try:
+        with token.bind_thread():
+            yield token
+    finally:
+        _current_token.reset(context_token)
+
+
+def current_token() -> CancellationToken | None:
+    """The cancellation token of the command running in this context, if any."""
+    return _current_token.get()
+
+
+def check_cancelled() -> None:
+    """
+    Raise CommandCancelled if the running command has been cancelled or timed out.
+
+    Long-running commands should call this regularly, e.g. once per processed row.
+    """
+    token = _current_token.get()
+    if token is not None:
+        token.raise_if_cancelled()
+
+
+async def wait_cancellable(
+    future: asyncio.Future,
+    token: CancellationToken,
+    timeout: float | None = None,
+) -> bool:
+    """
+    Wait for ``future`` until it is done, the token is cancelled or ``timeout`` expires.
+
+    A timeout cancels the token with TIMED_OUT and cancelling the awaiting task
+    cancels it with CANCELLED. Returns True if the future finished.
+    """
+    loop = asyncio.get_running_loop()
+    cancelled = loop.create_future()
+
+    def _set_cancelled() -> None:
+        if not cancelled.done():
+            cancelled.set_result(None)
+
+    def _wake() -> None:
+        # The token may be cancelled from any thread, possibly after the loop closed
+        try:
+            loop.call_soon_threadsafe(_set_cancelled)
+        except RuntimeError:
+            pass
+
+    token.add_callback(_wake)
+    try:
+        await asyncio.wait(
+            {future, cancelled}, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+        )
+    except asyncio.CancelledError:
+        token.cancel(DispatchStatus.CANCELLED)
+        raise
+    finally:
+        cancelled.cancel()
+    if future.done():
+        return True
+    token.cancel(DispatchStatus.TIMED_OUT)
+    return False
@@ -0,0 +1,121 @@
+"""Per-invocation capture of the standard streams.
+
+``sys.stdin``, ``sys.stdout`` and ``sys.stderr`` are replaced once by proxies that
+look up their target in a context variable. Code running inside
+:func:`capture_output` writes to its own buffers, while every other thread or task
+keeps writing to the original streams. Because :func:`asyncio.to_thread` copies the
+current context, each dispatched command gets its own isolated output.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import io
+import sys
+import threading
+from typing import Any, TextIO
+
+_STREAM_NAMES = ("stdin", "stdout", "stderr")
+
+
+class CapturedIO:
+    """The stream buffers bound to a single command invocation."""
+
+    def __init__(
+        self,
+        input: str = "",
+        stdout: TextIO | None = None,
+        stderr: TextIO | None = None,
+    ):
+        self.stdin: TextIO = io.StringIO(input)
+        self.stdout: TextIO = stdout if stdout is not None else io.StringIO()
+        self.stderr: TextIO = stderr if stderr is not None else io.StringIO()
+
+    @staticmethod
+    def _value(stream: TextIO) -> str:
+        getvalue = getattr(stream, "getvalue", None)
+        return getvalue() if getvalue is not None else ""
+
+    @property
+    def stdout_text(self) -> str:
+        return self._value(self.stdout)
+
+    @property
+    def stderr_text(self) -> str:
+        return self._value(self.stderr)
+
+
+_current: ContextVar[CapturedIO | None] = ContextVar("tui_typer_captured_io", default=None)
+_install_lock = threading.Lock()
+
+
+class ContextStream:
+    """A ``sys`` stream proxy that routes to the captured buffer of the current context."""
+
+    def __init__(self, name: str, fallback: TextIO):
+        self._name = name
+        self._fallback = fallback
+
+    @property
+    def target(self) -> TextIO:
+        captured = _current.get()
+        if captured is None:
+            return self._fallback
+        return getattr(captured, self._name)
+
+    @property
+    def encoding(self) -> str:
+        return getattr(self.target, "encoding", None) or "utf-8"
+
+    @property
+    def errors(self) -> str:
+        return getattr(self.target, "errors", None) or "strict"
+
+    def write(self, s: str) -> int:
+        return self.target.write(s)
+
+    def writelines(self, lines) -> None:
+        self.target.writelines(lines)
+
+    def flush(self) -> None:
+        self.target.flush()
+
+    def read(self, size: int = -1) -> str:
+        return self.target.read(size)
+
+    def readline(self, size: int = -1) -> str:
+        return self.target.readline(size)
+
+    def isatty(self) -> bool:
+        # Captured output is never a terminal, so Rich and Click render plain text
+        if _current.get() is not None:
+            return False
+        return self._fallback.isatty()
+
+    def fileno(self) -> int:
+        return self.target.fileno()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.target, name)
+
+
+def install() -> None:
+    """Install the context-aware proxies on ``sys`` if they are not already there."""
+    with _install_lock:
+        for name in _STREAM_NAMES:
+            stream = getattr(sys, name)
+            if not isinstance(stream, ContextStream):
+                setattr(sys, name, ContextStream(name, stream))
+
+
+@contextmanager
+def capture_output(captured: CapturedIO) -> Iterator[CapturedIO]:
+    """Route the standard streams of the current context to ``captured``."""
+    install()
+    token = _current.set(captured)
+    try:
+        yield captured
+    finally:
+        _current.reset(token)
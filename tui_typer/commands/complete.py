@@ -0,0 +1,286 @@
+"""Tab completion of command lines from the command tree and Click's completers."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable, Sequence
+from dataclasses import dataclass, field
+import os
+import threading
+import time
+from typing import Any
+
+import click
+from loguru import logger
+
+from tui_typer.commands.base import Command
+from tui_typer.commands.dispatcher import Dispatcher
+from tui_typer.commands.jobs import JOB_OPTIONS
+from tui_typer.commands.pipeline import PIPE
+from tui_typer.commands.tree import CommandTree
+
+# Text parameters whose name contains one of these are completed as paths, e.g. ``--file-name``
+PATH_HINTS = ("file", "path", "dir")
+
+
+class TTLCache:
+    """
+    Values that expire ``ttl`` seconds after they were computed.
+
+    Safe to use from several threads; a value computed twice concurrently is
+    simply stored twice. Once ``max_entries`` are held the oldest is dropped.
+    """
+
+    def __init__(
+        self,
+        ttl: float = 5.0,
+        max_entries: int = 256,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.ttl = ttl
+        self.max_entries = max(1, max_entries)
+        self.clock = clock
+        self._entries: dict[Hashable, tuple[float, Any]] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def memoize(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the value cached for ``key`` unless it expired, else build and cache it."""
+        now = self.clock()
+        entry = self._entries.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        value = build()
+        with self._lock:
+            self._entries.pop(key, None)
+            self._entries[key] = (now + self.ttl, value)
+            while len(self._entries) > self.max_entries:
+                del self._entries[next(iter(self._entries))]
+        return value
+
+
+@dataclass
+class Completion:
+    """The candidates for the word of a command line that ends at the cursor."""
+
+    start: int
+    word: str
+    candidates: list[str] = field(default_factory=list)
+
+    @property
+    def insertion(self) -> str:
+        """
+        What replaces the word: the only candidate followed by a space (unless
+        it is a directory), or the prefix the candidates share.
+        """
+        if len(self.candidates) == 1:
+            candidate = self.candidates[0]
+            return candidate if candidate.endswith(os.sep) else f"{candidate} "
+        prefix = os.path.commonprefix(self.candidates)
+        return prefix if len(prefix) > len(self.word) else self.word
+
+    def apply(self, line: str, cursor: int | None = None) -> tuple[str, int]:
+        """The line with the word at ``start`` replaced by :attr:`insertion`, and the new cursor."""
+        cursor = len(line) if cursor is None else cursor
+        insertion = self.insertion
+        return line[: self.start] + insertion + line[cursor:], self.start + len(insertion)
+
+
+def _param_info(param: click.Parameter | dict) -> tuple[str, str, list[str], bool]:
+    """Kind, name, option strings and whether it takes a value, for a param or its description."""
+    if isinstance(param, dict):
+        opts = [*param["opts"], *param["secondary_opts"]]
+        return param["kind"], param["name"], opts, not param["is_flag"]
+    opts = [*param.opts, *param.secondary_opts]
+    takes_value = not getattr(param, "is_flag", False) and not getattr(param, "count", False)
+    return param.param_type_name, param.name, opts, takes_value
+
+
+class Completer:
+    """
+    Completions for the command line typed into the input box.
+
+    Command and option names come from the command tree. Values are completed
+    with the ``shell_complete`` of the Click parameter they belong to, e.g. the
+    choices of a ``Choice`` or a Typer ``autocompletion`` callback, and by
+    listing directories for path parameters. Both can be slow, so their
+    results are cached for ``ttl`` seconds; :meth:`complete` is meant to run
+    in a worker thread.
+    """
+
+    def __init__(
+        self,
+        tree: CommandTree,
+        dispatcher: Dispatcher | None = None,
+        builtins: Iterable[str] = (),
+        ttl: float = 5.0,
+    ):
+        self.tree = tree
+        self.dispatcher = dispatcher
+        self.builtins = sorted(builtins)
+        self.cache = TTLCache(ttl)
+
+    def complete(self, line: str, cursor: int | None = None) -> Completion:
+        """Complete the word that ends at ``cursor`` (the end of ``line`` by default)."""
+        text = line if cursor is None else line[:cursor]
+        words = text.split()
+        word = "" if not words or text[-1].isspace() else words.pop()
+        start = len(text) - len(word)
+        return Completion(start, word, sorted(set(self._candidates(words, word))))
+
+    def _candidates(self, words: list[str], word: str) -> list[str]:
+        if PIPE in words:
+            # Complete the last command of a pipeline, which has no scheduler options
+            words = words[len(words) - words[::-1].index(PIPE) :]
+            if not words:
+                return self._subcommands(self.tree.root, word)
+        # Scheduler options such as "--priority 1" may precede the command
+        index = 0
+        while index < len(words) and words[index].partition("=")[0] in JOB_OPTIONS:
+            index += 1 if "=" in words[index] else 2
+        if index > len(words):
+            return []
+        words = words[index:]
+        if not words:
+            if word.startswith("-"):
+                return [option for option in JOB_OPTIONS if option.startswith(word)]
+            return self._subcommands(self.tree.root, word, self.builtins)
+        # "help" takes a command path
+        help_path = words[0] == "help"
+        if help_path:
+            words = words[1:]
+            if not words:
+                return self._subcommands(self.tree.root, word)
+        command, depth = self.tree.find(words)
+        if command is None:
+            return []
+        args = words[depth:]
+        if command.is_group and not args and not word.startswith("-"):
+            return self._subcommands(command, word)
+        return [] if help_path else self._arguments(command, args, word)
+
+    @staticmethod
+    def _subcommands(group: Command, word: str, extra: Iterable[str] = ()) -> list[str]:
+        names = [*group.children, *extra]
+        return [name for name in names if name.startswith(word)]
+
+    def _arguments(self, command: Command, args: Sequence[str], word: str) -> list[str]:
+        """Options of ``command``, or the values of the option or argument being typed."""
+        options: dict[str, tuple[str, bool]] = {"--help": ("help", False)}
+        arguments: list[str] = []
+        for param in command.params:
+            kind, name, opts, takes_value = _param_info(param)
+            if kind == "option":
+                options.update((opt, (name, takes_value)) for opt in opts)
+            elif kind == "argument":
+                arguments.append(name)
+
+        # Which parameter the word is a value of: the option before it, or the next argument
+        position, expects, only_arguments = 0, None, False
+        for arg in args:
+            if expects is not None:
+                expects = None
+            elif only_arguments or not arg.startswith("-") or arg == "-":
+                position += 1
+            elif arg == "--":
+                only_arguments = True
+            elif "=" not in arg and options.get(arg, ("", False))[1]:
+                expects = options[arg][0]
+        if expects is None and not only_arguments and word.startswith("-"):
+            option, sep, value = word.partition("=")
+            if not sep:
+                return [opt for opt in options if opt.startswith(word)]
+            if option not in options or not options[option][1]:
+                return []
+            return [f"{option}={v}" for v in self._values(command, args, options[option][0], value)]
+        if expects is None:
+            if not arguments:
+                return []
+            expects = arguments[min(position, len(arguments) - 1)]
+        return self._values(command, args, expects, word)
+
+    def _values(self, command: Command, args: Sequence[str], name: str, word: str) -> list[str]:
+        click_command = command.typer_command
+        param = next((p for p in getattr(click_command, "params", ()) if p.name == name), None)
+        if param is None:
+            return []
+        items = self.cache.memoize(
+            ("values", command.name, name, word),
+            lambda: self._shell_complete(command, click_command, param, args, word),
+        )
+        values = []
+        for value, kind in items:
+            if kind in ("file", "dir"):
+                values.extend(self.paths(value, directories=kind == "dir"))
+            elif kind == "plain":
+                values.append(value)
+        if not items:
+            kind = _path_kind(param)
+            if kind is not None:
+                values.extend(self.paths(word, directories=kind == "dir"))
+        return values
+
+    def _shell_complete(
+        self,
+        command: Command,
+        click_command: click.Command,
+        param: click.Parameter,
+        args: Sequence[str],
+        word: str,
+    ) -> list[tuple[str, str]]:
+        try:
+            ctx = self._context(command, click_command, args)
+            items = param.shell_complete(ctx, word)
+        except Exception as e:
+            logger.debug(f"Completing {param.name} of {command.name} failed: {e}")
+            return []
+        return [(str(item.value), item.type) for item in items]
+
+    def _context(
+        self, command: Command, click_command: click.Command, args: Sequence[str]
+    ) -> click.Context:
+        """A context with the params typed so far, for completers that look at them."""
+        parent = None
+        if self.dispatcher is not None:
+            parent = self.dispatcher.make_context(command.name.split()[:-1])
+        return click_command.make_context(
+            command.key, list(args), parent=parent, resilient_parsing=True
+        )
+
+    def paths(self, word: str, directories: bool = False) -> list[str]:
+        """Paths starting with ``word``, directories with a trailing separator."""
+        head, tail = os.path.split(word)
+        entries = self.cache.memoize(("dir", head), lambda: _list_dir(head))
+        return [
+            os.path.join(head, name) + (os.sep if is_dir else "")
+            for name, is_dir in entries
+            if name.startswith(tail)
+            and (is_dir or not directories)
+            and (tail.startswith(".") or not name.startswith("."))
+        ]
+
+
+def _path_kind(param: click.Parameter) -> str | None:
+    """``"file"`` or ``"dir"`` for parameters that take a path, None for others."""
+    if isinstance(param.type, click.Path):
+        return "dir" if param.type.dir_okay and not param.type.file_okay else "file"
+    if isinstance(param.type, click.File):
+        return "file"
+    if isinstance(param.type, click.types.StringParamType) and any(
+        hint in param.name for hint in PATH_HINTS
+    ):
+        return "file"
+    return None
+
+
+def _list_dir(path: str) -> list[tuple[str, bool]]:
+    try:
+        with os.scandir(os.path.expanduser(path or os.curdir)) as entries:
+            return [(entry.name, entry.is_dir()) for entry in entries]
+    except OSError:
+        return []
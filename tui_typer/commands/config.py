@@ -14,10 +14,42 @@ class AppConfig:
             "app_name": __app_name__,
             "history_file": f"~/.{__app_name__}_history",
             "max_history": "100",
+            "history_fsync": "interval",
+            "completion_ttl": "5",
         },
         "display": {
             "theme": "default",
             "show_timestamps": "false",
+            "stream_output": "true",
+            "output_buffer_lines": "1000",
+            "output_refresh_rate": "20",
+            "log_buffer_lines": "1000",
+            "log_refresh_rate": "10",
+            "progress_refresh_rate": "10",
+            "progress_window": "10",
+            "scrollback_lines": "5000",
+            "scrollback_dir": "",
+        },
+        "workers": {
+            "app": "cli:cli",
+            "max_workers": "2",
+            "start_method": "spawn",
+            "preload": "",
+            "process_commands": "",
+        },
+        "jobs": {
+            "max_concurrent": "4",
+            "queue": "fifo",
+            "command_limits": "",
+            "default_timeout": "0",
+            "command_timeouts": "",
+            "kill_after": "2",
+        },
+        "cache": {
+            "enabled": "true",
+            "max_memory_mb": "64",
+            "ttl": "60",
+            "commands": "",
         },
     }
 
@@ -60,6 +92,9 @@ class AppConfig:
     def getint(self, section: str, key: str, fallback: int = 0) -> int:
         return self.config.getint(section, key, fallback=fallback)
 
+    def getfloat(self, section: str, key: str, fallback: float = 0.0) -> float:
+        return self.config.getfloat(section, key, fallback=fallback)
+
     def getboolean(self, section: str, key: str, fallback: bool = False) -> bool:
         return self.config.getboolean(section, key, fallback=fallback)
 
@@ -75,3 +110,131 @@ class AppConfig:
     @property
     def max_history(self) -> int:
         return self.getint("general", "max_history", 100)
+
+    @property
+    def history_fsync(self) -> str:
+        """When history appends are synced to disk: ``always``, ``interval`` or ``never``."""
+        return self.get("general", "history_fsync", "interval").strip().lower()
+
+    @property
+    def completion_ttl(self) -> float:
+        """Seconds that value and path completions are reused for."""
+        return max(0.0, self.getfloat("general", "completion_ttl", 5.0))
+
+    @property
+    def stream_output(self) -> bool:
+        return self.getboolean("display", "stream_output", True)
+
+    @property
+    def output_buffer_lines(self) -> int:
+        return self.getint("display", "output_buffer_lines", 1000)
+
+    @property
+    def output_refresh_rate(self) -> int:
+        """Maximum number of output batches written to the UI per second."""
+        return max(1, self.getint("display", "output_refresh_rate", 20))
+
+    @property
+    def log_buffer_lines(self) -> int:
+        """Log records waiting for the log pane before DEBUG and INFO records are dropped."""
+        return max(1, self.getint("display", "log_buffer_lines", 1000))
+
+    @property
+    def log_refresh_rate(self) -> int:
+        """Maximum number of log pane updates per second."""
+        return max(1, self.getint("display", "log_refresh_rate", 10))
+
+    @property
+    def progress_refresh_rate(self) -> int:
+        """Maximum number of progress bar updates per second."""
+        return max(1, self.getint("display", "progress_refresh_rate", 10))
+
+    @property
+    def progress_window(self) -> float:
+        """Seconds over which progress throughput and ETA are computed."""
+        return max(0.1, self.getfloat("display", "progress_window", 10.0))
+
+    @property
+    def scrollback_lines(self) -> int:
+        """Rendered lines each log keeps in memory; older output is spilled to disk."""
+        return max(1, self.getint("display", "scrollback_lines", 5000))
+
+    @property
+    def scrollback_dir(self) -> str | None:
+        """Directory for the scrollback segment files, the system temp dir when empty."""
+        path = self.get("display", "scrollback_dir", "").strip()
+        return str(Path(path).expanduser()) if path else None
+
+    def getlist(self, section: str, key: str) -> list[str]:
+        """Read a comma separated option as a list of stripped, non-empty values."""
+        value = self.get(section, key, fallback="") or ""
+        return [item.strip() for item in value.split(",") if item.strip()]
+
+    @property
+    def worker_app(self) -> str:
+        return self.get("workers", "app", "cli:cli")
+
+    @property
+    def max_workers(self) -> int:
+        return self.getint("workers", "max_workers", 2)
+
+    @property
+    def worker_start_method(self) -> str:
+        return self.get("workers", "start_method", "spawn")
+
+    @property
+    def worker_preload(self) -> list[str]:
+        return self.getlist("workers", "preload")
+
+    @property
+    def process_commands(self) -> list[str]:
+        return self.getlist("workers", "process_commands")
+
+    @property
+    def max_concurrent_jobs(self) -> int:
+        return self.getint("jobs", "max_concurrent", 4)
+
+    @property
+    def job_queue(self) -> str:
+        """Job queue policy, ``fifo`` or ``priority``."""
+        return self.get("jobs", "queue", "fifo").strip().lower()
+
+    @property
+    def job_command_limits(self) -> list[str]:
+        """Per-command concurrency limits as ``command path:limit`` entries."""
+        return self.getlist("jobs", "command_limits")
+
+    @property
+    def default_timeout(self) -> float | None:
+        """Default command timeout in seconds, None when commands may run forever."""
+        timeout = self.getfloat("jobs", "default_timeout", 0.0)
+        return timeout if timeout > 0 else None
+
+    @property
+    def command_timeouts(self) -> list[str]:
+        """Per-command timeouts as ``command path:seconds`` entries."""
+        return self.getlist("jobs", "command_timeouts")
+
+    @property
+    def kill_after(self) -> float:
+        """Seconds a cancelled command gets to stop before it is interrupted."""
+        return self.getfloat("jobs", "kill_after", 2.0)
+
+    @property
+    def cache_enabled(self) -> bool:
+        return self.getboolean("cache", "enabled", True)
+
+    @property
+    def cache_max_bytes(self) -> int:
+        """Memory the cached command results may hold."""
+        return int(max(0.0, self.getfloat("cache", "max_memory_mb", 64.0)) * 1024 * 1024)
+
+    @property
+    def cache_ttl(self) -> float:
+        """Seconds a cached result is served, unless the command sets its own."""
+        return max(0.0, self.getfloat("cache", "ttl", 60.0))
+
+    @property
+    def cache_commands(self) -> list[str]:
+        """Full paths of commands cached without declaring themselves cacheable."""
+        return self.getlist("cache", "commands")
@@ -0,0 +1,298 @@
+"""
+A local daemon running commands for thin clients, see :mod:`tui_typer.client`.
+
+The daemon keeps the command tree and everything its commands imported in
+memory, so a command sent to it costs a round trip over a Unix domain socket
+instead of starting Python and importing the CLI. The protocol is one JSON
+object per line. A request is ``{"argv": [...], "cwd": "..."}``; the daemon
+answers with any number of ``{"stdout": "..."}`` and ``{"stderr": "..."}``
+messages and ends with ``{"exit": 0, "status": "completed"}``. A connection
+may send any number of requests, one after another.
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, suppress
+import json
+import os
+import signal
+import socket
+from typing import Any
+
+import click
+from loguru import logger
+import typer
+
+from tui_typer.client import default_socket_path
+from tui_typer.commands.base import dispatch_typer_command
+from tui_typer.commands.cancellation import CancellationToken
+from tui_typer.commands.dispatcher import DispatchResult, get_dispatcher
+from tui_typer.commands.pipeline import dispatch_pipeline, is_pipeline, split_pipeline
+from tui_typer.commands.result_cache import ResultCache
+from tui_typer.commands.streaming import OutputStream
+
+# Seconds between forwarding batches of output of a running command
+FORWARD_INTERVAL = 0.05
+
+
+def warm_commands(app: typer.Typer) -> int:
+    """Import every command of ``app``, including lazy plugin groups; return how many there are."""
+    command = get_dispatcher(app).command
+    count = 0
+
+    def _walk(command: click.Command, ctx: click.Context) -> None:
+        nonlocal count
+        count += 1
+        if isinstance(command, click.Group):
+            for name in command.list_commands(ctx):
+                sub = command.get_command(ctx, name)
+                if sub is not None:
+                    _walk(sub, click.Context(sub, parent=ctx, info_name=name))
+
+    _walk(command, click.Context(command, info_name=command.name))
+    return count
+
+
+def claim_socket(path: str) -> None:
+    """
+    Remove a socket file left behind by a daemon that is gone.
+
+    Raises:
+        FileExistsError: If a daemon is listening on ``path``, or it is not a socket
+    """
+    if not os.path.exists(path):
+        return
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as probe:
+        try:
+            probe.connect(path)
+        except ConnectionRefusedError:
+            os.unlink(path)
+            return
+        except OSError as e:
+            raise FileExistsError(f"{path} exists and is not a daemon socket: {e}") from None
+    raise FileExistsError(f"A daemon is already listening on {path}")
+
+
+class _WorkingDirectory:
+    """
+    Run commands in the working directory of the client that sent them.
+
+    The working directory belongs to the process, so commands for one directory
+    run at the same time while a command for another waits for them to finish.
+    """
+
+    def __init__(self):
+        self._cond = asyncio.Condition()
+        self._running = 0
+
+    @asynccontextmanager
+    async def use(self, cwd: str | None) -> AsyncIterator[None]:
+        async with self._cond:
+            if cwd is not None:
+                await self._cond.wait_for(lambda: self._running == 0 or os.getcwd() == cwd)
+                if os.getcwd() != cwd:
+                    os.chdir(cwd)
+            self._running += 1
+        try:
+            yield
+        finally:
+            async with self._cond:
+                self._running -= 1
+                self._cond.notify_all()
+
+
+class DaemonServer:
+    """
+    Serve the commands of a Typer app on a Unix domain socket.
+
+    Commands of different connections run at the same time, in the daemon's
+    dispatcher threads. Output is forwarded while a command runs; a pipeline is
+    run in the daemon like in the TUI. Results of cacheable commands are shared
+    between all clients through ``cache``. A command is cancelled when its
+    client disconnects. Only the user running the daemon may connect.
+    """
+
+    def __init__(
+        self,
+        app: typer.Typer,
+        path: str | None = None,
+        cache: ResultCache | None = None,
+        kill_after: float = 2.0,
+    ):
+        self.app = app
+        self.path = path or default_socket_path()
+        self.cache = cache
+        self.kill_after = kill_after
+        self.requests = 0
+        self._cwd = _WorkingDirectory()
+        self._server: asyncio.AbstractServer | None = None
+        self._writers: set[asyncio.StreamWriter] = set()
+        self._stopped: asyncio.Event | None = None
+
+    async def start(self) -> None:
+        """
+        Start listening; requests are served until :meth:`stop`.
+
+        Raises:
+            FileExistsError: If another daemon is listening on the socket
+        """
+        claim_socket(self.path)
+        self._stopped = asyncio.Event()
+        # Create the socket accessible to its owner only
+        umask = os.umask(0o177)
+        try:
+            self._server = await asyncio.start_unix_server(self._handle, path=self.path)
+        finally:
+            os.umask(umask)
+        logger.info(f"Serving commands on {self.path}")
+
+    async def serve(self, ready: Callable[[], None] | None = None) -> None:
+        """Serve until :meth:`stop`, or SIGINT or SIGTERM; remove the socket when done."""
+        await self.start()
+        loop = asyncio.get_running_loop()
+        for sig in (signal.SIGINT, signal.SIGTERM):
+            with suppress(NotImplementedError, RuntimeError):
+                loop.add_signal_handler(sig, self.stop)
+        try:
+            if ready is not None:
+                ready()
+            await self._stopped.wait()
+        finally:
+            for sig in (signal.SIGINT, signal.SIGTERM):
+                with suppress(NotImplementedError, RuntimeError):
+                    loop.remove_signal_handler(sig)
+            await self.close()
+
+    def stop(self) -> None:
+        if self._stopped is not None:
+            self._stopped.set()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            for writer in list(self._writers):
+                writer.close()
+            await self._server.wait_closed()
+            self._server = None
+            with suppress(FileNotFoundError):
+                os.unlink(self.path)
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        self._writers.add(writer)
+        try:
+            while line := await reader.readline():
+                try:
+                    request = json.loads(line)
+                    argv = [str(arg) for arg in request["argv"]]
+                    cwd = request.get("cwd")
+                except (ValueError, TypeError, KeyError) as e:
+                    self._send(writer, {"stderr": f"Bad request: {e}\n"})
+                    self._send(writer, {"exit": 2, "status": "completed"})
+                else:
+                    await self._run(argv, cwd, reader, writer)
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._writers.discard(writer)
+            writer.close()
+            with suppress(ConnectionError):
+                await writer.wait_closed()
+
+    async def _run(
+        self,
+        argv: list[str],
+        cwd: str | None,
+        reader: asyncio.StreamReader,
+        writer: asyncio.StreamWriter,
+    ) -> None:
+        self.requests += 1
+        streams = {"stdout": OutputStream(), "stderr": OutputStream()}
+        token = CancellationToken()
+        try:
+            async with self._cwd.use(cwd):
+                task = asyncio.create_task(self._dispatch(argv, streams, token))
+                # Forward output while the command runs, waking up as soon as it is done
+                try:
+                    while not task.done():
+                        await asyncio.wait({task}, timeout=FORWARD_INTERVAL)
+                        self._forward(streams, writer)
+                        if reader.at_eof() or writer.is_closing():
+                            token.cancel()
+                        else:
+                            await writer.drain()
+                except ConnectionError:
+                    token.cancel()
+                    raise
+                result = task.result()
+        except FileNotFoundError as e:
+            result = DispatchResult(exit_code=2, stdout="", stderr=f"{e}\n", help_text="")
+        self._forward(streams, writer)
+        if result.stdout:
+            self._send(writer, {"stdout": result.stdout})
+        if result.stderr:
+            stderr = result.stderr if result.stderr.endswith("\n") else result.stderr + "\n"
+            self._send(writer, {"stderr": stderr})
+        self._send(writer, {"exit": result.exit_code, "status": result.status.value})
+
+    async def _dispatch(
+        self, argv: list[str], streams: dict[str, OutputStream], token: CancellationToken
+    ) -> DispatchResult:
+        if is_pipeline(argv):
+            try:
+                stages = split_pipeline(argv)
+            except ValueError as e:
+                for stream in streams.values():
+                    stream.close()
+                return DispatchResult(exit_code=2, stdout="", stderr=str(e), help_text="")
+            return await dispatch_pipeline(
+                self.app,
+                stages,
+                stream=streams["stdout"],
+                token=token,
+                kill_after=self.kill_after,
+                error_stream=streams["stderr"],
+            )
+        return await dispatch_typer_command(
+            self.app,
+            argv,
+            stream=streams["stdout"],
+            token=token,
+            kill_after=self.kill_after,
+            cache=self.cache,
+            error_stream=streams["stderr"],
+        )
+
+    @staticmethod
+    def _forward(streams: dict[str, OutputStream], writer: asyncio.StreamWriter) -> None:
+        """Send the output the command wrote since the last call, by stream name."""
+        for name, stream in streams.items():
+            lines = stream.drain()
+            if lines:
+                DaemonServer._send(writer, {name: "\n".join(lines) + "\n"})
+
+    @staticmethod
+    def _send(writer: asyncio.StreamWriter, message: dict[str, Any]) -> None:
+        if not writer.is_closing():
+            writer.write(json.dumps(message).encode() + b"\n")
+
+
+def serve(
+    app: typer.Typer,
+    path: str | None = None,
+    cache: ResultCache | None = None,
+    warm: bool = True,
+    ready: Callable[[DaemonServer], None] | None = None,
+) -> None:
+    """
+    Run a :class:`DaemonServer` for ``app`` until SIGINT or SIGTERM, importing
+    all commands first.
+    """
+    server = DaemonServer(app, path, cache=cache)
+    # Fail before spending time on imports if another daemon is running
+    claim_socket(server.path)
+    if warm:
+        logger.info(f"Loaded {warm_commands(app)} commands")
+    asyncio.run(server.serve(None if ready is None else lambda: ready(server)))
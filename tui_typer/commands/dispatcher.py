@@ -0,0 +1,381 @@
+"""In-process dispatcher for Typer commands."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Sequence
+from contextlib import ExitStack
+import contextvars
+from dataclasses import dataclass
+import threading
+from typing import Any, TextIO
+
+import click
+from loguru import logger
+import typer
+from typer.core import HAS_RICH
+
+from tui_typer.commands.cancellation import (
+    EXIT_CODES,
+    CancellationToken,
+    CommandCancelled,
+    DispatchStatus,
+    bind_token,
+    wait_cancellable,
+)
+from tui_typer.commands.capture import CapturedIO, capture_output
+from tui_typer.commands.lazy import LazyGroup
+
+
+@dataclass
+class DispatchResult:
+    exit_code: int
+    stdout: str
+    stderr: str
+    help_text: str
+    status: DispatchStatus = DispatchStatus.COMPLETED
+    # What the command's callback returned, passed on by pipelines; not kept by the worker pool
+    value: Any = None
+
+
+class Dispatcher:
+    """
+    Invoke the commands of a Typer application in-process.
+
+    The Click command tree is resolved once and reused for every invocation.
+    Standard streams are captured per invocation through context variables, so
+    any number of commands can run concurrently without mixing their output.
+    """
+
+    def __init__(self, app: typer.Typer, prog_name: str | None = None):
+        self.app = app
+        self._prog_name = prog_name
+        self._command: click.Command | None = None
+        self._version = 0
+        self._lock = threading.Lock()
+
+    @property
+    def command(self) -> click.Command:
+        """The Click command built from the Typer app, resolved on first use."""
+        command = self._command
+        if command is None:
+            with self._lock:
+                if self._command is None:
+                    self._command = typer.main.get_command(self.app)
+                command = self._command
+        return command
+
+    @property
+    def prog_name(self) -> str:
+        # Same default as typer.testing.CliRunner, so usage lines read "Usage: root ..."
+        return self._prog_name or self.command.name or "root"
+
+    @property
+    def version(self) -> int:
+        """Incremented whenever the command tree is invalidated."""
+        return self._version
+
+    def invalidate(self) -> None:
+        """Drop the resolved command tree so it is rebuilt on next use."""
+        with self._lock:
+            self._command = None
+            self._version += 1
+
+    def resolve(self, args: Sequence[str]) -> tuple[list[str], click.Command | None]:
+        """
+        Resolve the leading command names of ``args`` to a Click command.
+
+        Returns:
+            The command path (e.g., ["serialize", "excel"]) and the command it names,
+            or None when the path ends at an unknown name or at a group.
+        """
+        path: list[str] = []
+        command = self.command
+        for arg in args:
+            if not isinstance(command, click.Group):
+                break
+            # get_command rather than .commands, so lazily registered groups resolve
+            subcommand = command.get_command(None, arg)
+            if subcommand is None:
+                break
+            command = subcommand
+            path.append(arg)
+        if isinstance(command, click.Group):
+            return path, None
+        return path, command
+
+    def needs_import(self, args: Sequence[str]) -> bool:
+        """Return True if resolving ``args`` would import a lazily registered group."""
+        command = self.command
+        for arg in args:
+            if not isinstance(command, click.Group):
+                return False
+            if isinstance(command, LazyGroup) and command.unloaded(arg) is not None:
+                return True
+            command = command.commands.get(arg)
+        return False
+
+    async def preload(self, args: Sequence[str]) -> None:
+        """
+        Import the lazy groups ``args`` name in a worker thread.
+
+        Importing a plugin may take seconds; call this before resolving ``args``
+        on the event loop, so the UI does not stall.
+        """
+        if self.needs_import(args):
+            await asyncio.to_thread(self.resolve, args)
+
+    def make_context(self, path: Sequence[str]) -> click.Context:
+        """
+        Build the Click context chain for a command path without running anything.
+
+        Arguments are parsed resiliently, so missing required parameters are
+        not an error and no callbacks of the groups along the path are invoked.
+        """
+        command = self.command
+        ctx = command.make_context(self.prog_name, [], resilient_parsing=True)
+        for name in path:
+            command = command.get_command(ctx, name)
+            ctx = command.make_context(name, [], parent=ctx, resilient_parsing=True)
+        return ctx
+
+    def help_text(self, args: Sequence[str], ctx: click.Context | None = None) -> str:
+        """
+        Render the help of the command that ``args`` (or ``ctx``) names.
+
+        The output is the same as running the command with ``--help``, but it
+        is produced from the Click context rather than by invoking the command.
+        """
+        if ctx is None:
+            path, _ = self.resolve(args)
+            ctx = self.make_context(path)
+        with capture_output(CapturedIO()) as captured:
+            # What Click's own --help option does; Typer's rich help prints directly
+            click.echo(ctx.get_help(), color=ctx.color)
+        return captured.stdout_text
+
+    def invoke(
+        self,
+        args: Sequence[str],
+        input: str = "",
+        stdout: TextIO | None = None,
+        token: CancellationToken | None = None,
+        stderr: TextIO | None = None,
+    ) -> DispatchResult:
+        """
+        Run a command synchronously in the calling thread.
+
+        Args:
+            args: Command arguments (e.g., ["serialize", "excel", "--file-name", "test.xlsx"])
+            input: Text made available to the command on stdin
+            stdout: Stream receiving the command's stdout instead of an in-memory buffer.
+                Output sent there is not included in the result.
+            stderr: Like ``stdout``, for the command's stderr
+            token: Cancellation token made current for the command, see
+                :func:`tui_typer.commands.cancellation.check_cancelled`
+
+        Returns:
+            DispatchResult containing exit code, stdout, stderr and status
+        """
+        argv = list(args)
+        logger.debug(f"Invoking with argv: {argv}")
+        with ExitStack() as stack:
+            captured = stack.enter_context(
+                capture_output(CapturedIO(input, stdout=stdout, stderr=stderr))
+            )
+            if token is not None:
+                stack.enter_context(bind_token(token))
+            exit_code, status, value = self._run(argv)
+        logger.debug(f"Result: exit_code={exit_code}, status={status.value}")
+        return DispatchResult(
+            exit_code=exit_code,
+            stdout=captured.stdout_text,
+            stderr=captured.stderr_text,
+            help_text="",
+            status=status,
+            value=value,
+        )
+
+    async def dispatch(
+        self,
+        args: Sequence[str],
+        input: str = "",
+        stdout: TextIO | None = None,
+        token: CancellationToken | None = None,
+        timeout: float | None = None,
+        kill_after: float = 2.0,
+        stderr: TextIO | None = None,
+    ) -> DispatchResult:
+        """
+        Run a command in a dedicated worker thread.
+
+        When ``timeout`` expires or ``token`` is cancelled, the command gets
+        ``kill_after`` seconds to notice the token. After that CommandCancelled is
+        raised inside its thread. Stopped commands return a TIMED_OUT or CANCELLED
+        status.
+        """
+        token = token or CancellationToken()
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[DispatchResult] = loop.create_future()
+
+        def _settle(result: DispatchResult | None, error: BaseException | None) -> None:
+            if future.done():
+                return
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+        def _target() -> None:
+            try:
+                result, error = self.invoke(args, input, stdout, token, stderr), None
+            except BaseException as e:
+                # An interrupt can arrive just after the command itself returned
+                result, error = None, e
+            try:
+                loop.call_soon_threadsafe(_settle, result, error)
+            except RuntimeError:
+                logger.debug("Event loop closed before the command finished")
+
+        # A dedicated thread, rather than the shared executor, so that an
+        # interrupt can never land in a thread that has moved on to other work
+        context = contextvars.copy_context()
+        threading.Thread(
+            target=context.run, args=(_target,), name="tui-typer-dispatch", daemon=True
+        ).start()
+        try:
+            if not await wait_cancellable(future, token, timeout):
+                return await self._stop(future, token, kill_after)
+        except asyncio.CancelledError:
+            await self._stop(future, token, kill_after)
+            raise
+        return self._stopped_result(future, token)
+
+    async def _stop(
+        self,
+        future: asyncio.Future[DispatchResult],
+        token: CancellationToken,
+        kill_after: float,
+    ) -> DispatchResult:
+        """Give a cancelled command time to stop, then interrupt its thread."""
+        done, _ = await asyncio.wait({future}, timeout=kill_after)
+        if not done and token.interrupt():
+            logger.warning(f"Command did not stop within {kill_after}s, interrupting it")
+            done, _ = await asyncio.wait({future}, timeout=kill_after)
+        if not done:
+            logger.warning("Command is blocked and keeps running in the background")
+        return self._stopped_result(future, token)
+
+    @staticmethod
+    def _stopped_result(
+        future: asyncio.Future[DispatchResult], token: CancellationToken
+    ) -> DispatchResult:
+        if future.done():
+            error = future.exception()
+            if error is None:
+                return future.result()
+            if not isinstance(error, CommandCancelled):
+                raise error
+            status = error.status
+        else:
+            status = token.status
+        return DispatchResult(
+            exit_code=EXIT_CODES[status],
+            stdout="",
+            stderr="",
+            help_text="",
+            status=status,
+        )
+
+    def _run(self, argv: list[str]) -> tuple[int, DispatchStatus, Any]:
+        """
+        Run the command tree the way ``main(standalone_mode=False)`` does.
+
+        Exceptions are translated into exit codes and error output instead of
+        ``sys.exit``, mirroring Typer's rich error formatting.
+
+        Returns:
+            The exit code, the status and the value the command returned
+        """
+        command = self.command
+        value = None
+
+        def _keep(result: Any) -> None:
+            nonlocal value
+            value = result
+
+        try:
+            return self._run_command(command, argv, _keep), DispatchStatus.COMPLETED, value
+        except CommandCancelled as e:
+            logger.info(f"Command {e.status.value}")
+            return e.exit_code, e.status, None
+
+    def _run_command(
+        self, command: click.Command, argv: list[str], keep: Callable[[Any], None]
+    ) -> int:
+        try:
+            try:
+                with command.make_context(self.prog_name, argv) as ctx:
+                    keep(command.invoke(ctx))
+                return 0
+            except EOFError as e:
+                click.echo(err=True)
+                raise click.Abort() from e
+            except KeyboardInterrupt:
+                return 130
+        except click.exceptions.Exit as e:
+            return e.exit_code
+        except click.ClickException as e:
+            self._show_error(e)
+            return e.exit_code
+        except click.Abort:
+            self._show_abort()
+            return 1
+        except SystemExit as e:
+            return self._system_exit_code(e)
+        except Exception as e:
+            logger.error(f"Exception during invoke: {e}")
+            return 1
+
+    def _uses_rich(self) -> bool:
+        return HAS_RICH and getattr(self.command, "rich_markup_mode", None) is not None
+
+    def _show_error(self, error: click.ClickException) -> None:
+        if self._uses_rich():
+            from typer import rich_utils
+
+            rich_utils.rich_format_error(error)
+        else:
+            error.show()
+
+    def _show_abort(self) -> None:
+        if self._uses_rich():
+            from typer import rich_utils
+
+            rich_utils.rich_abort_error()
+        else:
+            click.echo("Aborted!", err=True)
+
+    @staticmethod
+    def _system_exit_code(exc: SystemExit) -> int:
+        code = exc.code
+        if code is None:
+            return 0
+        if isinstance(code, int):
+            return code
+        # Non-integer exit codes are printed, matching the interpreter's behaviour
+        click.echo(str(code), err=True)
+        return 1
+
+
+_dispatchers: dict[typer.Typer, Dispatcher] = {}
+_dispatchers_lock = threading.Lock()
+
+
+def get_dispatcher(app: typer.Typer) -> Dispatcher:
+    """Return the shared dispatcher for a Typer application."""
+    dispatcher = _dispatchers.get(app)
+    if dispatcher is None:
+        with _dispatchers_lock:
+            dispatcher = _dispatchers.setdefault(app, Dispatcher(app))
+    return dispatcher
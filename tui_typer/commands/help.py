@@ -0,0 +1,112 @@
+"""Memoized help text for the commands of a Typer application."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Hashable, Iterable, Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+import io
+import threading
+from typing import Any
+
+from loguru import logger
+from rich.console import Console
+
+from tui_typer.commands.dispatcher import Dispatcher
+
+
+def console_width() -> int:
+    """The width Rich renders help at right now, i.e. the terminal width."""
+    return Console(file=io.StringIO()).width
+
+
+_help_width: ContextVar[int | None] = ContextVar("tui_typer_help_width", default=None)
+_install_lock = threading.Lock()
+
+
+def _install_width_hook() -> None:
+    """Make Typer's help consoles use the width bound by :func:`help_width`, if any."""
+    from typer import rich_utils
+
+    with _install_lock:
+        original = rich_utils._get_rich_console
+        if getattr(original, "__tui_typer_width__", False):
+            return
+
+        def _get_rich_console(stderr: bool = False) -> Console:
+            console = original(stderr=stderr)
+            width = _help_width.get()
+            if width is not None:
+                console.width = width
+            return console
+
+        _get_rich_console.__tui_typer_width__ = True
+        rich_utils._get_rich_console = _get_rich_console
+
+
+@contextmanager
+def help_width(width: int) -> Iterator[None]:
+    """Render help in the current context at ``width`` columns."""
+    _install_width_hook()
+    token = _help_width.set(width)
+    try:
+        yield
+    finally:
+        _help_width.reset(token)
+
+
+class HelpCache:
+    """
+    Rendered help text keyed by command path and terminal width.
+
+    Entries are rendered on first use, or ahead of time with :meth:`warm`, and
+    served from memory afterwards. The cache empties itself when the
+    dispatcher's command tree is invalidated.
+    """
+
+    def __init__(self, dispatcher: Dispatcher):
+        self.dispatcher = dispatcher
+        self._entries: dict[Hashable, Any] = {}
+        self._version = dispatcher.version
+        self._lock = threading.Lock()
+
+    def _check_version(self) -> None:
+        if self._version != self.dispatcher.version:
+            self.clear()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._version = self.dispatcher.version
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def memoize(self, key: Hashable, build: Callable[[], Any]) -> Any:
+        """Return the cached value for ``key``, building it on first use."""
+        self._check_version()
+        try:
+            return self._entries[key]
+        except KeyError:
+            value = build()
+            with self._lock:
+                return self._entries.setdefault(key, value)
+
+    def get(self, path: Sequence[str], width: int | None = None) -> str:
+        """Help text for the command at ``path`` (e.g. ``["serialize", "excel"]``)."""
+        path = tuple(path)
+        width = width or console_width()
+        return self.memoize(("help", path, width), lambda: self._render(path, width))
+
+    def _render(self, path: tuple[str, ...], width: int) -> str:
+        with help_width(width):
+            return self.dispatcher.help_text(path)
+
+    def warm(self, paths: Iterable[Sequence[str]], width: int | None = None) -> None:
+        """Render help for ``paths`` ahead of time, e.g. from a background thread."""
+        width = width or console_width()
+        count = 0
+        for path in paths:
+            self.get(path, width)
+            count += 1
+        logger.debug(f"Help cache warmed with {count} entries at width {width}")
@@ -1,38 +1,385 @@
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+import os
 from pathlib import Path
+import queue
+import threading
+import time
+
+from loguru import logger
+
+try:
+    import fcntl
+except ImportError:  # Windows: concurrent sessions are not locked against each other
+    fcntl = None
+
+# When appended commands are forced to disk: after every write, at most every
+# ``fsync_interval`` seconds, or when the OS decides
+FSYNC_POLICIES = ("always", "interval", "never")
+
+_FLUSH = object()
+_COMPACT = object()
+_STOP = object()
+
+
+def grams(text: str) -> set[str]:
+    """The two- and three-character substrings of ``text``."""
+    return {text[i : i + 2] for i in range(len(text) - 1)} | {
+        text[i : i + 3] for i in range(len(text) - 2)
+    }
+
+
+class HistoryIndex:
+    """
+    Substring search over history commands, most recent first.
+
+    Every distinct command is indexed once, at its latest position, under each
+    of its two- and three-character substrings. Posting lists hold sequence
+    numbers in the order commands were added, so a query walks the shortest
+    posting list of its trigrams (or its own list, for two characters)
+    backwards and stops after ``limit`` matches. Single characters walk the
+    entries themselves, which match often enough to stop early. Entries
+    replaced by a later duplicate or evicted from the history are skipped and
+    cleared out in bulk once they outnumber the live ones.
+    """
+
+    def __init__(self, commands: Iterable[str] = ()):
+        self._next = 0
+        # Live entries in sequence order: sequence number -> command, and its lowercase key
+        self._commands: dict[int, str] = {}
+        self._keys: dict[int, str] = {}
+        self._latest: dict[str, int] = {}
+        self._counts: dict[str, int] = {}
+        self._postings: dict[str, list[int]] = {}
+        self._stale = 0
+        for command in commands:
+            self.add(command)
+
+    def __len__(self) -> int:
+        return len(self._commands)
+
+    def add(self, command: str) -> None:
+        """Index ``command`` as the most recent entry."""
+        self._counts[command] = self._counts.get(command, 0) + 1
+        previous = self._latest.get(command)
+        if previous is not None:
+            self._drop(previous)
+        seq = self._next
+        self._next += 1
+        key = command.lower()
+        self._commands[seq] = command
+        self._keys[seq] = key
+        self._latest[command] = seq
+        self._post(seq, key)
+
+    def _post(self, seq: int, key: str) -> None:
+        postings = self._postings
+        for gram in grams(key):
+            seqs = postings.get(gram)
+            if seqs is None:
+                postings[gram] = [seq]
+            else:
+                seqs.append(seq)
+
+    def discard(self, command: str) -> None:
+        """Forget one occurrence of ``command``, e.g. when it leaves the history."""
+        count = self._counts.get(command, 0) - 1
+        if count > 0:
+            self._counts[command] = count
+            return
+        self._counts.pop(command, None)
+        seq = self._latest.pop(command, None)
+        if seq is not None:
+            self._drop(seq)
+
+    def _drop(self, seq: int) -> None:
+        del self._commands[seq]
+        del self._keys[seq]
+        self._stale += 1
+        if self._stale > max(1000, len(self._commands)):
+            self._postings = {}
+            for live, key in self._keys.items():
+                self._post(live, key)
+            self._stale = 0
+
+    def search(self, query: str, limit: int = 20) -> list[str]:
+        """Up to ``limit`` commands containing ``query`` (ignoring case), most recent first."""
+        query = query.lower()
+        if len(query) < 2:
+            seqs = reversed(self._keys)
+        elif len(query) == 2:
+            seqs = reversed(self._postings.get(query, ()))
+        else:
+            trigrams = {query[i : i + 3] for i in range(len(query) - 2)}
+            postings = [self._postings.get(trigram, ()) for trigram in trigrams]
+            seqs = reversed(min(postings, key=len))
+        matches = []
+        for seq in seqs:
+            key = self._keys.get(seq)
+            if key is not None and query in key:
+                matches.append(self._commands[seq])
+                if len(matches) >= limit:
+                    break
+        return matches
+
+
+class HistorySearch:
+    """A reverse-incremental search: the query typed so far and the match shown."""
+
+    def __init__(self, index: HistoryIndex, limit: int = 100):
+        self.index = index
+        self.limit = limit
+        self.query = ""
+        self.matches: list[str] = index.search("", limit)
+        self.position = 0
+
+    @property
+    def match(self) -> str | None:
+        if self.position < len(self.matches):
+            return self.matches[self.position]
+        return None
+
+    def update(self, query: str) -> None:
+        self.query = query
+        self.matches = self.index.search(query, self.limit)
+        self.position = 0
+
+    def older(self) -> None:
+        if self.position + 1 < len(self.matches):
+            self.position += 1
+
+    def newer(self) -> None:
+        if self.position > 0:
+            self.position -= 1
 
 
 class HistoryManager:
-    """Manages command history persistence."""
+    """
+    Manages command history persistence.
+
+    The history file is an append-only journal, one command per line, shared
+    by all sessions. :meth:`add` appends to an in-memory deque of the last
+    ``max_history`` commands and queues the command for a background writer
+    thread, so it never waits for the disk. The writer appends under an
+    advisory lock on ``<history file>.lock``, syncs according to the ``fsync``
+    policy, and compacts the journal down to ``max_history`` lines once it has
+    grown to twice that, by atomically replacing the file.
+    """
 
-    def __init__(self, history_file: Path, max_history: int = 100):
-        self.history_file = history_file
-        self.max_history = max_history
-        self.history: list[str] = []
+    def __init__(
+        self,
+        history_file: Path,
+        max_history: int = 100,
+        fsync: str = "interval",
+        fsync_interval: float = 1.0,
+    ):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy {fsync!r}, use one of {FSYNC_POLICIES}")
+        self.history_file = Path(history_file)
+        self.max_history = max(1, max_history)
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.history: deque[str] = deque(maxlen=self.max_history)
+        # The search index is built on first use, or ahead of time with build_index()
+        self._index: HistoryIndex | None = None
+        self._index_backlog: list[tuple[str | None, str]] | None = None
+        self._index_lock = threading.Lock()
+        self._build_lock = threading.Lock()
+        # Lines in the journal as far as this session knows, to decide when to compact
+        self._journal_lines = 0
+        self._pending: queue.Queue = queue.Queue()
+        self._writer: threading.Thread | None = None
+        self._writer_lock = threading.Lock()
         self.load()
 
+    @property
+    def lock_file(self) -> Path:
+        return self.history_file.with_name(f"{self.history_file.name}.lock")
+
     def load(self) -> None:
         """Load history from file."""
-        if self.history_file.exists():
-            with open(self.history_file) as f:
-                self.history = [line.strip() for line in f if line.strip()]
-                self.history = self.history[-self.max_history :]
+        if not self.history_file.exists():
+            return
+        history: deque[str] = deque(maxlen=self.max_history)
+        lines = 0
+        with open(self.history_file, encoding="utf-8", errors="replace") as f:
+            for line in f:
+                lines += 1
+                line = line.strip()
+                if line:
+                    history.append(line)
+        with self._index_lock:
+            self.history = history
+            self._index = None
+        self._journal_lines = lines
+        if lines > 2 * self.max_history:
+            self._submit(_COMPACT)
 
     def save(self) -> None:
-        """Save history to file."""
-        self.history_file.parent.mkdir(parents=True, exist_ok=True)
-        with open(self.history_file, "w") as f:
-            for cmd in self.history[-self.max_history :]:
-                f.write(f"{cmd}\n")
+        """Wait until the queued commands are written and synced to disk."""
+        if self._writer is not None:
+            self._pending.put(_FLUSH)
+            self._pending.join()
+
+    def close(self) -> None:
+        """Write the queued commands and stop the writer thread."""
+        with self._writer_lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._pending.put(_FLUSH)
+            self._pending.put(_STOP)
+            writer.join()
 
     def add(self, command: str) -> None:
         """Add command to history."""
+        command = " ".join(command.splitlines()).strip()
         if command and (not self.history or self.history[-1] != command):
-            self.history.append(command)
-            if len(self.history) > self.max_history:
-                self.history = self.history[-self.max_history :]
+            with self._index_lock:
+                evicted = self.history[0] if len(self.history) == self.max_history else None
+                self.history.append(command)
+                if self._index is not None:
+                    self._update_index(self._index, evicted, command)
+                elif self._index_backlog is not None:
+                    self._index_backlog.append((evicted, command))
+            self._submit(command)
 
     def get(self, index: int) -> str | None:
         """Get command at index."""
         if 0 <= index < len(self.history):
             return self.history[index]
         return None
+
+    @property
+    def index(self) -> HistoryIndex:
+        """The search index over the history, built on first use."""
+        index = self._index
+        return self.build_index() if index is None else index
+
+    def build_index(self) -> HistoryIndex:
+        """
+        Build the search index, e.g. in a worker thread after startup.
+
+        The index is built from a snapshot of the history; commands added
+        meanwhile are applied before it is installed, so :meth:`add` never
+        waits for the build.
+        """
+        with self._build_lock:
+            with self._index_lock:
+                if self._index is not None:
+                    return self._index
+                snapshot = list(self.history)
+                self._index_backlog = []
+            index = HistoryIndex(snapshot)
+            with self._index_lock:
+                for evicted, command in self._index_backlog:
+                    self._update_index(index, evicted, command)
+                self._index, self._index_backlog = index, None
+            return index
+
+    @staticmethod
+    def _update_index(index: HistoryIndex, evicted: str | None, command: str) -> None:
+        if evicted is not None:
+            index.discard(evicted)
+        index.add(command)
+
+    def search(self, query: str, limit: int = 20) -> list[str]:
+        """Distinct commands containing ``query``, most recent first, see :class:`HistoryIndex`."""
+        return self.index.search(query, limit)
+
+    def _submit(self, item) -> None:
+        with self._writer_lock:
+            if self._writer is None:
+                self._writer = threading.Thread(
+                    target=self._run, name="history-journal", daemon=True
+                )
+                self._writer.start()
+        self._pending.put(item)
+
+    @contextmanager
+    def _locked(self) -> Iterator[None]:
+        """Hold the advisory lock shared by all sessions using this history file."""
+        self.history_file.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.lock_file, "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock, fcntl.LOCK_UN)
+
+    def _run(self) -> None:
+        unsynced = False
+        last_sync = time.monotonic()
+        while True:
+            timeout = None
+            if unsynced:
+                timeout = max(0.0, last_sync + self.fsync_interval - time.monotonic())
+            try:
+                batch = [self._pending.get(timeout=timeout)]
+            except queue.Empty:
+                batch = []
+            while True:
+                try:
+                    batch.append(self._pending.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                commands = [item for item in batch if isinstance(item, str)]
+                if commands:
+                    self._append(commands)
+                    unsynced = self.fsync == "interval"
+                if unsynced and (
+                    _FLUSH in batch or time.monotonic() - last_sync >= self.fsync_interval
+                ):
+                    self._sync()
+                    unsynced = False
+                    last_sync = time.monotonic()
+                if _COMPACT in batch or self._journal_lines > 2 * self.max_history:
+                    self._compact()
+            except OSError as e:
+                logger.warning(f"Could not write history file {self.history_file}: {e}")
+            finally:
+                for _ in batch:
+                    self._pending.task_done()
+            if _STOP in batch:
+                return
+
+    def _append(self, commands: list[str]) -> None:
+        data = "".join(f"{command}\n" for command in commands).encode()
+        with self._locked(), open(self.history_file, "a+b") as f:
+            # Complete a line left unterminated by a crash, so this one does not join it
+            end = f.seek(0, os.SEEK_END)
+            if end:
+                f.seek(end - 1)
+                if f.read(1) != b"\n":
+                    data = b"\n" + data
+            f.write(data)
+            f.flush()
+            if self.fsync == "always":
+                os.fsync(f.fileno())
+        self._journal_lines += len(commands)
+
+    def _sync(self) -> None:
+        with open(self.history_file, "rb") as f:
+            os.fsync(f.fileno())
+
+    def _compact(self) -> None:
+        """Rewrite the journal with its last ``max_history`` commands."""
+        with self._locked():
+            if not self.history_file.exists():
+                return
+            kept: deque[str] = deque(maxlen=self.max_history)
+            with open(self.history_file, encoding="utf-8", errors="replace") as f:
+                for line in f:
+                    if line.strip():
+                        kept.append(line.strip())
+            tmp_path = self.history_file.with_name(f"{self.history_file.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.writelines(f"{command}\n" for command in kept)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.history_file)
+        self._journal_lines = len(kept)
+        logger.debug(f"Compacted history file {self.history_file} to {len(kept)} commands")
@@ -0,0 +1,260 @@
+"""Job scheduling for dispatched commands."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterable, Mapping
+from dataclasses import dataclass, field
+from enum import Enum
+import heapq
+import itertools
+import time
+from typing import Any
+
+from loguru import logger
+
+from tui_typer.commands.cancellation import CancellationToken, DispatchStatus
+
+
+class JobState(Enum):
+    """Lifecycle states of a job."""
+
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+    TIMED_OUT = "timed out"
+
+
+@dataclass
+class Job:
+    """A command submitted to the scheduler."""
+
+    id: int
+    command_line: str
+    key: str
+    run: Callable[[], Awaitable[Any]] = field(repr=False)
+    priority: int = 0
+    token: CancellationToken | None = field(default=None, repr=False)
+    state: JobState = JobState.QUEUED
+    submitted_at: float = field(default_factory=time.monotonic)
+    started_at: float | None = None
+    finished_at: float | None = None
+    result: Any = None
+    error: BaseException | None = None
+    _task: asyncio.Task | None = field(default=None, repr=False)
+    _done: asyncio.Event = field(default_factory=asyncio.Event, repr=False)
+
+    @property
+    def finished(self) -> bool:
+        return self.state not in (JobState.QUEUED, JobState.RUNNING)
+
+    @property
+    def wait_time(self) -> float:
+        """Seconds spent in the queue."""
+        end = self.started_at or self.finished_at or time.monotonic()
+        return end - self.submitted_at
+
+    @property
+    def run_time(self) -> float:
+        """Seconds spent running."""
+        if self.started_at is None:
+            return 0.0
+        return (self.finished_at or time.monotonic()) - self.started_at
+
+    async def wait(self) -> Job:
+        """Wait until the job has finished."""
+        await self._done.wait()
+        return self
+
+
+def parse_limits(values: Iterable[str], convert: Callable[[str], Any] = int) -> dict[str, Any]:
+    """Parse ``"command path:value"`` entries, e.g. ``["serialize excel:1"]``."""
+    limits = {}
+    for value in values:
+        name, sep, limit = value.rpartition(":")
+        if not sep or not name.strip():
+            logger.warning(f"Ignoring invalid command limit: {value!r}")
+            continue
+        try:
+            limits[" ".join(name.split())] = convert(limit)
+        except ValueError:
+            logger.warning(f"Ignoring invalid command limit: {value!r}")
+    return limits
+
+
+class JobScheduler:
+    """
+    Run jobs with a global and per-command concurrency limit.
+
+    Jobs wait in a queue ordered by submission (``fifo``) or by priority then
+    submission (``priority``, lower values run first). When a slot frees up the
+    first queued job whose command is below its own limit is started.
+    """
+
+    POLICIES = ("fifo", "priority")
+
+    def __init__(
+        self,
+        max_concurrent: int = 4,
+        command_limits: Mapping[str, int] | None = None,
+        policy: str = "fifo",
+        on_finish: Callable[[Job], None] | None = None,
+        keep_finished: int = 50,
+    ):
+        if policy not in self.POLICIES:
+            raise ValueError(f"Unknown queue policy {policy!r}, expected one of {self.POLICIES}")
+        self.max_concurrent = max(1, max_concurrent)
+        self.command_limits = dict(command_limits or {})
+        self.policy = policy
+        self.on_finish = on_finish
+        self._ids = itertools.count(1)
+        self._queue: list[tuple[int, int, Job]] = []
+        self._jobs: dict[int, Job] = {}
+        self._running: dict[str, int] = {}
+        self._finished: deque[int] = deque()
+        self._keep_finished = keep_finished
+
+    @property
+    def running_count(self) -> int:
+        return sum(self._running.values())
+
+    def submit(
+        self,
+        command_line: str,
+        run: Callable[[], Awaitable[Any]],
+        key: str | None = None,
+        priority: int = 0,
+        token: CancellationToken | None = None,
+    ) -> Job:
+        """
+        Queue ``run`` and start it as soon as the limits allow.
+
+        When a ``token`` is given, cancelling the running job cancels the token
+        and lets ``run`` stop the command, rather than cancelling its task.
+        """
+        job = Job(
+            id=next(self._ids),
+            command_line=command_line,
+            key=key or command_line,
+            run=run,
+            priority=priority,
+            token=token,
+        )
+        self._jobs[job.id] = job
+        order = priority if self.policy == "priority" else 0
+        heapq.heappush(self._queue, (order, job.id, job))
+        logger.debug(f"Job {job.id} queued: {command_line}")
+        self._start_ready()
+        return job
+
+    def get(self, job_id: int) -> Job | None:
+        return self._jobs.get(job_id)
+
+    def jobs(self) -> list[Job]:
+        """Active and recently finished jobs, oldest first."""
+        return sorted(self._jobs.values(), key=lambda job: job.id)
+
+    def active(self) -> list[Job]:
+        return [job for job in self.jobs() if not job.finished]
+
+    def cancel(self, job_id: int) -> bool:
+        """Cancel a queued or running job. Returns False if it cannot be cancelled."""
+        job = self._jobs.get(job_id)
+        if job is None or job.finished:
+            return False
+        if job.state is JobState.QUEUED:
+            # Removed lazily from the heap when it reaches the front
+            self._finish(job, JobState.CANCELLED)
+        elif job.token is not None:
+            job.token.cancel()
+        elif job._task is not None:
+            job._task.cancel()
+        return True
+
+    def _limit(self, key: str) -> int:
+        return self.command_limits.get(key, self.max_concurrent)
+
+    def _start_ready(self) -> None:
+        skipped = []
+        while self._queue and self.running_count < self.max_concurrent:
+            entry = heapq.heappop(self._queue)
+            job = entry[2]
+            if job.state is not JobState.QUEUED:
+                continue
+            if self._running.get(job.key, 0) >= self._limit(job.key):
+                skipped.append(entry)
+                continue
+            self._start(job)
+        for entry in skipped:
+            heapq.heappush(self._queue, entry)
+
+    def _start(self, job: Job) -> None:
+        job.state = JobState.RUNNING
+        job.started_at = time.monotonic()
+        self._running[job.key] = self._running.get(job.key, 0) + 1
+        logger.debug(f"Job {job.id} started after {job.wait_time:.3f}s in queue")
+        job._task = asyncio.get_running_loop().create_task(self._run(job))
+
+    async def _run(self, job: Job) -> None:
+        state = JobState.DONE
+        try:
+            job.result = await job.run()
+            status = getattr(job.result, "status", DispatchStatus.COMPLETED)
+            if status is DispatchStatus.CANCELLED:
+                state = JobState.CANCELLED
+            elif status is DispatchStatus.TIMED_OUT:
+                state = JobState.TIMED_OUT
+        except asyncio.CancelledError:
+            state = JobState.CANCELLED
+        except Exception as e:
+            logger.exception(f"Job {job.id} failed: {e}")
+            job.error = e
+            state = JobState.FAILED
+        finally:
+            self._running[job.key] -= 1
+            if not self._running[job.key]:
+                del self._running[job.key]
+            self._finish(job, state)
+            self._start_ready()
+
+    def _finish(self, job: Job, state: JobState) -> None:
+        job.state = state
+        job.finished_at = time.monotonic()
+        job._done.set()
+        self._finished.append(job.id)
+        while len(self._finished) > self._keep_finished:
+            self._jobs.pop(self._finished.popleft(), None)
+        logger.debug(
+            f"Job {job.id} {state.value}: queued {job.wait_time:.3f}s, ran {job.run_time:.3f}s"
+        )
+        if self.on_finish is not None:
+            self.on_finish(job)
+
+
+JOB_OPTIONS = ("--priority", "--timeout")
+
+
+def split_job_options(parts: list[str]) -> tuple[dict[str, str], list[str]]:
+    """
+    Split leading scheduler options off a command line.
+
+    ``["--priority", "5", "serialize", "excel"]`` gives
+    ``({"--priority": "5"}, ["serialize", "excel"])``.
+    """
+    options: dict[str, str] = {}
+    index = 0
+    while index < len(parts):
+        name, sep, value = parts[index].partition("=")
+        if name not in JOB_OPTIONS:
+            break
+        if not sep:
+            if index + 1 >= len(parts):
+                raise ValueError(f"Option {name} requires a value")
+            value = parts[index + 1]
+            index += 1
+        options[name] = value
+        index += 1
+    return options, parts[index:]
@@ -0,0 +1,120 @@
+"""Typer groups whose subcommands are imported on first use."""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+import importlib
+from typing import Any
+
+import click
+from loguru import logger
+import typer
+from typer.core import TyperGroup
+
+
+@dataclass(frozen=True)
+class LazySubcommand:
+    """
+    A subcommand registered by name and help text only.
+
+    Args:
+        import_path: ``module:attribute`` of a Typer app, a Click command or a
+            ``cli_plugin()`` style function returning ``(name, command)``,
+            e.g. ``tui_typer.commands.typer_subcommand:serialize``
+        help: Short help shown in listings before the module is imported
+        description: The command tree as recorded in the plugin manifest, see
+            :func:`tui_typer.commands.plugins.describe_command`
+        on_load: Called with the command once it is imported, e.g. to record it
+            in the plugin manifest
+    """
+
+    import_path: str
+    help: str = ""
+    description: dict[str, Any] | None = field(default=None, compare=False, hash=False)
+    on_load: Callable[[click.Command], None] | None = field(default=None, compare=False, hash=False)
+
+    def load(self, name: str) -> click.Command:
+        module_name, _, attribute = self.import_path.partition(":")
+        target = getattr(importlib.import_module(module_name), attribute)
+        if not isinstance(target, (typer.Typer, click.Command)) and callable(target):
+            _, target = target()
+        if isinstance(target, typer.Typer):
+            command = typer.main.get_group(target)
+        else:
+            command = target
+        command.name = name
+        return command
+
+
+# Set while a group renders its own help, so listing subcommands does not import them
+_describing: ContextVar[bool] = ContextVar("tui_typer_describing", default=False)
+
+
+@contextmanager
+def describing() -> Iterator[None]:
+    """Resolve lazy subcommands to name-and-help placeholders within this block."""
+    token = _describing.set(True)
+    try:
+        yield
+    finally:
+        _describing.reset(token)
+
+
+class LazyGroup(TyperGroup):
+    """
+    A Typer group with subcommands that are imported when invoked or inspected.
+
+    Listing the group (``--help``, :meth:`list_commands`) only needs the names
+    and help registered in ``lazy_subcommands``; the modules behind them are
+    imported on the first :meth:`get_command` outside of :func:`describing`.
+    Create subclasses with :func:`lazy_group`.
+    """
+
+    lazy_subcommands: dict[str, LazySubcommand] = {}
+
+    def list_commands(self, ctx: click.Context) -> list[str]:
+        names = super().list_commands(ctx)
+        return names + [name for name in self.lazy_subcommands if name not in self.commands]
+
+    def unloaded(self, cmd_name: str) -> LazySubcommand | None:
+        """The registration of ``cmd_name`` if it has not been imported yet."""
+        if cmd_name in self.commands:
+            return None
+        return self.lazy_subcommands.get(cmd_name)
+
+    def get_command(self, ctx: click.Context | None, cmd_name: str) -> click.Command | None:
+        command = self.commands.get(cmd_name)
+        if command is not None:
+            return command
+        lazy = self.lazy_subcommands.get(cmd_name)
+        if lazy is None:
+            return None
+        if _describing.get():
+            return click.Group(name=cmd_name, help=lazy.help)
+        logger.debug(f"Importing lazy subcommand {cmd_name!r} from {lazy.import_path}")
+        command = lazy.load(cmd_name)
+        self.add_command(command, cmd_name)
+        if lazy.on_load is not None:
+            lazy.on_load(command)
+        return command
+
+    def format_help(self, ctx: click.Context, formatter: click.HelpFormatter) -> None:
+        with describing():
+            super().format_help(ctx, formatter)
+
+
+def lazy_group(**subcommands: LazySubcommand) -> type[LazyGroup]:
+    """
+    Create a group class for ``typer.Typer(cls=...)`` with lazy subcommands::
+
+        cli = typer.Typer(
+            cls=lazy_group(serialize=LazySubcommand("my_cli.serialize:app", "Serialize reports."))
+        )
+
+    Typer only builds a group for apps with a callback or several commands, so
+    give the app a callback if the lazy subcommands are all it has.
+    """
+    return type("LazyGroup", (LazyGroup,), {"lazy_subcommands": dict(subcommands)})
@@ -1,48 +1,104 @@
+from typing import Any
+
+import click
 from click import Group
 from loguru import logger
 import typer
 
 from tui_typer.commands.base import Command
+from tui_typer.commands.dispatcher import get_dispatcher
+from tui_typer.commands.lazy import LazyGroup
+from tui_typer.commands.tree import CommandTree
+
+# Commands that only make sense from a shell: starting the TUI, serving commands
+# until stopped, which would hold a job slot forever, and running a command script
+SHELL_ONLY_COMMANDS = ("interactive", "serve", "run-script")
+
+
+def _resolver(typer_app: typer.Typer, path: list[str]):
+    """Look up the Click command at ``path`` when it is first needed."""
+
+    def resolve() -> click.Command | None:
+        dispatcher = get_dispatcher(typer_app)
+        ctx = dispatcher.make_context(path)
+        return ctx.command
+
+    return resolve
 
 
-def load_commands(typer_app: typer.Typer) -> dict[str, Command]:
-    """Load all commands from a Typer application instance."""
-    commands = {}
-    click_group = typer.main.get_group(typer_app)
+def _load_described(
+    tree: CommandTree,
+    typer_app: typer.Typer,
+    path: list[str],
+    description: dict[str, Any],
+    parent: str | None = None,
+) -> None:
+    """Add a plugin group as recorded in the plugin manifest, without importing it."""
+    name = " ".join(path)
+    logger.debug(f"Loading command from plugin manifest: {name}")
+    tree.add(
+        Command(
+            name=name,
+            description=description["help"] or description["short_help"],
+            is_group=description["is_group"],
+            parent=parent,
+            params=description["params"],
+            resolve=_resolver(typer_app, path),
+        )
+    )
+    for sub_name, sub_description in description.get("commands", {}).items():
+        _load_described(tree, typer_app, [*path, sub_name], sub_description, parent=name)
+
+
+def _load_command(
+    tree: CommandTree,
+    ctx: click.Context,
+    cmd: click.Command,
+    path: list[str],
+    parent: str | None = None,
+) -> None:
+    """Add ``cmd`` and, for groups, its subcommands at any depth."""
+    name = " ".join(path)
+    logger.debug(f"Loading command: {name}")
+    is_group = isinstance(cmd, Group)
+    tree.add(
+        Command(
+            name=name,
+            description=cmd.help or cmd.short_help or "",
+            typer_command=cmd,
+            is_group=is_group,
+            parent=parent,
+        )
+    )
+    if is_group:
+        # list_commands/get_command also cover subcommands registered lazily
+        for sub_name in cmd.list_commands(ctx):
+            sub_cmd = cmd.get_command(ctx, sub_name)
+            if sub_cmd is not None:
+                _load_command(tree, ctx, sub_cmd, [*path, sub_name], parent=name)
+
+
+def load_commands(typer_app: typer.Typer) -> CommandTree:
+    """
+    Load all commands from a Typer application instance, at any depth.
+
+    Plugin groups that have not been imported yet are loaded from their
+    description in the plugin manifest when one is available.
+    """
+    tree = CommandTree()
+    click_group = get_dispatcher(typer_app).command
 
     if isinstance(click_group, Group):
-        for cmd_name, cmd in click_group.commands.items():
-            logger.debug(f"Loading command: {cmd_name}")
-            help_text = cmd.help or cmd.short_help or ""
-            is_group = isinstance(cmd, Group)
-
-            command_obj = Command(
-                name=cmd_name,
-                description=help_text,
-                typer_command=cmd,
-                is_group=is_group,
-                params=cmd.params,
-            )
-            if (
-                command_obj.name == "interactive"
-            ):  # Don't include the interactive command in the command palette
-                logger.debug("Skipping 'interactive' command for command palette")
+        ctx = click.Context(click_group, info_name=click_group.name)
+        for cmd_name in click_group.list_commands(ctx):
+            if cmd_name in SHELL_ONLY_COMMANDS:
+                # Don't include them in the command tree and palette
+                logger.debug(f"Skipping '{cmd_name}' command for command palette")
                 continue
-            commands[cmd_name] = command_obj
-
-            if is_group:
-                for sub_name, sub_cmd in cmd.commands.items():
-                    full_name = f"{cmd_name} {sub_name}"
-                    sub_help = sub_cmd.help or sub_cmd.short_help or ""
-
-                    sub_command_obj = Command(
-                        name=full_name,
-                        description=sub_help,
-                        typer_command=sub_cmd,
-                        is_group=False,
-                        parent=cmd_name,
-                        params=sub_cmd.params,
-                    )
-                    commands[full_name] = sub_command_obj
-
-    return commands
+            lazy = click_group.unloaded(cmd_name) if isinstance(click_group, LazyGroup) else None
+            if lazy is not None and lazy.description is not None:
+                _load_described(tree, typer_app, [cmd_name], lazy.description)
+            else:
+                _load_command(tree, ctx, click_group.get_command(ctx, cmd_name), [cmd_name])
+
+    return tree
@@ -0,0 +1,150 @@
+"""Pipelines passing Python objects from one command to the next: ``cmd1 | cmd2``."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+import time
+from typing import Any
+
+import click
+import typer
+
+from tui_typer.commands.base import dispatch_typer_command
+from tui_typer.commands.cancellation import CancellationToken
+from tui_typer.commands.dispatcher import DispatchResult
+from tui_typer.commands.streaming import OutputStream
+
+PIPE = "|"
+
+_NOTHING = object()
+_piped: ContextVar[Any] = ContextVar("tui_typer_piped_input", default=_NOTHING)
+
+
+def is_pipeline(args: Sequence[str]) -> bool:
+    return PIPE in args
+
+
+def split_pipeline(args: Sequence[str]) -> list[list[str]]:
+    """
+    Split a command line at its ``|`` arguments into the commands of a pipeline.
+
+    Raises:
+        ValueError: If a command of the pipeline is empty, e.g. ``a | | b``
+    """
+    stages: list[list[str]] = [[]]
+    for arg in args:
+        if arg == PIPE:
+            stages.append([])
+        else:
+            stages[-1].append(arg)
+    if any(not stage for stage in stages):
+        raise ValueError("Empty command in pipeline")
+    return stages
+
+
+@contextmanager
+def bind_input(value: Any) -> Iterator[None]:
+    """Make ``value`` the piped input of commands run in the current context."""
+    token = _piped.set(value)
+    try:
+        yield
+    finally:
+        _piped.reset(token)
+
+
+def has_piped_input() -> bool:
+    return _piped.get() is not _NOTHING
+
+
+def piped_input(default: Any = _NOTHING) -> Any:
+    """
+    The value the previous command of the pipeline returned.
+
+    The object itself is passed, not a copy; treat it as read-only unless the
+    command owns it from here on. Outside a pipeline ``default`` is returned::
+
+        @serialize.command()
+        def excel(file_name: str = "report.xlsx"):
+            data = piped_input(default=reports)
+
+    Raises:
+        click.UsageError: Outside a pipeline when no ``default`` is given
+    """
+    value = _piped.get()
+    if value is _NOTHING:
+        if default is _NOTHING:
+            raise click.UsageError("This command expects input piped from another command")
+        return default
+    return value
+
+
+async def dispatch_pipeline(
+    app: typer.Typer,
+    stages: Sequence[Sequence[str]],
+    stream: OutputStream | None = None,
+    token: CancellationToken | None = None,
+    timeout: float | None = None,
+    kill_after: float = 2.0,
+    error_stream: OutputStream | None = None,
+) -> DispatchResult:
+    """
+    Run the commands of a pipeline one after another, in this process.
+
+    The return value of each command becomes the :func:`piped_input` of the
+    next; nothing is converted to text in between. The pipeline stops at the
+    first command that fails. Output of all commands is collected in the
+    result, or written to ``stream``, which is closed at the end, and stderr
+    likewise to ``error_stream``; ``timeout`` applies to the whole pipeline.
+    The worker process pool and the result cache are not used, since they
+    would copy or share the objects passed on.
+
+    Returns:
+        The result of the last command run, with the output of all of them
+    """
+    deadline = None if timeout is None else time.monotonic() + timeout
+    stdout: list[str] = []
+    stderr: list[str] = []
+    value: Any = _NOTHING
+    result = None
+    try:
+        for index, args in enumerate(stages):
+            last = index == len(stages) - 1
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            # The first command gets no input, also when this pipeline runs inside another
+            with bind_input(value):
+                result = await dispatch_typer_command(
+                    app,
+                    args,
+                    stream=stream if last else None,
+                    token=token,
+                    timeout=remaining,
+                    kill_after=kill_after,
+                    error_stream=error_stream if last else None,
+                )
+            if result.stdout:
+                if stream is not None and not last:
+                    stream.write(result.stdout)
+                else:
+                    stdout.append(result.stdout)
+            if result.stderr:
+                if error_stream is not None and not last:
+                    error_stream.write(result.stderr)
+                else:
+                    stderr.append(result.stderr)
+            if result.exit_code != 0 or last:
+                break
+            value = result.value
+    finally:
+        for output in (stream, error_stream):
+            if output is not None:
+                output.close()
+    return DispatchResult(
+        exit_code=result.exit_code,
+        stdout="".join(stdout),
+        stderr="".join(stderr),
+        help_text=result.help_text,
+        status=result.status,
+        value=result.value,
+    )
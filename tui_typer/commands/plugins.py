@@ -0,0 +1,265 @@
+"""Plugin discovery through entry points, with an on-disk manifest of their commands."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+import importlib.metadata
+import json
+import os
+from pathlib import Path
+from typing import Any
+
+import click
+from loguru import logger
+
+from tui_typer import __app_name__
+from tui_typer.commands.lazy import LazySubcommand
+
+# Plugin packages declare their commands in this entry point group, e.g. in pyproject.toml:
+#
+#   [project.entry-points."tui_typer.plugins"]
+#   serialize = "tui_typer.commands.typer_subcommand:cli_plugin"
+ENTRY_POINT_GROUP = "tui_typer.plugins"
+
+# Plugins shipped with this package, so they are found when running from a source checkout
+BUILTIN_PLUGINS = {"serialize": "tui_typer.commands.typer_subcommand:cli_plugin"}
+
+MANIFEST_ENV = "TUI_TYPER_PLUGIN_MANIFEST"
+DEFAULT_MANIFEST = f"~/.{__app_name__}_plugins.json"
+MANIFEST_FORMAT = 1
+
+
+@dataclass(frozen=True)
+class Plugin:
+    """
+    A command group provided by a plugin, known by name and import path.
+
+    ``origin`` is the module file of a plugin that is edited in place, like the
+    built-in ones in a source checkout; installed plugins are told apart by the
+    version of their distribution.
+    """
+
+    name: str
+    value: str
+    version: str = ""
+    origin: str | None = None
+
+    @property
+    def module(self) -> str:
+        return self.value.partition(":")[0]
+
+    def fingerprint(self) -> dict[str, Any]:
+        """Package version and origin mtime; the manifest entry is stale when they change."""
+        mtime = None
+        if self.origin is not None and os.path.exists(self.origin):
+            mtime = os.stat(self.origin).st_mtime
+        return {"value": self.value, "version": self.version, "mtime": mtime}
+
+    def load(self) -> click.Command:
+        """Import the plugin and return its Click command."""
+        return LazySubcommand(self.value).load(self.name)
+
+
+def _package_version() -> str:
+    try:
+        return importlib.metadata.version(__app_name__)
+    except importlib.metadata.PackageNotFoundError:
+        return ""
+
+
+def _builtin_origin(value: str) -> str | None:
+    """The source file of a module of this package, found without importing it."""
+    parts = value.partition(":")[0].split(".")
+    if parts[0] != __package__.partition(".")[0]:
+        return None
+    package_dir = Path(__file__).resolve().parents[1]
+    return str(package_dir.joinpath(*parts[1:]).with_suffix(".py"))
+
+
+def discover_plugins(builtins: Mapping[str, str] = BUILTIN_PLUGINS) -> list[Plugin]:
+    """Built-in plugins plus those registered under the ``tui_typer.plugins`` entry points."""
+    version = _package_version()
+    plugins = {
+        name: Plugin(name, value, version, _builtin_origin(value))
+        for name, value in builtins.items()
+    }
+    for entry_point in importlib.metadata.entry_points(group=ENTRY_POINT_GROUP):
+        dist = getattr(entry_point, "dist", None)
+        plugins[entry_point.name] = Plugin(
+            entry_point.name,
+            entry_point.value,
+            dist.version if dist else "",
+            _builtin_origin(entry_point.value),
+        )
+    return list(plugins.values())
+
+
+def _json_value(value: Any) -> Any:
+    if value is None or isinstance(value, (bool, int, float, str)):
+        return value
+    if isinstance(value, (list, tuple)):
+        return [_json_value(item) for item in value]
+    return str(value)
+
+
+def describe_param(param: click.Parameter) -> dict[str, Any]:
+    """The metadata of a parameter that help and completion need."""
+    return {
+        "name": param.name,
+        "kind": param.param_type_name,
+        "opts": list(param.opts),
+        "secondary_opts": list(param.secondary_opts),
+        "type": param.type.name,
+        "required": param.required,
+        "default": _json_value(None if callable(param.default) else param.default),
+        "multiple": param.multiple,
+        "nargs": param.nargs,
+        "is_flag": getattr(param, "is_flag", False),
+        "help": getattr(param, "help", None) or "",
+    }
+
+
+def describe_command(command: click.Command) -> dict[str, Any]:
+    """A JSON-serializable description of a command and, for groups, its subcommands."""
+    description = {
+        "name": command.name,
+        "help": command.help or "",
+        "short_help": command.short_help or "",
+        "is_group": isinstance(command, click.Group),
+        "params": [describe_param(param) for param in command.params],
+    }
+    if isinstance(command, click.Group):
+        ctx = click.Context(command, info_name=command.name)
+        description["commands"] = {
+            name: describe_command(command.get_command(ctx, name))
+            for name in command.list_commands(ctx)
+        }
+    return description
+
+
+class PluginManifest:
+    """
+    Cached descriptions of plugin commands, stored as JSON.
+
+    An entry is reused as long as the plugin's import path, package version and
+    module mtime are unchanged, so listing commands and rendering help overviews
+    does not import plugin code. Stale or missing entries are rebuilt by
+    :meth:`refresh`, which imports the plugins, or by :meth:`record` when a
+    plugin is imported anyway.
+    """
+
+    def __init__(self, path: str | os.PathLike | None = None):
+        self.path = Path(path or os.environ.get(MANIFEST_ENV) or DEFAULT_MANIFEST).expanduser()
+        self._plugins: dict[str, dict[str, Any]] = {}
+        self._loaded = False
+        self._dirty = False
+
+    def load(self) -> None:
+        self._loaded = True
+        try:
+            data = json.loads(self.path.read_text())
+        except FileNotFoundError:
+            return
+        except (OSError, ValueError) as e:
+            logger.warning(f"Ignoring unreadable plugin manifest {self.path}: {e}")
+            return
+        if data.get("format") == MANIFEST_FORMAT:
+            self._plugins = data.get("plugins", {})
+
+    def save(self) -> None:
+        """Write the manifest if it changed, atomically so readers never see half of it."""
+        if not self._dirty:
+            return
+        data = {"format": MANIFEST_FORMAT, "plugins": self._plugins}
+        tmp_path = self.path.with_name(f"{self.path.name}.{os.getpid()}.tmp")
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path.write_text(json.dumps(data, indent=1))
+            os.replace(tmp_path, self.path)
+            self._dirty = False
+        except OSError as e:
+            logger.warning(f"Could not write plugin manifest {self.path}: {e}")
+
+    def get(self, plugin: Plugin) -> dict[str, Any] | None:
+        """The cached description of ``plugin``, or None if it is missing or stale."""
+        if not self._loaded:
+            self.load()
+        entry = self._plugins.get(plugin.name)
+        if entry is None or entry.get("fingerprint") != plugin.fingerprint():
+            return None
+        return entry["command"]
+
+    def update(self, plugin: Plugin, command: click.Command | None = None) -> dict[str, Any]:
+        """Describe ``plugin`` from its command, importing it if not given."""
+        if not self._loaded:
+            self.load()
+        logger.debug(f"Updating plugin manifest entry for {plugin.name!r}")
+        description = describe_command(command or plugin.load())
+        self._plugins[plugin.name] = {
+            "fingerprint": plugin.fingerprint(),
+            "command": description,
+        }
+        self._dirty = True
+        return description
+
+    def record(self, plugin: Plugin, command: click.Command) -> None:
+        """Describe the imported ``command`` of ``plugin`` and save the manifest."""
+        try:
+            self.update(plugin, command)
+        except Exception as e:
+            logger.warning(f"Could not describe plugin {plugin.name!r} for the manifest: {e}")
+            return
+        self.save()
+
+    def refresh(self, plugins: Iterable[Plugin]) -> dict[str, dict[str, Any]]:
+        """Descriptions of ``plugins``, rebuilding stale entries and dropping removed ones."""
+        if not self._loaded:
+            self.load()
+        plugins = list(plugins)
+        descriptions = {}
+        for plugin in plugins:
+            description = self.get(plugin)
+            if description is None:
+                try:
+                    description = self.update(plugin)
+                except Exception as e:
+                    logger.error(f"Could not load plugin {plugin.name!r} ({plugin.value}): {e}")
+                    continue
+            descriptions[plugin.name] = description
+        for name in set(self._plugins) - {plugin.name for plugin in plugins}:
+            del self._plugins[name]
+            self._dirty = True
+        self.save()
+        return descriptions
+
+
+def plugin_subcommands(
+    manifest: PluginManifest | None = None,
+    plugins: Iterable[Plugin] | None = None,
+) -> dict[str, LazySubcommand]:
+    """
+    Lazy registrations of the discovered plugins for :func:`~tui_typer.commands.lazy.lazy_group`.
+
+    Names, help and the command tree come from the manifest, so with an up to
+    date manifest no plugin module is imported. The manifest is only read here;
+    a plugin without an up to date entry is recorded when it is first imported.
+    """
+    manifest = manifest or PluginManifest()
+    if plugins is None:
+        plugins = discover_plugins()
+    subcommands = {}
+    for plugin in plugins:
+        description = manifest.get(plugin)
+        if description is not None:
+            subcommands[plugin.name] = LazySubcommand(
+                plugin.value,
+                help=description["help"] or description["short_help"],
+                description=description,
+            )
+        else:
+            subcommands[plugin.name] = LazySubcommand(
+                plugin.value,
+                on_load=lambda command, plugin=plugin: manifest.record(plugin, command),
+            )
+    return subcommands
@@ -0,0 +1,253 @@
+"""Progress reporting for commands, shown in the TUI or as a Rich progress bar."""
+
+from __future__ import annotations
+
+from collections import deque
+from collections.abc import Iterable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+import threading
+import time
+from typing import TypeVar
+
+from rich.console import Console
+from rich.progress import Progress, TaskID
+
+T = TypeVar("T")
+
+# Refreshes per second of the Rich progress bar used outside the TUI
+CLI_REFRESH_RATE = 10
+
+
+class ProgressTask:
+    """
+    The progress of one piece of work, e.g. the rows of an export.
+
+    Updating a task only changes its attributes; the display polls them a few
+    times per second, so calling :meth:`advance` once per row is cheap. A task
+    is meant to be updated from one thread.
+    """
+
+    __slots__ = ("description", "total", "completed", "started", "finished")
+
+    def __init__(self, description: str = "", total: float | None = None):
+        self.description = description
+        self.total = total
+        self.completed = 0.0
+        self.started = time.monotonic()
+        self.finished = False
+
+    def advance(self, amount: float = 1) -> None:
+        self.completed += amount
+
+    def update(
+        self,
+        completed: float | None = None,
+        total: float | None = None,
+        description: str | None = None,
+    ) -> None:
+        if completed is not None:
+            self.completed = completed
+        if total is not None:
+            self.total = total
+        if description is not None:
+            self.description = description
+
+    @property
+    def fraction(self) -> float | None:
+        """Completed part of the task between 0 and 1, None if the total is unknown."""
+        if not self.total:
+            return None
+        return min(1.0, self.completed / self.total)
+
+    def track(self, iterable: Iterable[T]) -> Iterator[T]:
+        """Yield from ``iterable``, advancing the task by one per item."""
+        for item in iterable:
+            yield item
+            self.completed += 1
+
+
+class ProgressBoard:
+    """
+    The progress tasks of running commands.
+
+    Commands add tasks through :func:`progress`; a display reads
+    :meth:`tasks` on its own schedule. Adding and removing tasks takes a lock,
+    updating them does not.
+    """
+
+    def __init__(self, label: str = ""):
+        self.label = label
+        self._tasks: list[ProgressTask] = []
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._tasks)
+
+    def add(self, description: str = "", total: float | None = None) -> ProgressTask:
+        task = ProgressTask(description, total)
+        with self._lock:
+            self._tasks = [*self._tasks, task]
+        return task
+
+    def remove(self, task: ProgressTask) -> None:
+        task.finished = True
+        with self._lock:
+            self._tasks = [t for t in self._tasks if t is not task]
+
+    def tasks(self) -> list[ProgressTask]:
+        """The current tasks, oldest first."""
+        return self._tasks
+
+
+class RateMeter:
+    """
+    Throughput over a sliding time window, from samples of a running count.
+
+    Args:
+        window: Seconds of samples the rate is computed over
+    """
+
+    def __init__(self, window: float = 10.0):
+        self.window = window
+        self._samples: deque[tuple[float, float]] = deque()
+
+    def add(self, completed: float, now: float | None = None) -> None:
+        now = time.monotonic() if now is None else now
+        samples = self._samples
+        if samples and completed < samples[-1][1]:
+            # The count went back, e.g. a new task started: start over
+            samples.clear()
+        samples.append((now, completed))
+        while len(samples) > 2 and now - samples[1][0] >= self.window:
+            samples.popleft()
+
+    @property
+    def rate(self) -> float | None:
+        """Items per second, None until two samples a moment apart are known."""
+        if len(self._samples) < 2:
+            return None
+        (start, first), (end, last) = self._samples[0], self._samples[-1]
+        if end - start <= 0:
+            return None
+        return (last - first) / (end - start)
+
+    def eta(self, remaining: float) -> float | None:
+        """Seconds until ``remaining`` more items are done at the current rate."""
+        rate = self.rate
+        if not rate or rate <= 0:
+            return None
+        return max(0.0, remaining) / rate
+
+
+class _PolledProgress(Progress):
+    """A Rich Progress that copies the state of board tasks before each refresh."""
+
+    def __init__(self, **kwargs):
+        self._ids: dict[ProgressTask, TaskID] = {}
+        super().__init__(**kwargs)
+
+    def track_task(self, task: ProgressTask) -> None:
+        self._ids[task] = self.add_task(task.description, total=task.total)
+
+    def untrack_task(self, task: ProgressTask) -> None:
+        task_id = self._ids.pop(task, None)
+        if task_id is not None:
+            self.update(task_id, completed=task.completed, total=task.total)
+            self.refresh()
+            self.remove_task(task_id)
+
+    def get_renderables(self):
+        for task, task_id in list(self._ids.items()):
+            self.update(
+                task_id, completed=task.completed, total=task.total, description=task.description
+            )
+        yield from super().get_renderables()
+
+
+class RichProgressBoard(ProgressBoard):
+    """
+    A board drawn as a Rich progress bar on stderr, used when no TUI is listening.
+
+    The bar runs while the board has tasks and is only drawn on a terminal.
+    """
+
+    def __init__(self, refresh_rate: int = CLI_REFRESH_RATE):
+        super().__init__()
+        self.refresh_rate = refresh_rate
+        self._progress: _PolledProgress | None = None
+
+    def add(self, description: str = "", total: float | None = None) -> ProgressTask:
+        task = super().add(description, total)
+        with self._lock:
+            if self._progress is None:
+                console = Console(stderr=True)
+                self._progress = _PolledProgress(
+                    console=console,
+                    refresh_per_second=self.refresh_rate,
+                    disable=not console.is_terminal,
+                )
+                self._progress.start()
+            self._progress.track_task(task)
+        return task
+
+    def remove(self, task: ProgressTask) -> None:
+        super().remove(task)
+        with self._lock:
+            if self._progress is None:
+                return
+            self._progress.untrack_task(task)
+            if not self._tasks:
+                self._progress.stop()
+                self._progress = None
+
+
+_cli_board = RichProgressBoard()
+_current_board: ContextVar[ProgressBoard | None] = ContextVar(
+    "tui_typer_progress_board", default=None
+)
+
+
+@contextmanager
+def bind_progress(board: ProgressBoard) -> Iterator[ProgressBoard]:
+    """Make ``board`` receive the progress of commands run in the current context."""
+    token = _current_board.set(board)
+    try:
+        yield board
+    finally:
+        _current_board.reset(token)
+
+
+def current_board() -> ProgressBoard:
+    """The board bound to the current context, or the Rich board for plain CLI use."""
+    board = _current_board.get()
+    return _cli_board if board is None else board
+
+
+@contextmanager
+def progress(total: float | None = None, description: str = "") -> Iterator[ProgressTask]:
+    """
+    Report the progress of a block of work::
+
+        with progress(total=len(rows), description="Exporting") as bar:
+            for row in rows:
+                export(row)
+                bar.advance()
+
+    In the TUI the task is shown in the progress bar; run from the command line
+    it is drawn with Rich on stderr.
+    """
+    board = current_board()
+    task = board.add(description, total)
+    try:
+        yield task
+    finally:
+        board.remove(task)
+
+
+def track(iterable: Iterable[T], total: float | None = None, description: str = "") -> Iterator[T]:
+    """Iterate over ``iterable`` while reporting its progress, see :func:`progress`."""
+    if total is None and hasattr(iterable, "__len__"):
+        total = len(iterable)
+    with progress(total, description) as task:
+        yield from task.track(iterable)
@@ -0,0 +1,267 @@
+"""Cached results of read-only commands, shared by identical concurrent dispatches."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import OrderedDict
+from collections.abc import Awaitable, Callable, Hashable, Iterable, Sequence
+from dataclasses import dataclass
+import os
+import sys
+import time
+from typing import Any, TypeVar
+
+import click
+from loguru import logger
+
+from tui_typer.commands.cancellation import (
+    EXIT_CODES,
+    CancellationToken,
+    DispatchStatus,
+    wait_cancellable,
+)
+from tui_typer.commands.dispatcher import Dispatcher, DispatchResult
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+CACHE_ATTR = "__tui_typer_cacheable__"
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    """
+    How a command's results are cached.
+
+    Attributes:
+        ttl: Seconds a result is served from the cache, None for the cache's default
+        inputs: Names of parameters holding input files; the key includes their
+            size and modification time, so changing a file invalidates the result
+    """
+
+    ttl: float | None = None
+    inputs: tuple[str, ...] = ()
+
+
+def cacheable(
+    func: F | None = None, *, ttl: float | None = None, inputs: Iterable[str] = ()
+) -> F | Callable[[F], F]:
+    """
+    Mark a Typer command callback as read-only, so its results may be cached.
+
+    Apply it below the Typer decorator, with or without arguments::
+
+        @report.command()
+        @cacheable(ttl=30, inputs=["file_name"])
+        def summary(file_name: str): ...
+    """
+    policy = CachePolicy(ttl=ttl, inputs=tuple(inputs))
+
+    def mark(func: F) -> F:
+        setattr(func, CACHE_ATTR, policy)
+        return func
+
+    return mark if func is None else mark(func)
+
+
+def result_size(result: DispatchResult) -> int:
+    """Approximate memory held by a result, in bytes."""
+    return sum(
+        sys.getsizeof(text or "") for text in (result.stdout, result.stderr, result.help_text)
+    )
+
+
+def fingerprint(path: Any) -> tuple[str, int | None, int | None]:
+    """Absolute path, modification time and size of an input file (None if missing)."""
+    path = os.path.abspath(os.fspath(path))
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return path, None, None
+    return path, stat.st_mtime_ns, stat.st_size
+
+
+@dataclass
+class CacheStats:
+    hits: int = 0
+    misses: int = 0
+    shared: int = 0
+    evictions: int = 0
+    entries: int = 0
+    size: int = 0
+
+
+class ResultCache:
+    """
+    Results of cacheable commands, keyed by their arguments and input files.
+
+    Commands opt in with :func:`cacheable` or by listing their full path (e.g.
+    ``report summary``) in ``commands``. Successful results are kept until
+    their TTL expires, least recently used first out once ``max_bytes`` are
+    held. A dispatch identical to one still running waits for that one and
+    shares its result instead of running the command again; if that one fails
+    or is stopped, one of the waiting dispatches runs the command itself.
+
+    The single-flight bookkeeping is not thread-safe: use one cache from one
+    event loop.
+    """
+
+    def __init__(
+        self,
+        max_bytes: int = 64 * 1024 * 1024,
+        ttl: float = 60.0,
+        commands: Iterable[str] = (),
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.commands = set(commands)
+        self.clock = clock
+        # key -> (expiry, size, result), least recently used first
+        self._entries: OrderedDict[Hashable, tuple[float, int, DispatchResult]] = OrderedDict()
+        self._inflight: dict[Hashable, asyncio.Future] = {}
+        self._size = 0
+        self._hits = self._misses = self._shared = self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def stats(self) -> CacheStats:
+        return CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            shared=self._shared,
+            evictions=self._evictions,
+            entries=len(self._entries),
+            size=self._size,
+        )
+
+    def clear(self) -> int:
+        """Drop all cached results and return how many there were."""
+        count = len(self._entries)
+        self._entries.clear()
+        self._size = 0
+        return count
+
+    def policy(self, dispatcher: Dispatcher, args: Sequence[str]) -> CachePolicy | None:
+        """The cache policy of the command ``args`` invoke, None if it is not cacheable."""
+        if "--help" in args:
+            return None
+        path, command = dispatcher.resolve(args)
+        if command is None or not path:
+            return None
+        policy = getattr(command.callback, CACHE_ATTR, None)
+        if policy is None and " ".join(path) in self.commands:
+            policy = CachePolicy()
+        return policy
+
+    def key(self, dispatcher: Dispatcher, args: Sequence[str], policy: CachePolicy) -> Hashable:
+        """The arguments, plus a fingerprint of each input file named by them."""
+        files: list[tuple] = []
+        if policy.inputs:
+            path, command = dispatcher.resolve(args)
+            try:
+                ctx = command.make_context(
+                    path[-1],
+                    list(args[len(path) :]),
+                    parent=dispatcher.make_context(path[:-1]),
+                    resilient_parsing=True,
+                )
+            except click.ClickException:
+                ctx = None
+            for name in policy.inputs:
+                value = ctx.params.get(name) if ctx is not None else None
+                values = value if isinstance(value, (list, tuple)) else [value]
+                files.extend(fingerprint(v) for v in values if v is not None and v != "-")
+        return tuple(args), tuple(files)
+
+    def get(self, key: Hashable) -> DispatchResult | None:
+        """The cached result for ``key`` if it has not expired."""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        expiry, size, result = entry
+        if expiry <= self.clock():
+            del self._entries[key]
+            self._size -= size
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def put(self, key: Hashable, result: DispatchResult, ttl: float | None = None) -> None:
+        """Cache a completed, successful ``result``; others are not kept."""
+        if result.exit_code != 0 or result.status is not DispatchStatus.COMPLETED:
+            return
+        size = result_size(result)
+        if size > self.max_bytes:
+            return
+        previous = self._entries.pop(key, None)
+        if previous is not None:
+            self._size -= previous[1]
+        expiry = self.clock() + (self.ttl if ttl is None else ttl)
+        self._entries[key] = (expiry, size, result)
+        self._size += size
+        while self._size > self.max_bytes:
+            _, (_, evicted, _) = self._entries.popitem(last=False)
+            self._size -= evicted
+            self._evictions += 1
+
+    async def run(
+        self,
+        key: Hashable,
+        invoke: Callable[[], Awaitable[DispatchResult]],
+        ttl: float | None = None,
+        token: CancellationToken | None = None,
+        timeout: float | None = None,
+    ) -> DispatchResult:
+        """
+        Return the cached result for ``key``, the result of an identical
+        dispatch still running, or the result of ``invoke()``.
+
+        ``token`` and ``timeout`` stop the wait for an identical dispatch, as
+        they stop ``invoke()``; a stopped wait returns a TIMED_OUT or CANCELLED
+        result.
+        """
+        token = token or CancellationToken()
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            result = self.get(key)
+            if result is not None:
+                self._hits += 1
+                logger.debug(f"Result cache hit: {key!r}")
+                return result
+            future = self._inflight.get(key)
+            if future is None:
+                break
+            remaining = None if deadline is None else max(0.0, deadline - time.monotonic())
+            if not await wait_cancellable(future, token, remaining) or token.cancelled:
+                status = token.status
+                return DispatchResult(
+                    exit_code=EXIT_CODES[status],
+                    stdout="",
+                    stderr="",
+                    help_text="",
+                    status=status,
+                )
+            result = future.result()
+            if result is None:
+                # The dispatch we waited for failed or was stopped: run it ourselves
+                continue
+            self._shared += 1
+            return result
+
+        self._misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        result = None
+        try:
+            result = await invoke()
+            self.put(key, result, ttl)
+            return result
+        finally:
+            del self._inflight[key]
+            # Only successful results are shared; otherwise a waiter runs the command
+            success = result is not None and result.exit_code == 0
+            future.set_result(
+                result if success and result.status is DispatchStatus.COMPLETED else None
+            )
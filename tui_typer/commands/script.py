@@ -0,0 +1,198 @@
+"""Run a script of commands headless, through one loaded command tree."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Iterable, Sequence
+from dataclasses import dataclass, field
+import shlex
+import sys
+import time
+
+from rich.console import Console
+from rich.table import Table
+import typer
+
+from tui_typer.commands.base import dispatch_typer_command
+from tui_typer.commands.cancellation import DispatchStatus
+from tui_typer.commands.dispatcher import DispatchResult
+from tui_typer.commands.pipeline import dispatch_pipeline, is_pipeline, split_pipeline
+from tui_typer.commands.result_cache import ResultCache
+
+
+@dataclass
+class ScriptStep:
+    """One command of a script and, once it ran, its result and run time."""
+
+    line: int
+    command: str
+    args: list[str] = field(default_factory=list)
+    result: DispatchResult | None = None
+    seconds: float = 0.0
+    skipped: bool = False
+
+    @property
+    def finished(self) -> bool:
+        return self.result is not None or self.skipped
+
+    @property
+    def failed(self) -> bool:
+        return self.result is not None and (
+            self.result.exit_code != 0 or self.result.status is not DispatchStatus.COMPLETED
+        )
+
+    @property
+    def status(self) -> str:
+        if self.skipped:
+            return "skipped"
+        if self.result is None:
+            return "pending"
+        if self.result.status is not DispatchStatus.COMPLETED:
+            return self.result.status.value
+        return "ok" if self.result.exit_code == 0 else f"exit {self.result.exit_code}"
+
+
+def read_script(lines: Iterable[str]) -> list[ScriptStep]:
+    """
+    Parse a script: one command per line, quoted like a shell command line.
+
+    Blank lines and ``#`` comments are skipped.
+
+    Raises:
+        ValueError: If a line has unbalanced quotes
+    """
+    steps = []
+    for number, line in enumerate(lines, 1):
+        try:
+            args = shlex.split(line, comments=True)
+        except ValueError as e:
+            raise ValueError(f"line {number}: {e}") from None
+        if args:
+            steps.append(ScriptStep(number, line.strip(), args))
+    return steps
+
+
+class ScriptRunner:
+    """
+    Run the commands of a script through the dispatcher, without the TUI.
+
+    A line may be a pipeline, ``cmd1 | cmd2``, see
+    :mod:`tui_typer.commands.pipeline`. The Typer app's command tree is
+    loaded once for all commands. Up to
+    ``jobs`` commands run at the same time; their output is printed in script
+    order as each finishes. With ``stop_on_error`` no command is started after
+    one failed, and the rest of the script is skipped.
+    """
+
+    def __init__(
+        self,
+        app: typer.Typer,
+        jobs: int = 1,
+        stop_on_error: bool = False,
+        timeout: float | None = None,
+        cache: ResultCache | None = None,
+    ):
+        self.app = app
+        self.jobs = max(1, jobs)
+        self.stop_on_error = stop_on_error
+        self.timeout = timeout
+        self.cache = cache
+        self._stopped = False
+        self._printed = 0
+
+    async def run(self, steps: Sequence[ScriptStep]) -> list[ScriptStep]:
+        self._stopped = False
+        self._printed = 0
+        semaphore = asyncio.Semaphore(self.jobs)
+
+        async def _step(step: ScriptStep) -> None:
+            async with semaphore:
+                if self._stopped:
+                    step.skipped = True
+                else:
+                    start = time.perf_counter()
+                    step.result = await self._dispatch(step.args)
+                    step.seconds = time.perf_counter() - start
+                    if step.failed and self.stop_on_error:
+                        self._stopped = True
+            self._print_finished(steps)
+
+        await asyncio.gather(*(_step(step) for step in steps))
+        return list(steps)
+
+    async def _dispatch(self, args: list[str]) -> DispatchResult:
+        if is_pipeline(args):
+            try:
+                stages = split_pipeline(args)
+            except ValueError as e:
+                return DispatchResult(exit_code=2, stdout="", stderr=str(e), help_text="")
+            return await dispatch_pipeline(self.app, stages, timeout=self.timeout)
+        return await dispatch_typer_command(self.app, args, timeout=self.timeout, cache=self.cache)
+
+    def _print_finished(self, steps: Sequence[ScriptStep]) -> None:
+        """Print the output of the finished steps that all earlier steps are printed before."""
+        while self._printed < len(steps) and steps[self._printed].finished:
+            result = steps[self._printed].result
+            if result is not None:
+                if result.stdout:
+                    sys.stdout.write(result.stdout)
+                    sys.stdout.flush()
+                if result.stderr:
+                    sys.stderr.write(result.stderr)
+                    if not result.stderr.endswith("\n"):
+                        sys.stderr.write("\n")
+                    sys.stderr.flush()
+            self._printed += 1
+
+
+def exit_code(steps: Iterable[ScriptStep]) -> int:
+    """The exit code of the first failed step, 0 if none failed."""
+    for step in steps:
+        if step.failed:
+            return step.result.exit_code or 1
+    return 0
+
+
+def summary_table(steps: Sequence[ScriptStep], elapsed: float) -> Table:
+    """The status and run time of each step, with the totals as caption."""
+    table = Table(title="Script summary", title_justify="left")
+    table.add_column("Line", justify="right")
+    table.add_column("Command", overflow="fold")
+    table.add_column("Status")
+    table.add_column("Seconds", justify="right")
+    for step in steps:
+        style = "red" if step.failed else "dim" if step.skipped else None
+        seconds = "" if step.skipped else f"{step.seconds:.3f}"
+        table.add_row(str(step.line), step.command, step.status, seconds, style=style)
+    failed = sum(step.failed for step in steps)
+    skipped = sum(step.skipped for step in steps)
+    busy = sum(step.seconds for step in steps)
+    table.caption = (
+        f"{len(steps)} commands, {failed} failed, {skipped} skipped "
+        f"in {elapsed:.3f}s (command time {busy:.3f}s)"
+    )
+    return table
+
+
+def run_script(
+    app: typer.Typer,
+    lines: Iterable[str],
+    jobs: int = 1,
+    stop_on_error: bool = False,
+    timeout: float | None = None,
+    summary: bool = True,
+) -> int:
+    """
+    Run the commands in ``lines``, print a timing summary to stderr, and return the exit code.
+
+    Results of cacheable commands are shared within the script, see :class:`ResultCache`.
+    """
+    steps = read_script(lines)
+    runner = ScriptRunner(
+        app, jobs=jobs, stop_on_error=stop_on_error, timeout=timeout, cache=ResultCache()
+    )
+    start = time.perf_counter()
+    asyncio.run(runner.run(steps))
+    if summary:
+        Console(stderr=True).print(summary_table(steps, time.perf_counter() - start))
+    return exit_code(steps)
@@ -0,0 +1,105 @@
+"""Search index over the loaded commands, for the command palette."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+
+from tui_typer.commands.base import Command
+
+
+def trigrams(text: str) -> set[str]:
+    """The three-character substrings of ``text``."""
+    return {text[i : i + 3] for i in range(len(text) - 2)}
+
+
+def is_subsequence(query: str, text: str) -> bool:
+    """True if the characters of ``query`` appear in ``text`` in order."""
+    remaining = iter(text)
+    return all(char in remaining for char in query)
+
+
+@dataclass(frozen=True)
+class IndexEntry:
+    """A command as seen by the palette: its name, lowercase search key and help."""
+
+    name: str
+    key: str
+    help: str
+
+    @property
+    def parts(self) -> list[str]:
+        return self.name.split()
+
+
+class CommandIndex:
+    """
+    Candidate lookup for a fixed set of commands.
+
+    Keys are lowercased once when the index is built. A query is answered from
+    the sorted keys (prefix matches), a trigram index (substring matches) and a
+    character index (fuzzy matches, i.e. the query as a subsequence), so the
+    fuzzy matcher only has to score entries that can actually match.
+    """
+
+    def __init__(self, commands: Mapping[str, Command]):
+        self.entries = [
+            IndexEntry(name=name, key=name.lower(), help=command.description or "")
+            for name, command in sorted(commands.items())
+        ]
+        self._keys = sorted((entry.key, i) for i, entry in enumerate(self.entries))
+        self._trigrams: dict[str, set[int]] = {}
+        self._chars: dict[str, set[int]] = {}
+        for i, entry in enumerate(self.entries):
+            for trigram in trigrams(entry.key):
+                self._trigrams.setdefault(trigram, set()).add(i)
+            for char in set(entry.key):
+                self._chars.setdefault(char, set()).add(i)
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def prefix(self, query: str) -> Iterator[int]:
+        """Indexes of the entries whose key starts with ``query``."""
+        start = bisect_left(self._keys, (query, -1))
+        for key, i in self._keys[start:]:
+            if not key.startswith(query):
+                break
+            yield i
+
+    def _intersect(self, postings: dict[str, set[int]], grams: set[str]) -> set[int]:
+        sets = sorted((postings.get(gram, set()) for gram in grams), key=len)
+        if not sets:
+            return set()
+        result = set(sets[0])
+        for other in sets[1:]:
+            result &= other
+            if not result:
+                break
+        return result
+
+    def search(self, query: str) -> list[IndexEntry]:
+        """
+        Entries that can match ``query``: prefix matches first, then substring
+        matches, then fuzzy matches, each in name order.
+        """
+        query = query.lower()
+        if not query:
+            return list(self.entries)
+        seen: set[int] = set()
+        ordered: list[int] = []
+
+        def add(indexes) -> None:
+            for i in sorted(indexes):
+                if i not in seen:
+                    seen.add(i)
+                    ordered.append(i)
+
+        add(self.prefix(query))
+        if len(query) >= 3:
+            candidates = self._intersect(self._trigrams, trigrams(query))
+            add(i for i in candidates if query in self.entries[i].key)
+        candidates = self._intersect(self._chars, set(query))
+        add(i for i in candidates if is_subsequence(query, self.entries[i].key))
+        return [self.entries[i] for i in ordered]
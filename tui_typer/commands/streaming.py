@@ -0,0 +1,117 @@
+"""Bounded streaming of command output to the UI while the command runs."""
+
+from __future__ import annotations
+
+import asyncio
+from collections import deque
+from collections.abc import Callable
+import threading
+
+
+class OutputStream:
+    """
+    A bounded, thread-safe line channel between a running command and the UI.
+
+    The command side is file-like and is installed as the captured stdout of a
+    dispatch. Complete lines are queued; when the queue holds ``max_lines`` lines
+    the writing thread blocks until the UI drains it, so memory stays bounded no
+    matter how much a command prints. The UI side drains lines in batches.
+    """
+
+    encoding = "utf-8"
+    errors = "strict"
+
+    def __init__(self, max_lines: int = 1000, max_line_length: int = 8192):
+        self.max_lines = max(1, max_lines)
+        self.max_line_length = max(1, max_line_length)
+        self.lines_written = 0
+        self._lines: deque[str] = deque()
+        self._partial = ""
+        self._closed = False
+        self._detached = False
+        self._cond = threading.Condition()
+
+    # Command side
+
+    def write(self, s: str) -> int:
+        """Queue complete lines from ``s``; block while the queue is full."""
+        with self._cond:
+            *lines, self._partial = (self._partial + s).split("\n")
+            while len(self._partial) > self.max_line_length:
+                lines.append(self._partial[: self.max_line_length])
+                self._partial = self._partial[self.max_line_length :]
+            for line in lines:
+                while len(self._lines) >= self.max_lines and not self._detached:
+                    self._cond.wait()
+                self.lines_written += 1
+                if not self._detached:
+                    self._lines.append(line)
+        return len(s)
+
+    def writelines(self, lines) -> None:
+        for line in lines:
+            self.write(line)
+
+    def flush(self) -> None:
+        # Partial lines are held until a newline arrives or the stream is closed
+        pass
+
+    def isatty(self) -> bool:
+        return False
+
+    def close(self) -> None:
+        """Mark the end of the command output, flushing any partial line."""
+        with self._cond:
+            if self._partial and not self._detached:
+                self._lines.append(self._partial)
+                self.lines_written += 1
+            self._partial = ""
+            self._closed = True
+            self._cond.notify_all()
+
+    # UI side
+
+    @property
+    def closed(self) -> bool:
+        return self._closed
+
+    def drain(self, max_lines: int | None = None) -> list[str]:
+        """Remove and return up to ``max_lines`` queued lines."""
+        with self._cond:
+            count = len(self._lines) if max_lines is None else min(max_lines, len(self._lines))
+            lines = [self._lines.popleft() for _ in range(count)]
+            if lines:
+                self._cond.notify_all()
+            return lines
+
+    def detach(self) -> None:
+        """Stop consuming; further output is discarded and blocked writers resume."""
+        with self._cond:
+            self._detached = True
+            self._lines.clear()
+            self._cond.notify_all()
+
+    async def pump(
+        self,
+        write: Callable[[str], None],
+        interval: float = 0.05,
+        batch_lines: int = 500,
+    ) -> None:
+        """
+        Forward queued lines to ``write`` until the stream is closed and empty.
+
+        Each tick hands at most ``batch_lines`` lines to ``write`` as one string,
+        so the UI refreshes a few times per second instead of once per line.
+        """
+        try:
+            while True:
+                done = self._closed
+                lines = self.drain(batch_lines)
+                if lines:
+                    write("\n".join(lines))
+                elif done:
+                    return
+                await asyncio.sleep(interval)
+        except asyncio.CancelledError:
+            self.detach()
+            raise
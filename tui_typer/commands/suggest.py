@@ -0,0 +1,161 @@
+"""Typo suggestions for unknown commands, subcommands and options."""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Sequence
+
+from tui_typer.commands.base import Command
+from tui_typer.commands.tree import CommandTree
+
+
+def edit_distance(a: str, b: str, limit: int | None = None, transpositions: bool = True) -> int:
+    """
+    Edit distance between ``a`` and ``b``.
+
+    With ``transpositions`` swapping two adjacent characters counts as one
+    edit (optimal string alignment), otherwise this is the Levenshtein
+    distance. With ``limit`` the computation stops early and returns
+    ``limit + 1`` once the distance is known to exceed it.
+    """
+    if a == b:
+        return 0
+    if limit is not None and abs(len(a) - len(b)) > limit:
+        return limit + 1
+    previous2: list[int] = []
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, 1):
+        current = [i]
+        for j, char_b in enumerate(b, 1):
+            cost = char_a != char_b
+            value = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + cost)
+            if transpositions and i > 1 and j > 1 and char_a == b[j - 2] and a[i - 2] == char_b:
+                value = min(value, previous2[j - 2] + 1)
+            current.append(value)
+        if limit is not None and min(current) > limit:
+            return limit + 1
+        previous2, previous = previous, current
+    return previous[-1]
+
+
+class BKTree:
+    """
+    A Burkhard-Keller tree of words under Levenshtein distance.
+
+    A lookup only visits subtrees whose distance to the query can be within
+    the tolerance, which for short tolerances is a small part of the tree.
+    Results are ranked by edit distance with transpositions; since a
+    transposition is two Levenshtein edits, the tree is searched with twice
+    the tolerance and the candidates filtered.
+    """
+
+    def __init__(self, words: Iterable[str] = ()):
+        self._root: tuple[str, dict[int, tuple]] | None = None
+        self._size = 0
+        for word in words:
+            self.add(word)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def add(self, word: str) -> None:
+        if self._root is None:
+            self._root = (word, {})
+            self._size = 1
+            return
+        node = self._root
+        while True:
+            distance = edit_distance(word, node[0], transpositions=False)
+            if distance == 0:
+                return
+            child = node[1].get(distance)
+            if child is None:
+                node[1][distance] = (word, {})
+                self._size += 1
+                return
+            node = child
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """Words within ``max_distance`` of ``word``, closest first."""
+        if self._root is None:
+            return []
+        radius = 2 * max_distance
+        found = []
+        stack = [self._root]
+        while stack:
+            candidate, children = stack.pop()
+            distance = edit_distance(word, candidate, transpositions=False)
+            if distance <= radius:
+                close = edit_distance(word, candidate, limit=max_distance)
+                if close <= max_distance:
+                    found.append((close, candidate))
+            low, high = distance - radius, distance + radius
+            stack.extend(child for d, child in children.items() if low <= d <= high)
+        return sorted(found)
+
+
+def max_distance(word: str) -> int:
+    """How many edits a suggestion for ``word`` may be away: about one per three characters."""
+    return max(1, min(3, len(word.lstrip("-")) // 3))
+
+
+def _option_names(params: Sequence) -> list[str]:
+    """Long option names of click Parameters or of their plugin manifest descriptions."""
+    names = ["--help"]
+    for param in params:
+        if isinstance(param, dict):
+            kind, opts = param["kind"], [*param["opts"], *param["secondary_opts"]]
+        else:
+            kind, opts = param.param_type_name, [*param.opts, *param.secondary_opts]
+        if kind == "option":
+            names.extend(opt for opt in opts if opt.startswith("--"))
+    return names
+
+
+class SuggestionIndex:
+    """
+    "Did you mean" lookups over a command tree.
+
+    A BK-tree is built per group for its subcommand names and per command for
+    its option names, on first use, so a lookup only ever searches the names
+    valid at that point of the command line.
+    """
+
+    def __init__(self, tree: CommandTree, limit: int = 3):
+        self.tree = tree
+        self.limit = limit
+        self._children: dict[str, BKTree] = {}
+        self._options: dict[str, tuple[frozenset[str], BKTree]] = {}
+
+    def _search(self, index: BKTree, word: str) -> list[str]:
+        return [name for _, name in index.search(word, max_distance(word))[: self.limit]]
+
+    def subcommands(self, group: Command | None, word: str) -> list[str]:
+        """Full paths of the subcommands of ``group`` (None for the top level) close to ``word``."""
+        group = group or self.tree.root
+        index = self._children.get(group.name)
+        if index is None:
+            index = self._children[group.name] = BKTree(group.children)
+        prefix = f"{group.name} " if group.name else ""
+        return [prefix + name for name in self._search(index, word)]
+
+    def _option_index(self, command: Command) -> tuple[frozenset[str], BKTree]:
+        entry = self._options.get(command.name)
+        if entry is None:
+            names = _option_names(command.params)
+            entry = self._options[command.name] = (frozenset(names), BKTree(names))
+        return entry
+
+    def unknown_options(self, command: Command, args: Sequence[str]) -> dict[str, list[str]]:
+        """Long options in ``args`` that ``command`` does not accept, with suggestions."""
+        click_command = command.typer_command if command.loaded else None
+        if getattr(click_command, "ignore_unknown_options", False):
+            return {}
+        known, index = self._option_index(command)
+        unknown = {}
+        for arg in args:
+            if arg == "--":
+                break
+            name = arg.partition("=")[0]
+            if name.startswith("--") and name not in known:
+                unknown[name] = self._search(index, name)
+        return unknown
@@ -0,0 +1,64 @@
+"""The loaded commands as a tree with a full-path index."""
+
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping, Sequence
+
+from tui_typer.commands.base import Command
+
+
+class CommandTree(Mapping[str, Command]):
+    """
+    Commands of any depth, keyed by their full path (e.g. ``"serialize excel"``).
+
+    Every node keeps its children by name, so walking from a command to its
+    subcommands or looking up a path costs one dict lookup per level, however
+    many commands are loaded.
+    """
+
+    def __init__(self):
+        self.root = Command(name="", description="", is_group=True)
+        self._by_path: dict[str, Command] = {}
+
+    def add(self, command: Command) -> Command:
+        """Add ``command`` below its parent, which must have been added first."""
+        parent = self._by_path[command.parent] if command.parent else self.root
+        parent.children[command.key] = command
+        self._by_path[command.name] = command
+        return command
+
+    def __getitem__(self, path: str) -> Command:
+        return self._by_path[path]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._by_path)
+
+    def __len__(self) -> int:
+        return len(self._by_path)
+
+    def __contains__(self, path: object) -> bool:
+        return path in self._by_path
+
+    def top_level(self) -> list[Command]:
+        return list(self.root.children.values())
+
+    def children(self, path: str) -> list[Command]:
+        """The direct subcommands of the group at ``path``."""
+        node = self._by_path.get(path)
+        return list(node.children.values()) if node is not None else []
+
+    def find(self, args: Sequence[str]) -> tuple[Command | None, int]:
+        """
+        Follow the leading command names of ``args`` down the tree.
+
+        Returns:
+            The deepest command named (None if the first name is unknown) and
+            the number of arguments that named it.
+        """
+        node, depth = self.root, 0
+        for arg in args:
+            child = node.children.get(arg)
+            if child is None:
+                break
+            node, depth = child, depth + 1
+        return (node if depth else None), depth
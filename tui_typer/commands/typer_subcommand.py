@@ -4,6 +4,9 @@ from loguru import logger
 import pandas as pd
 import typer
 
+from tui_typer.commands.pipeline import piped_input
+from tui_typer.commands.workers import run_in_process_pool
+
 __app_name__ = "serialize"
 
 
@@ -46,20 +49,28 @@ serialize = typer.Typer(help="Serialisation of a report to Excel.")
 
 
 @serialize.command()
+def sample() -> list:
+    """The sample reports, to pipe into another command: serialize sample | serialize excel"""
+    return reports
+
+
+@serialize.command()
+@run_in_process_pool
 def excel(
     file_name: str = typer.Option("report.xlsx", "--file-name", "-f", help="The excel file name"),
 ):
-    """Serialize the reports to Excel"""
+    """Serialize the reports to Excel, or the reports piped from another command"""
 
-    Serializer.serialize_to_excel(reports, file_name)
+    Serializer.serialize_to_excel(piped_input(default=reports), file_name)
     logger.info(f"Serialized report to Excel file: {file_name}")
 
 
 def cli_plugin() -> tuple[str, Any]:
     """
-    ClI plugin
+    ClI plugin, registered under the ``tui_typer.plugins`` entry points
 
     Returns the typer command object
     """
-    subcommand = typer.main.get_command(serialize)
+    # get_group, since get_command collapses a group with a single command into that command
+    subcommand = typer.main.get_group(serialize)
     return __app_name__, subcommand
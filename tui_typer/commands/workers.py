@@ -0,0 +1,304 @@
+"""Process pool for running CPU-bound commands outside the UI process."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Iterable, Sequence
+from contextlib import redirect_stderr
+import importlib
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.connection import Connection
+import sys
+from typing import Any, TypeVar
+import weakref
+
+from loguru import logger
+import typer
+
+from tui_typer.commands.cancellation import EXIT_CODES, CancellationToken, wait_cancellable
+from tui_typer.commands.dispatcher import Dispatcher, DispatchResult
+
+F = TypeVar("F", bound=Callable[..., Any])
+
+PROCESS_POOL_ATTR = "__tui_typer_process_pool__"
+
+
+def run_in_process_pool(func: F) -> F:
+    """
+    Mark a Typer command callback to run in the worker process pool.
+
+    Apply it below the Typer decorator::
+
+        @serialize.command()
+        @run_in_process_pool
+        def excel(...): ...
+    """
+    setattr(func, PROCESS_POOL_ATTR, True)
+    return func
+
+
+def load_app(app_path: str) -> typer.Typer:
+    """Import a Typer app from a ``module:attribute`` path, e.g. ``cli:cli``."""
+    module_name, _, attribute = app_path.partition(":")
+    module = importlib.import_module(module_name)
+    return getattr(module, attribute or "app")
+
+
+# Worker process state, set up once by the pool initializer
+_worker_dispatcher: Dispatcher | None = None
+
+
+def _init_worker(app_path: str, preload: Sequence[str]) -> None:
+    """Import the CLI and its plugin modules and resolve the command tree."""
+    global _worker_dispatcher
+    # The parent owns the terminal; worker log records are returned with each result
+    logger.remove()
+    for module_name in preload:
+        importlib.import_module(module_name)
+    _worker_dispatcher = Dispatcher(load_app(app_path))
+    _ = _worker_dispatcher.command
+
+
+def _invoke_in_worker(args: list[str], input: str) -> tuple[DispatchResult, list[dict[str, str]]]:
+    records: list[dict[str, str]] = []
+
+    def _collect(message) -> None:
+        record = message.record
+        records.append(
+            {
+                "level": record["level"].name,
+                "name": record["name"],
+                "function": record["function"],
+                "message": record["message"],
+            }
+        )
+
+    sink_id = logger.add(_collect, format="{message}")
+    try:
+        result = _worker_dispatcher.invoke(args, input=input)
+    finally:
+        logger.remove(sink_id)
+    # Return values stay in the worker, they may not even be picklable
+    result.value = None
+    return result, records
+
+
+def _worker_main(conn: Connection, app_path: str, preload: Sequence[str]) -> None:
+    """Run the jobs sent over ``conn`` one after another until the pool closes it."""
+    _init_worker(app_path, preload)
+    while True:
+        try:
+            args, input = conn.recv()
+            conn.send(_invoke_in_worker(args, input))
+        except (EOFError, OSError):
+            return
+
+
+class _Worker:
+    """A warm worker process and the pipe its jobs are sent through."""
+
+    def __init__(
+        self, context: multiprocessing.context.BaseContext, app_path: str, preload: Sequence[str]
+    ):
+        self.killed = False
+        self.conn, child = context.Pipe()
+        self.process = context.Process(
+            target=_worker_main, args=(child, app_path, tuple(preload)), name="tui-typer-worker"
+        )
+        self.process.start()
+        child.close()
+
+    def run(self, args: list[str], input: str) -> tuple[DispatchResult, list[dict[str, str]]]:
+        """
+        Run a job in the worker, blocking until it finished.
+
+        Raises:
+            EOFError: If the worker process died, e.g. because it was killed
+        """
+        self.conn.send((args, input))
+        return self.conn.recv()
+
+    def kill(self) -> None:
+        self.killed = True
+        self.process.kill()
+
+    def close(self) -> None:
+        """Let the worker exit once it is idle."""
+        self.conn.close()
+
+
+def _close_workers(workers: set[_Worker]) -> None:
+    for worker in workers:
+        worker.close()
+
+
+class WorkerPool:
+    """
+    A pool of warm worker processes for commands that hold the GIL.
+
+    Each worker imports the CLI app and any preload modules once, when it
+    starts, so dispatching a command costs a round trip rather than an
+    interpreter start. Commands opt in with :func:`run_in_process_pool` or by
+    listing their full path (e.g. ``serialize excel``) in ``commands``. Each
+    worker runs one command at a time; further commands wait for a free one.
+    """
+
+    def __init__(
+        self,
+        app_path: str = "cli:cli",
+        preload: Sequence[str] = (),
+        max_workers: int = 2,
+        commands: Iterable[str] = (),
+        start_method: str = "spawn",
+    ):
+        self.app_path = app_path
+        self.preload = tuple(preload)
+        self.max_workers = max(1, max_workers)
+        self.commands = {" ".join(name.split()) for name in commands if name.strip()}
+        self.start_method = start_method
+        self._context = multiprocessing.get_context(start_method)
+        self._started = False
+        self._workers: set[_Worker] = set()
+        self._idle: list[_Worker] = []
+        self._available = asyncio.Condition()
+        # Let the workers exit with this process also when shutdown() is not called
+        weakref.finalize(self, _close_workers, self._workers)
+
+    @property
+    def started(self) -> bool:
+        return self._started
+
+    def start(self) -> None:
+        """Start the worker processes; they warm up without being waited for."""
+        if self._started:
+            return
+        logger.debug(f"Starting {self.max_workers} worker processes ({self.start_method})")
+        if self.start_method != "fork":
+            # Textual replaces sys.stderr with a capture whose fileno() is -1, which the
+            # resource tracker would hand to its child; start it with the real stderr.
+            with redirect_stderr(sys.__stderr__):
+                resource_tracker.ensure_running()
+        self._started = True
+        for _ in range(self.max_workers - len(self._workers)):
+            self._idle.append(self._spawn())
+
+    def shutdown(self, wait: bool = False) -> None:
+        """Stop the worker processes; busy ones exit when their command finished."""
+        self._started = False
+        for worker in self._idle:
+            worker.close()
+        self._idle.clear()
+        if wait:
+            for worker in list(self._workers):
+                worker.process.join()
+
+    def handles(self, dispatcher: Dispatcher, args: Sequence[str]) -> bool:
+        """Return True if ``args`` invoke a command that runs in the pool."""
+        if "--help" in args:
+            return False
+        path, command = dispatcher.resolve(args)
+        if command is None or not path:
+            return False
+        if " ".join(path) in self.commands:
+            return True
+        return getattr(command.callback, PROCESS_POOL_ATTR, False)
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker(self._context, self.app_path, self.preload)
+        self._workers.add(worker)
+        return worker
+
+    async def _acquire(self) -> _Worker:
+        async with self._available:
+            while not self._idle:
+                if len(self._workers) < self.max_workers:
+                    return self._spawn()
+                await self._available.wait()
+            return self._idle.pop()
+
+    async def _release(self, worker: _Worker, broken: bool = False) -> None:
+        """Make ``worker`` available again, or replace it if it died or was killed."""
+        async with self._available:
+            if broken or worker.killed:
+                self._workers.discard(worker)
+                worker.close()
+                if self._started:
+                    self._idle.append(self._spawn())
+            elif self._started:
+                self._idle.append(worker)
+            else:
+                worker.close()
+            self._available.notify()
+
+    async def _run(
+        self, args: list[str], input: str, running: list[_Worker]
+    ) -> tuple[DispatchResult, list[dict[str, str]]]:
+        worker = await self._acquire()
+        running.append(worker)
+        try:
+            result = await asyncio.to_thread(worker.run, args, input)
+        except BaseException:
+            await self._release(worker, broken=True)
+            raise
+        await self._release(worker)
+        return result
+
+    async def dispatch(
+        self,
+        args: Sequence[str],
+        input: str = "",
+        token: CancellationToken | None = None,
+        timeout: float | None = None,
+    ) -> DispatchResult:
+        """
+        Run a command in a worker process.
+
+        If ``timeout`` expires or ``token`` is cancelled the worker running the
+        command is killed, since a process cannot be stopped cooperatively from
+        here, and a fresh one takes its place. Other commands in the pool go on.
+        """
+        self.start()
+        token = token or CancellationToken()
+        running: list[_Worker] = []
+        job = asyncio.ensure_future(self._run(list(args), input, running))
+        # A killed worker fails the job; retrieve the error so it is not reported
+        job.add_done_callback(lambda f: f.cancelled() or f.exception())
+
+        def _stop() -> None:
+            for worker in running:
+                logger.warning(f"Killing worker process {worker.process.pid}")
+                worker.kill()
+            job.cancel()
+
+        try:
+            finished = await wait_cancellable(job, token, timeout)
+        except asyncio.CancelledError:
+            _stop()
+            raise
+        if not finished:
+            _stop()
+            return DispatchResult(
+                exit_code=EXIT_CODES[token.status],
+                stdout="",
+                stderr="",
+                help_text="",
+                status=token.status,
+            )
+        try:
+            result, records = job.result()
+        except (EOFError, OSError) as e:
+            logger.error(f"Worker process failed: {e!r}")
+            return DispatchResult(
+                exit_code=1,
+                stdout="",
+                stderr=f"Worker process failed: {e!r}",
+                help_text="",
+            )
+        for record in records:
+            # Re-emit worker log records as if they were logged in this process
+            patched = logger.patch(
+                lambda r, record=record: r.update(name=record["name"], function=record["function"])
+            )
+            patched.log(record["level"], record["message"])
+        return result
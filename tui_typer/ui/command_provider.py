@@ -2,10 +2,6 @@ from collections.abc import Callable
 from typing import TYPE_CHECKING
 
 from textual.command import Hit, Hits, Provider
-import typer
-
-from cli import cli
-from tui_typer.commands.base import dispatch_typer_command
 
 if TYPE_CHECKING:
     from app import CLIApp
@@ -30,39 +26,18 @@ class CommandProvider(Provider):
         """Search for matching commands."""
         matcher = self.matcher(query)
 
-        # Get Click group to access commands
-        from click import Group
-
-        click_group = typer.main.get_group(cli)
-
-        if isinstance(click_group, Group):
-            for cmd_name, cmd in click_group.commands.items():
-                score = matcher.match(cmd_name)
-                if score > 0:
-                    yield Hit(
-                        score,
-                        matcher.highlight(cmd_name),
-                        self._create_command_callback([cmd_name]),
-                        help=cmd.help or cmd.short_help or "",
-                    )
-                # Search subcommands if this is a group
-                if isinstance(cmd, Group):
-                    for sub_name, sub_cmd in cmd.commands.items():
-                        full_name = f"{cmd_name} {sub_name}"
-                        score = matcher.match(full_name)
-                        if score > 0:
-                            yield Hit(
-                                score,
-                                matcher.highlight(full_name),
-                                self._create_command_callback([cmd_name, sub_name]),
-                                help=sub_cmd.help or sub_cmd.short_help or "",
-                            )
+        # Only the candidates from the prebuilt index are scored by the fuzzy matcher
+        for entry in self.app.command_index.search(query):
+            score = matcher.match(entry.name)
+            if score > 0:
+                yield Hit(
+                    score,
+                    matcher.highlight(entry.name),
+                    self._create_command_callback(entry.parts),
+                    help=entry.help,
+                )
 
     async def _run_command(self, cmd_parts: list[str]) -> None:
         """Execute the selected command and display the result."""
         self.app.add_output(f"[bold cyan]>[/bold cyan] {' '.join(cmd_parts)}")
-        result = await dispatch_typer_command(cli, cmd_parts)
-        if result.stdout:
-            self.app.add_output(result.stdout)
-        if result.stderr:
-            self.app.add_output(f"[red]Error:[/red] {result.stderr}")
+        await self.app.submit_command(cmd_parts).wait()
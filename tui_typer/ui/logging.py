@@ -1,8 +1,28 @@
+from collections import deque
+import itertools
+import threading
+
+from rich.markup import escape
+from textual.timer import Timer
 from textual.widgets import ProgressBar, RichLog
 
+from tui_typer.commands.progress import ProgressBoard
+from tui_typer.ui.scrollback import ScrollbackLog
+
 
 class TextualLogHandler:
-    """Custom loguru sink that writes to a Textual RichLog widget."""
+    """
+    Loguru sink that batches records into a RichLog or ScrollbackLog widget.
+
+    :meth:`write` may be called from any thread: it only formats the record and
+    appends it to a deque. :meth:`flush` runs on the UI thread, started by
+    :meth:`start` at most ``refresh_rate`` times per second, and writes all
+    pending lines to the widget at once.
+
+    When more than ``max_pending`` lines are waiting, records below WARNING
+    are dropped except for one in every ``sample_every``; the number of
+    suppressed lines is reported in the log and in the widget's border.
+    """
 
     LEVEL_COLORS = {
         "DEBUG": "blue",
@@ -12,48 +32,164 @@ class TextualLogHandler:
         "CRITICAL": "bold red",
     }
 
-    def __init__(self, log_widget: RichLog):
+    # Records at or above this level are never dropped
+    KEEP_LEVEL = 30
+
+    def __init__(
+        self,
+        log_widget: RichLog | ScrollbackLog,
+        refresh_rate: int = 10,
+        max_pending: int = 1000,
+        sample_every: int = 100,
+    ):
         self.log_widget = log_widget
+        self.refresh_rate = max(1, refresh_rate)
+        self.max_pending = max(1, max_pending)
+        self.sample_every = max(1, sample_every)
+        self._pending: deque[str] = deque()
+        self._over_limit_count = itertools.count(1)
+        self._over_limit = 0
+        self._reported = 0
+        self._timer: Timer | None = None
 
-    def write(self, message) -> None:
-        """Write log message to the widget."""
-        record = message.record
+    @property
+    def suppressed(self) -> int:
+        """Number of records dropped so far."""
+        return self._over_limit - self._over_limit // self.sample_every
+
+    def format(self, record) -> str:
         level = record["level"].name
         color = self.LEVEL_COLORS.get(level, "white")
+        return (
+            f"[{color}]{level: <8}[/{color}] | "
+            f"[cyan]{record['name']}[/cyan]:[cyan]{record['function']}[/cyan] - "
+            f"{escape(record['message'])}"
+        )
+
+    def write(self, message) -> None:
+        """Queue a log message for the widget."""
+        record = message.record
+        if len(self._pending) >= self.max_pending and record["level"].no < self.KEEP_LEVEL:
+            # next() on a count is atomic, so writer threads need no lock
+            over_limit = next(self._over_limit_count)
+            self._over_limit = max(self._over_limit, over_limit)
+            if over_limit % self.sample_every:
+                return
+        self._pending.append(self.format(record))
 
-        text = f"[{color}]{level: <8}[/{color}] | [cyan]{record['name']}[/cyan]:[cyan]{record['function']}[/cyan] - {record['message']}"
-        self.log_widget.write(text)
+    def flush(self) -> None:
+        """Write the pending lines to the widget in one batch; call on the UI thread."""
+        lines = []
+        while len(lines) < self.max_pending:
+            try:
+                lines.append(self._pending.popleft())
+            except IndexError:
+                break
+        suppressed = self.suppressed
+        if suppressed > self._reported:
+            lines.append(f"[dim]... {suppressed - self._reported} log lines suppressed[/dim]")
+            self._reported = suppressed
+            self.log_widget.border_subtitle = f"{suppressed} suppressed"
+        if lines:
+            self.log_widget.write("\n".join(lines))
+
+    def start(self) -> None:
+        """Flush pending lines ``refresh_rate`` times per second while the widget is mounted."""
+        if self._timer is None:
+            self._timer = self.log_widget.set_interval(1 / self.refresh_rate, self.flush)
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self.flush()
 
 
 class TextualProgressSink:
-    """Async-safe sink for progress updates to a Textual ProgressBar widget."""
+    """
+    Shows progress in a single Textual ProgressBar widget.
+
+    The TUI shows the progress of its jobs in a
+    :class:`~tui_typer.ui.progress.ProgressPanel`; this sink is kept for
+    standalone apps with one bar of their own, such as ``demo_progress.py``.
+
+    Commands report through :func:`tui_typer.commands.progress.progress` on
+    ``board``, which only changes plain attributes; :meth:`refresh` copies them
+    to the widget on the UI thread, at most ``refresh_rate`` times per second
+    once :meth:`start` is called. With several tasks on the board the bar shows
+    their combined progress.
+
+    The methods below set progress directly. Called on the thread that created
+    the sink, the UI thread, they update the widget at once; from other threads
+    the change is shown by the next :meth:`refresh`.
+    """
 
-    def __init__(self, progress_widget: ProgressBar):
+    def __init__(
+        self,
+        progress_widget: ProgressBar,
+        board: ProgressBoard | None = None,
+        refresh_rate: int = 10,
+    ):
         self.progress_widget = progress_widget
+        self.board = ProgressBoard() if board is None else board
+        self.refresh_rate = max(1, refresh_rate)
         self._total = 100.0
         self._current = 0.0
+        self._shown: tuple[float | None, float] | None = None
+        self._timer: Timer | None = None
+        self._ui_thread = threading.get_ident()
 
     def set_total(self, total: float) -> None:
         """Set the total for progress calculation."""
         self._total = total
-        self.progress_widget.update(total=total)
+        self._changed()
 
     def update(self, advance: float = 1.0, description: str | None = None) -> None:
         """Update progress by advancing the specified amount."""
         self._current = min(self._current + advance, self._total)
-        self.progress_widget.update(progress=self._current)
+        self._changed()
 
     def set_progress(self, value: float, description: str | None = None) -> None:
         """Set progress to a specific value."""
         self._current = min(value, self._total)
-        self.progress_widget.update(progress=self._current)
+        self._changed()
 
     def reset(self) -> None:
         """Reset progress to zero."""
         self._current = 0.0
-        self.progress_widget.update(progress=0.0)
+        self._changed()
 
     def complete(self) -> None:
         """Mark progress as complete."""
         self._current = self._total
-        self.progress_widget.update(progress=self._total)
+        self._changed()
+
+    def _changed(self) -> None:
+        if threading.get_ident() == self._ui_thread:
+            self.refresh()
+
+    def _state(self) -> tuple[float | None, float]:
+        tasks = self.board.tasks()
+        if not tasks:
+            return self._total, self._current
+        if any(task.total is None for task in tasks):
+            return None, 0.0
+        return sum(task.total for task in tasks), sum(task.completed for task in tasks)
+
+    def refresh(self) -> None:
+        """Update the widget if the progress changed; call on the UI thread."""
+        state = self._state()
+        if state != self._shown:
+            self._shown = state
+            total, progress = state
+            self.progress_widget.update(total=total, progress=min(progress, total or progress))
+
+    def start(self) -> None:
+        if self._timer is None:
+            self._timer = self.progress_widget.set_interval(1 / self.refresh_rate, self.refresh)
+
+    def stop(self) -> None:
+        if self._timer is not None:
+            self._timer.stop()
+            self._timer = None
+        self.refresh()
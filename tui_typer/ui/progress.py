@@ -0,0 +1,144 @@
+"""A panel with one progress bar per running job."""
+
+from __future__ import annotations
+
+import time
+
+from textual.app import ComposeResult
+from textual.containers import Horizontal, Vertical
+from textual.timer import Timer
+from textual.widgets import Label, ProgressBar
+
+from tui_typer.commands.progress import ProgressBoard, RateMeter
+
+
+def format_duration(seconds: float) -> str:
+    seconds = int(seconds)
+    hours, rest = divmod(seconds, 3600)
+    minutes, seconds = divmod(rest, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}"
+
+
+def format_rate(rate: float) -> str:
+    if rate >= 1e6:
+        return f"{rate / 1e6:.1f}M it/s"
+    if rate >= 1e3:
+        return f"{rate / 1e3:.1f}k it/s"
+    return f"{rate:.1f} it/s"
+
+
+def progress_stats(completed: float, total: float | None, meter: RateMeter) -> str:
+    """``completed/total  rate  ETA`` for a job's progress, with the parts that are known."""
+    parts = [f"{completed:,.0f}/{total:,.0f}" if total else f"{completed:,.0f}"]
+    rate = meter.rate
+    if rate is not None:
+        parts.append(format_rate(rate))
+        eta = meter.eta(total - completed) if total else None
+        if eta is not None:
+            parts.append(f"ETA {format_duration(eta)}")
+    return "  ".join(parts)
+
+
+class JobProgress(Horizontal):
+    """The progress bar of one job: its label, the bar and throughput with ETA."""
+
+    DEFAULT_CSS = """
+    JobProgress {
+        height: 1;
+    }
+    JobProgress .job-label {
+        width: 30;
+    }
+    JobProgress ProgressBar {
+        width: auto;
+        padding-right: 2;
+    }
+    """
+
+    def __init__(self, board: ProgressBoard, window: float = 10.0):
+        super().__init__()
+        self.board = board
+        self.meter = RateMeter(window)
+        self._label = Label(board.label, markup=False, classes="job-label")
+        self._bar = ProgressBar(total=None, show_eta=False)
+        self._stats = Label("", markup=False, classes="job-stats")
+
+    def compose(self) -> ComposeResult:
+        yield self._label
+        yield self._bar
+        yield self._stats
+
+    def show(self, now: float) -> None:
+        """Copy the combined progress of the board's tasks to the widgets."""
+        tasks = self.board.tasks()
+        completed = sum(task.completed for task in tasks)
+        total = None
+        if tasks and all(task.total for task in tasks):
+            total = sum(task.total for task in tasks)
+        self.meter.add(completed, now)
+        descriptions = ", ".join(task.description for task in tasks if task.description)
+        label = f"{self.board.label}: {descriptions}" if descriptions else self.board.label
+        self._label.update(label)
+        self._bar.update(total=total, progress=min(completed, total or completed))
+        self._stats.update(progress_stats(completed, total, self.meter))
+
+
+class ProgressPanel(Vertical):
+    """
+    Progress bars of the running jobs.
+
+    Jobs register their :class:`ProgressBoard` with :meth:`track` while they
+    run; a bar is shown while the board has tasks. The panel polls the boards
+    ``refresh_rate`` times per second and is hidden, with its timer paused,
+    while no job is tracked.
+    """
+
+    DEFAULT_CSS = """
+    ProgressPanel {
+        height: auto;
+        max-height: 8;
+    }
+    """
+
+    def __init__(self, refresh_rate: int = 10, window: float = 10.0, **kwargs):
+        super().__init__(**kwargs)
+        self.refresh_rate = max(1, refresh_rate)
+        self.window = window
+        self._boards: list[ProgressBoard] = []
+        self._rows: dict[ProgressBoard, JobProgress] = {}
+        self._timer: Timer | None = None
+
+    def on_mount(self) -> None:
+        self.display = False
+        self._timer = self.set_interval(1 / self.refresh_rate, self.refresh_progress, pause=True)
+
+    def track(self, board: ProgressBoard) -> None:
+        """Show the progress reported to ``board`` until :meth:`untrack`."""
+        self._boards.append(board)
+        if self._timer is not None:
+            self._timer.resume()
+
+    def untrack(self, board: ProgressBoard) -> None:
+        if board in self._boards:
+            self._boards.remove(board)
+        row = self._rows.pop(board, None)
+        if row is not None:
+            row.remove()
+        if not self._boards and self._timer is not None:
+            self._timer.pause()
+        self.display = bool(self._rows)
+
+    def refresh_progress(self) -> None:
+        """Add, update and remove bars to match the tracked boards."""
+        now = time.monotonic()
+        for board in self._boards:
+            row = self._rows.get(board)
+            if len(board):
+                if row is None:
+                    row = self._rows[board] = JobProgress(board, self.window)
+                    self.mount(row)
+                row.show(now)
+            elif row is not None:
+                del self._rows[board]
+                row.remove()
+        self.display = bool(self._rows)
@@ -0,0 +1,387 @@
+"""Bounded scrollback for log widgets, with older entries spilled to disk."""
+
+from __future__ import annotations
+
+from array import array
+from collections import deque
+from collections.abc import Iterator
+import io
+import json
+import os
+import tempfile
+import threading
+from typing import IO, Any
+
+from rich.console import Console, RenderableType
+from rich.highlighter import Highlighter, ReprHighlighter
+from rich.markup import escape
+from rich.measure import measure_renderables
+from rich.pretty import Pretty
+from rich.protocol import is_renderable
+from rich.text import Text
+from textual.events import Resize
+from textual.geometry import Size
+from textual.scroll_view import ScrollView
+from textual.strip import Strip
+
+
+def plain_text(entry: Any) -> str:
+    """The text of a log entry without markup, rendering Rich renderables if needed."""
+    if isinstance(entry, Text):
+        return entry.plain
+    if isinstance(entry, str):
+        try:
+            return Text.from_markup(entry).plain
+        except Exception:
+            return entry
+    console = Console(file=io.StringIO(), width=120, color_system=None, force_terminal=False)
+    console.print(entry)
+    return console.file.getvalue().rstrip("\n")
+
+
+class ScrollbackStore:
+    """
+    The entries written to a log, the newest in memory and the rest on disk.
+
+    Entries are numbered in the order they are written. :meth:`spill` moves the
+    oldest in-memory entries to a segment file, one JSON line per entry, with
+    their offsets kept in an array so any entry can be read back with a single
+    seek. Markup strings are stored as written; other renderables are stored
+    as escaped plain text. :meth:`find` streams the segment file through its
+    own file handle, so searching never loads the history into memory and can
+    run in a thread while the log is written to.
+
+    Args:
+        directory: Where to create the segment file, the system temp dir by default.
+            The file is deleted when the store is closed.
+    """
+
+    def __init__(self, directory: str | os.PathLike | None = None):
+        self.directory = directory
+        self._memory: deque[Any] = deque()
+        self._offsets = array("q")
+        self._path: str | None = None
+        self._file: IO[bytes] | None = None
+        self._end = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._offsets) + len(self._memory)
+
+    @property
+    def spilled(self) -> int:
+        """Number of entries on disk; entry ``spilled`` is the oldest one in memory."""
+        return len(self._offsets)
+
+    @property
+    def path(self) -> str | None:
+        """The segment file, None until the first entry is spilled."""
+        return self._path
+
+    def append(self, entry: Any) -> int:
+        """Add an entry and return its number."""
+        self._memory.append(entry)
+        return len(self) - 1
+
+    def _segment(self) -> IO[bytes]:
+        if self._file is None:
+            if self.directory:
+                os.makedirs(self.directory, exist_ok=True)
+            fd, self._path = tempfile.mkstemp(
+                dir=self.directory, prefix="scrollback-", suffix=".jsonl"
+            )
+            self._file = os.fdopen(fd, "w+b")
+        return self._file
+
+    def spill(self, upto: int) -> int:
+        """Move the in-memory entries numbered below ``upto`` to disk; returns how many moved."""
+        count = min(upto - self.spilled, len(self._memory))
+        if count <= 0:
+            return 0
+        segment = self._segment()
+        segment.seek(self._end)
+        lines = []
+        for entry in list(self._memory)[:count]:
+            text = entry if isinstance(entry, str) else escape(plain_text(entry))
+            lines.append(json.dumps(text).encode() + b"\n")
+        segment.writelines(lines)
+        segment.flush()
+        with self._lock:
+            for line in lines:
+                self._offsets.append(self._end)
+                self._end += len(line)
+                self._memory.popleft()
+        return count
+
+    def get(self, index: int) -> Any:
+        """Entry number ``index``, read back from disk if it was spilled."""
+        if index < 0 or index >= len(self):
+            raise IndexError(index)
+        if index >= self.spilled:
+            return self._memory[index - self.spilled]
+        return self.read(index, index + 1)[0]
+
+    def read(self, start: int, stop: int) -> list[Any]:
+        """Entries ``start`` up to ``stop``, from disk and memory."""
+        start, stop = max(0, start), min(stop, len(self))
+        entries: list[Any] = []
+        spilled_stop = min(stop, self.spilled)
+        if start < spilled_stop:
+            segment = self._segment()
+            segment.seek(self._offsets[start])
+            end = self._offsets[spilled_stop] if spilled_stop < self.spilled else self._end
+            data = segment.read(end - self._offsets[start])
+            entries.extend(json.loads(line) for line in data.splitlines())
+        first = max(start, self.spilled) - self.spilled
+        entries.extend(self._memory[i] for i in range(first, stop - self.spilled))
+        return entries
+
+    def _entries(self) -> Iterator[tuple[int, Any]]:
+        """All entries in order, reading the spilled ones one line at a time."""
+        with self._lock:
+            spilled, memory, path = self.spilled, list(self._memory), self._path
+        if spilled:
+            with open(path, "rb") as segment:
+                for index in range(spilled):
+                    yield index, json.loads(segment.readline())
+        for index, entry in enumerate(memory, spilled):
+            yield index, entry
+
+    def find(
+        self, pattern: str, ignore_case: bool = True, limit: int | None = None
+    ) -> list[tuple[int, str]]:
+        """Lines of the history containing ``pattern``, as ``(entry number, line)``."""
+        needle = pattern.lower() if ignore_case else pattern
+        matches: list[tuple[int, str]] = []
+        for index, entry in self._entries():
+            for line in plain_text(entry).splitlines():
+                if needle in (line.lower() if ignore_case else line):
+                    matches.append((index, line))
+                    if limit is not None and len(matches) >= limit:
+                        return matches
+        return matches
+
+    def close(self) -> None:
+        """Forget all entries and delete the segment file."""
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if self._path is not None:
+                try:
+                    os.unlink(self._path)
+                except OSError:
+                    pass
+                self._path = None
+            self._memory.clear()
+            self._offsets = array("q")
+            self._end = 0
+
+
+class ScrollbackLog(ScrollView, can_focus=True):
+    """
+    A log widget, written to like a RichLog, that keeps at most ``max_lines``
+    rendered lines in memory.
+
+    Every entry written is recorded in a :class:`ScrollbackStore` and rendered
+    into strips of its own; the widget draws the strips it holds. When they
+    exceed ``max_lines`` the oldest whole entries are dropped from the widget
+    and spilled to disk. Scrolling to the top re-renders the previous
+    ``page_entries`` entries from the store, and returning to the end trims
+    the log back to its limit.
+    """
+
+    DEFAULT_CSS = """
+    ScrollbackLog {
+        background: $surface;
+        color: $foreground;
+        overflow-y: scroll;
+        &:focus {
+            background-tint: $foreground 5%;
+        }
+    }
+    """
+
+    def __init__(
+        self,
+        *,
+        max_lines: int = 1000,
+        page_entries: int = 100,
+        spill_dir: str | os.PathLike | None = None,
+        min_width: int = 78,
+        wrap: bool = False,
+        highlight: bool = False,
+        markup: bool = False,
+        auto_scroll: bool = True,
+        name: str | None = None,
+        id: str | None = None,
+        classes: str | None = None,
+        disabled: bool = False,
+    ):
+        super().__init__(name=name, id=id, classes=classes, disabled=disabled)
+        self.line_limit = max(1, max_lines)
+        self.page_entries = max(1, page_entries)
+        self.min_width = min_width
+        self.wrap = wrap
+        self.highlight = highlight
+        self.markup = markup
+        self.auto_scroll = auto_scroll
+        self.highlighter: Highlighter = ReprHighlighter()
+        self.store = ScrollbackStore(spill_dir)
+        # The rendered lines of the entries shown
+        self.lines: list[Strip] = []
+        # Number of the first entry shown, and the rendered line count of each shown entry
+        self._first_entry = 0
+        self._entry_lines: deque[int] = deque()
+        self._widest = 0
+        self._limit = self.line_limit
+        self._adjusting = False
+        # Writes made before the width is known, as (content, scroll_end)
+        self._deferred: deque[tuple[Any, bool | None]] = deque()
+        self._size_known = False
+
+    @property
+    def hidden_entries(self) -> int:
+        """Entries older than the first one shown."""
+        return self._first_entry
+
+    def on_resize(self, event: Resize) -> None:
+        if event.size.width and not self._size_known:
+            self._size_known = True
+            while self._deferred:
+                self.write(*self._deferred.popleft())
+
+    def get_content_width(self, container: Size, viewport: Size) -> int:
+        return self.virtual_size.width if self._size_known else container.width
+
+    def _make_renderable(self, content: Any) -> RenderableType:
+        if not is_renderable(content):
+            return Pretty(content)
+        if not isinstance(content, str):
+            return content
+        renderable = Text.from_markup(content) if self.markup else Text(content)
+        if self.highlight:
+            renderable = self.highlighter(renderable)
+        renderable.expand_tabs()
+        return renderable
+
+    def _render_entry(self, content: Any) -> list[Strip]:
+        """Render ``content`` into strips at the log's width, without adding it."""
+        renderable = self._make_renderable(content)
+        console = self.app.console
+        options = console.options
+        if isinstance(renderable, Text) and not self.wrap:
+            options = options.update(overflow="ignore", no_wrap=True)
+        width = measure_renderables(console, options, [renderable]).maximum
+        width = max(min(width, self.scrollable_content_region.width), self.min_width)
+        lines = console.render_lines(renderable, options.update_width(width), pad=False)
+        if not lines:
+            return [Strip.blank(width)]
+        strips = Strip.from_lines(lines)
+        for strip in strips:
+            strip.adjust_cell_length(width)
+        return strips
+
+    def _update_size(self) -> None:
+        self.virtual_size = Size(self._widest, len(self.lines))
+
+    def write(self, content: Any, scroll_end: bool | None = None) -> ScrollbackLog:
+        """Write a string or a Rich renderable to the end of the log."""
+        if not self._size_known:
+            # Rendered in order once the width is known
+            self._deferred.append(
+                (content.copy() if isinstance(content, Text) else content, scroll_end)
+            )
+            return self
+        strips = self._render_entry(content)
+        self.lines.extend(strips)
+        self.store.append(content)
+        self._entry_lines.append(len(strips))
+        self._widest = max(self._widest, max(strip.cell_length for strip in strips))
+        self._update_size()
+        if self.auto_scroll if scroll_end is None else scroll_end:
+            self.scroll_end(animate=False, immediate=False, x_axis=False)
+        if self.is_vertical_scroll_end:
+            self._limit = self.line_limit
+        self._trim()
+        return self
+
+    def _trim(self) -> None:
+        drop = 0
+        while len(self._entry_lines) > 1 and len(self.lines) - drop > self._limit:
+            drop += self._entry_lines.popleft()
+            self._first_entry += 1
+        if not drop:
+            return
+        self.store.spill(self._first_entry)
+        del self.lines[:drop]
+        self._update_size()
+        if self.scroll_y:
+            self._scroll_to_line(max(0, self.scroll_y - drop))
+        self.refresh()
+
+    def _scroll_to_line(self, y: float) -> None:
+        """Keep the view on the same lines after lines were added or removed above it."""
+        self._adjusting = True
+        try:
+            self.scroll_to(y=y, animate=False, immediate=True)
+        finally:
+            self._adjusting = False
+
+    def load_older(self, count: int | None = None) -> int:
+        """Re-render up to ``count`` entries above the first one shown; returns the lines added."""
+        count = count or self.page_entries
+        start = max(0, self._first_entry - count)
+        if start == self._first_entry:
+            return 0
+        rendered = [
+            self._render_entry(entry) for entry in self.store.read(start, self._first_entry)
+        ]
+        strips = [strip for lines in rendered for strip in lines]
+        self.lines[:0] = strips
+        self._entry_lines.extendleft(len(lines) for lines in reversed(rendered))
+        self._first_entry = start
+        self._widest = max(self._widest, max(strip.cell_length for strip in strips))
+        self._limit = max(self._limit, len(self.lines))
+        self._update_size()
+        self._scroll_to_line(self.scroll_y + len(strips))
+        self.refresh()
+        return len(strips)
+
+    def render_line(self, y: int) -> Strip:
+        scroll_x, scroll_y = self.scroll_offset
+        width = self.scrollable_content_region.width
+        index = scroll_y + y
+        if index >= len(self.lines):
+            return Strip.blank(width, self.rich_style)
+        line = self.lines[index].crop_extend(scroll_x, scroll_x + width, self.rich_style)
+        return line.apply_style(self.rich_style)
+
+    def watch_scroll_y(self, old_value: float, new_value: float) -> None:
+        super().watch_scroll_y(old_value, new_value)
+        if self._adjusting:
+            return
+        if new_value <= 0 and old_value > 0 and self._first_entry:
+            self.call_after_refresh(self.load_older)
+        elif self.is_vertical_scroll_end and self._limit > self.line_limit:
+            self._limit = self.line_limit
+            self.call_after_refresh(self._trim)
+
+    def find(self, pattern: str, limit: int | None = None) -> list[tuple[int, str]]:
+        """Search every entry written to this log, see :meth:`ScrollbackStore.find`."""
+        return self.store.find(pattern, limit=limit)
+
+    def clear(self) -> ScrollbackLog:
+        self.lines.clear()
+        self._deferred.clear()
+        self.store.close()
+        self._first_entry = 0
+        self._entry_lines.clear()
+        self._widest = 0
+        self._limit = self.line_limit
+        self._update_size()
+        self.refresh()
+        return self
+
+    def on_unmount(self) -> None:
+        self.store.close()